@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+ROOT = Path(__file__).resolve().parents[1]
+# 탭을 열기 전에는 임포트되면 안 되는 무거운 분석 모듈
+HEAVY = ["pandas", "numpy", "scipy", "networkx", "kiwipiepy", "mlxtend", "pyvis", "matplotlib"]
+ANALYSIS = ["kiwipiepy", "mlxtend", "pyvis", "matplotlib"]
+# 목표는 노트북 콜드 스타트 1초 미만; CI/느린 디스크를 감안해 넉넉히 잡은 상한(초)
+STARTUP_BUDGET_S = 3.0
+
+SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+heavy = {HEAVY!r}
+loaded = lambda: [m for m in heavy if m in sys.modules]
+import textmining_tool.ui.main_window as main_window
+report = {{"import": loaded()}}
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+window = main_window.MainWindow()
+window.show()
+app.processEvents()
+report["startup_s"] = time.perf_counter() - started
+report["window"] = loaded()
+print(json.dumps(report))
+"""
+
+
+@pytest.fixture(scope="module")
+def report() -> dict:
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen", "PYTHONPATH": str(ROOT)}
+    # sys.modules를 비운 상태에서 재야 하므로 새 인터프리터에서 실행
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_main_window_import_is_light(report: dict) -> None:
+    assert report["import"] == []
+
+
+def test_analysis_modules_wait_for_their_page(report: dict) -> None:
+    # 첫 탭(Data Prep)만 만들어진 상태에서 형태소/연관규칙/네트워크/차트 모듈은 아직 없어야 한다
+    assert [m for m in ANALYSIS if m in report["window"]] == []
+
+
+def test_window_shows_within_budget(report: dict) -> None:
+    # 임포트부터 창 표시까지(인터프리터 기동 제외)
+    assert report["startup_s"] < STARTUP_BUDGET_S, f"startup took {report['startup_s']:.2f}s"
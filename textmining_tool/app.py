@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import multiprocessing
 import sys
 from pathlib import Path
 
+from PyQt6.QtCore import QCoreApplication, Qt
 from PyQt6.QtWidgets import QApplication
 
 # Force project root into sys.path so the app runs with `python app.py` or `python -m textmining_tool.app`
@@ -14,12 +16,23 @@ from textmining_tool.ui.main_window import MainWindow
 
 
 def main() -> int:
+    from textmining_tool.core.memory import enable_copy_on_write
+
+    enable_copy_on_write()
+    # 네트워크 탭의 QtWebEngine을 QApplication 생성 이후에 지연 임포트할 수 있도록 설정
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setApplicationName("텍스트마이닝 AI 툴")
     window = MainWindow()
     window.show()
+    # 첫 텍스트마이닝 실행이 모델 로딩으로 멈추지 않도록 Kiwi를 백그라운드에서 미리 로드
+    from textmining_tool.core.kiwi_tm import kiwi_service
+
+    kiwi_service.warm_up()
     return app.exec()
 
 
 if __name__ == "__main__":
+    # PyInstaller 번들에서 프로세스 풀(유해성 스캔 등) 워커가 앱을 다시 띄우지 않도록
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from . import persist
+
+
+# (key, month, tokens)
+Document = Tuple[Any, str, List[str]]
+
+# 공기출현 쌍은 문서 빈도 상위 이 개수의 단어 사이에서만 센다(네트워크 단어 수 상한과 같다)
+PAIR_MAX_TERMS = 8000
+
+# 누적 통계가 아니라 결과 표 출력에만 쓰이는 옵션
+_OUTPUT_ONLY_OPTIONS = ("min_freq",)
+
+
+def options_signature(options: Dict[str, Any], text_source: str) -> str:
+    """Id for a tokenization setup; stats built with different options must not be merged."""
+    options = {k: v for k, v in options.items() if k not in _OUTPUT_ONLY_OPTIONS}
+    payload = json.dumps({"options": options, "text_source": text_source}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _key(value: Any) -> str | None:
+    return None if value is None or (isinstance(value, float) and value != value) else str(value)
+
+
+@dataclass
+class CorpusStats:
+    """Additive token statistics (frequency, document frequency, month×token) and, ``with_pairs``,
+    a document×term incidence for co-occurrence counts.
+
+    Every field is a sum over documents, so batches can be added or removed without touching the
+    rest of the corpus. Documents with a key are counted at most once; only keyed documents can be
+    removed from the incidence. Pair counts are not stored: ``pair_counts`` computes them on demand
+    over the most frequent terms, so the file grows with the number of tokens, not pairs.
+    """
+
+    with_pairs: bool = False
+    docs: int = 0
+    freq: Counter = field(default_factory=Counter)
+    doc_freq: Counter = field(default_factory=Counter)
+    monthly: Counter = field(default_factory=Counter)
+    keys: set = field(default_factory=set)
+    # with_pairs일 때만: 단어 -> 열 번호, 문서 x 단어 0/1 행렬, 행별 문서 key
+    vocab: Dict[str, int] = field(default_factory=dict)
+    incidence: sparse.csr_matrix | None = None
+    row_keys: List[str | None] = field(default_factory=list)
+
+    def _apply(self, documents: Iterable[Document], sign: int) -> int:
+        changed = 0
+        touched_tokens: Set[str] = set()
+        touched_monthly: Set[Tuple[str, str]] = set()
+        added_rows: List[List[str]] = []
+        added_keys: List[str | None] = []
+        removed_keys: Set[str] = set()
+        for key, month, tokens in documents:
+            key = _key(key)
+            if key is not None:
+                if (key in self.keys) == (sign > 0):
+                    continue
+                if sign > 0:
+                    self.keys.add(key)
+                else:
+                    self.keys.discard(key)
+            tokens = list(tokens or [])
+            unique = sorted(set(tokens))
+            freq = Counter(tokens)
+            for tok, count in freq.items():
+                self.freq[tok] += sign * count
+                self.monthly[(month, tok)] += sign * count
+            for tok in unique:
+                self.doc_freq[tok] += sign
+            if sign < 0:
+                touched_tokens.update(unique)
+                touched_monthly.update((month, tok) for tok in unique)
+            if self.with_pairs:
+                if sign > 0:
+                    added_rows.append(unique)
+                    added_keys.append(key)
+                elif key is not None:
+                    removed_keys.add(key)
+            self.docs += sign
+            changed += 1
+        # 이번에 뺀 항목만 확인해 0 이하가 된 것을 지운다(카운터 전체를 훑지 않음)
+        for counter, items in ((self.freq, touched_tokens), (self.doc_freq, touched_tokens), (self.monthly, touched_monthly)):
+            for item in items:
+                if counter.get(item, 0) <= 0:
+                    counter.pop(item, None)
+        if added_rows:
+            self._append_rows(added_rows, added_keys)
+        if removed_keys and self.incidence is not None:
+            keep = np.fromiter((k not in removed_keys for k in self.row_keys), dtype=bool, count=len(self.row_keys))
+            self.incidence = self.incidence[keep]
+            self.row_keys = [k for k, kept in zip(self.row_keys, keep) if kept]
+        return changed
+
+    def _append_rows(self, rows: List[List[str]], keys: List[str | None]) -> None:
+        for tokens in rows:
+            for tok in tokens:
+                self.vocab.setdefault(tok, len(self.vocab))
+        ids = np.fromiter((self.vocab[t] for tokens in rows for t in tokens), dtype=np.int32)
+        indptr = np.concatenate([[0], np.cumsum([len(tokens) for tokens in rows])])
+        batch = sparse.csr_matrix((np.ones(len(ids), dtype=np.int8), ids, indptr), shape=(len(rows), len(self.vocab)))
+        if self.incidence is None:
+            self.incidence = batch
+        else:
+            self.incidence.resize((self.incidence.shape[0], len(self.vocab)))
+            self.incidence = sparse.vstack([self.incidence, batch], format="csr")
+        self.row_keys.extend(keys)
+
+    def pair_counts(self, max_terms: int = PAIR_MAX_TERMS) -> Tuple[np.ndarray, sparse.csr_matrix, int]:
+        """Sorted terms, their co-document counts (diagonal: document frequency) and the document count.
+
+        Computed from the incidence over the ``max_terms`` terms with the highest document frequency.
+        """
+        if self.incidence is None or self.incidence.shape[0] == 0:
+            return np.empty(0, dtype=object), sparse.csr_matrix((0, 0), dtype=np.int64), 0
+        incidence = self.incidence.astype(np.int64)
+        doc_freq = np.asarray(incidence.sum(axis=0)).ravel()
+        cols = np.flatnonzero(doc_freq > 0)
+        if len(cols) > max_terms:
+            cols = cols[np.argsort(-doc_freq[cols], kind="stable")[:max_terms]]
+        terms = np.asarray(list(self.vocab), dtype=object)[cols]
+        order = np.argsort(terms, kind="stable")
+        sub = incidence[:, cols[order]].tocsc()
+        return terms[order], (sub.T @ sub).tocsr(), int(incidence.shape[0])
+
+    def add_documents(self, documents: Iterable[Document]) -> int:
+        return self._apply(documents, 1)
+
+    def remove_documents(self, documents: Iterable[Document]) -> int:
+        return self._apply(documents, -1)
+
+    def freq_df(self, min_freq: int = 2) -> pd.DataFrame:
+        rows = [
+            {"token": tok, "count": count, "doc_freq": self.doc_freq.get(tok, 0)}
+            for tok, count in self.freq.items()
+            if count >= min_freq
+        ]
+        return pd.DataFrame(rows, columns=["token", "count", "doc_freq"]).sort_values("count", ascending=False)
+
+    def monthly_top_df(self, top_n: int = 20) -> pd.DataFrame:
+        rows = [(month, tok, count) for (month, tok), count in self.monthly.items()]
+        monthly = pd.DataFrame(rows, columns=["month", "tokens", "count"])
+        monthly = monthly.sort_values(["month", "count", "tokens"], ascending=[True, False, True], kind="stable")
+        return monthly.groupby("month").head(top_n).reset_index(drop=True)
+
+    def save(self, path: str | Path) -> Path:
+        return persist.save_pickle(self, path)
+
+    @classmethod
+    def load(cls, path: str | Path, with_pairs: bool = False) -> "CorpusStats":
+        stats = persist.load_pickle(path)
+        return stats if stats is not None else cls(with_pairs=with_pairs)
+
+
+def stats_path(signature: str) -> Path:
+    return persist.data_dir("stats") / f"{signature}.pkl"
+
+
+def subtract_documents(path: str | Path, documents: Iterable[Document]) -> Tuple[int, CorpusStats]:
+    """Remove ``documents`` from the cumulative stats saved at ``path``; returns (removed, stats)."""
+    stats = CorpusStats.load(path, with_pairs=True)
+    removed = stats.remove_documents(documents)
+    if removed:
+        stats.save(path)
+    return removed, stats
@@ -1,18 +1,176 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import Iterable, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-from mlxtend.frequent_patterns import apriori, association_rules
+from mlxtend.frequent_patterns import apriori, association_rules, fpgrowth
 
 
-def apriori_rules(token_sets: Iterable[List[str]], min_support: float, min_confidence: float, min_lift: float) -> pd.DataFrame:
+# 규칙 항목 집합 길이 상한(선행+후행 합계)
+MAX_ITEMSET_LEN = 3
+# 세그먼트 하나에서 apriori 후보 행렬이 쓸 수 있는 메모리(MB), 넘으면 FP-growth로 바꾼다
+SEGMENT_MEMORY_MB = 512
+# 문서가 이보다 적은 세그먼트는 지지도가 의미 없어 건너뛴다
+MIN_SEGMENT_DOCS = 20
+RULE_COLUMNS = ["antecedents", "consequents", "support", "confidence", "lift", "leverage", "conviction"]
+SEGMENT_REPORT_COLUMNS = ["segment", "docs", "rules", "status"]
+
+
+def _one_hot(transactions: Sequence[Sequence[str]], min_support: float) -> pd.DataFrame:
+    """Boolean document x item matrix with only the items that can reach ``min_support``."""
+    unique = [list(dict.fromkeys(tx)) for tx in transactions]
+    lengths = np.fromiter((len(tx) for tx in unique), dtype=np.int64, count=len(unique))
+    codes, items = pd.factorize(pd.Series([t for tx in unique for t in tx], dtype=object), sort=True)
+    # 단일 항목 지지도가 기준 미만이면 어떤 항목 집합에도 들어갈 수 없으므로 열을 만들지 않는다
+    frequent = np.bincount(codes, minlength=len(items)) >= min_support * len(unique)
+    column = np.cumsum(frequent) - 1
+    keep = frequent[codes]
+    matrix = np.zeros((len(unique), int(frequent.sum())), dtype=bool)
+    matrix[np.repeat(np.arange(len(unique)), lengths)[keep], column[codes[keep]]] = True
+    return pd.DataFrame(matrix, columns=np.asarray(items, dtype=object)[frequent])
+
+
+def _candidate_triples(one_hot: pd.DataFrame, min_support: float) -> int:
+    """Number of item triples whose three pairs all reach ``min_support`` (apriori's size-3 candidates)."""
+    from scipy import sparse
+
+    x = sparse.csr_matrix(one_hot.to_numpy(dtype=np.int32))
+    together = (x.T @ x).tocsr()
+    frequent = (together >= min_support * one_hot.shape[0]).astype(np.int64).tocsr()
+    frequent.setdiag(0)
+    frequent.eliminate_zeros()
+    # 빈발 쌍 그래프의 삼각형 수: 세 변이 모두 빈발이어야 크기 3 후보가 된다
+    return int((frequent @ frequent).multiply(frequent).sum() // 6)
+
+
+def estimate_memory_mb(docs: int, items: int, max_len: int | None = MAX_ITEMSET_LEN, triples: int | None = None) -> float:
+    """Approximate peak of apriori's candidate matrices, one byte per document and candidate item.
+
+    Every level gathers ``docs x candidates x size`` items and reduces them to ``docs x candidates``.
+    Size 2 tries every pair of frequent items; size 3 only the ``triples`` whose pairs survived
+    ``min_support`` (unknown triples are ignored). Longer itemsets are not estimated.
+    """
+    if max_len is not None and max_len < 2:
+        return docs * items / 1024**2
+    peak = comb(items, 2) * 3
+    if triples is not None and (max_len is None or max_len >= 3):
+        peak = max(peak, triples * 4)
+    return docs * peak / 1024**2
+
+
+def apriori_rules(
+    token_sets: Iterable[List[str]],
+    min_support: float,
+    min_confidence: float,
+    min_lift: float,
+    max_len: int | None = None,
+    memory_mb: float | None = None,
+) -> Tuple[pd.DataFrame, str]:
+    """Association rules over ``token_sets`` and the algorithm that mined them.
+
+    ``max_len`` caps the itemset length. With ``memory_mb``, itemsets are mined by FP-growth instead
+    of apriori when apriori's estimated candidate matrices would not fit; the rules are the same.
+    """
     transactions = list(token_sets)
     if not transactions:
-        return pd.DataFrame()
-    all_items = sorted({item for tx in transactions for item in tx})
-    one_hot = pd.DataFrame([[1 if item in tx else 0 for item in all_items] for tx in transactions], columns=all_items)
-    freq = apriori(one_hot, min_support=min_support, use_colnames=True)
+        return pd.DataFrame(), "ok"
+    one_hot = _one_hot(transactions, min_support)
+    if one_hot.shape[1] < 2:
+        return pd.DataFrame(columns=RULE_COLUMNS), "ok"
+    status = "ok"
+    if memory_mb is not None:
+        needed = estimate_memory_mb(*one_hot.shape, max_len=max_len)
+        # 쌍 후보가 한도 안일 때만 빈발 쌍을 세어 크기 3 후보까지 추정한다(항목 x 항목 행렬도 작다)
+        if needed <= memory_mb and (max_len is None or max_len >= 3):
+            needed = estimate_memory_mb(*one_hot.shape, max_len=max_len, triples=_candidate_triples(one_hot, min_support))
+        if needed > memory_mb:
+            status = f"fpgrowth: 후보 행렬 {needed:,.0f}MB > 한도 {memory_mb:,.0f}MB"
+    if status == "ok":
+        freq = apriori(one_hot, min_support=min_support, use_colnames=True, max_len=max_len)
+    else:
+        # FP-growth는 후보 행렬 없이 문서 트리만 만들므로 메모리가 문서 길이 합에 비례한다
+        freq = fpgrowth(one_hot, min_support=min_support, use_colnames=True, max_len=max_len)
+    if freq.empty:
+        return pd.DataFrame(columns=RULE_COLUMNS), status
     rules = association_rules(freq, metric="confidence", min_threshold=min_confidence)
     rules = rules[rules["lift"] >= min_lift]
-    return rules
+    return rules, status
+
+
+def _mine_segment(job: Tuple) -> Tuple[pd.DataFrame, str]:
+    """Worker entry point: rules for one segment and a status."""
+    transactions, min_support, min_confidence, min_lift, max_len, memory_mb = job
+    rules, status = apriori_rules(transactions, min_support, min_confidence, min_lift, max_len=max_len, memory_mb=memory_mb)
+    if rules.empty:
+        return pd.DataFrame(columns=RULE_COLUMNS), status
+    rules = rules[RULE_COLUMNS].copy()
+    # 프로세스 간 전달/엑셀 저장을 위해 frozenset을 정렬된 문자열로 바꾼다
+    for col in ("antecedents", "consequents"):
+        rules[col] = [", ".join(sorted(items)) for items in rules[col]]
+    return rules.reset_index(drop=True), status
+
+
+def segment_rules(
+    tokens_df: pd.DataFrame,
+    keys: Sequence[str],
+    min_support: float,
+    min_confidence: float,
+    min_lift: float,
+    max_len: int | None = MAX_ITEMSET_LEN,
+    unit: str = "month",
+    memory_mb: float | None = SEGMENT_MEMORY_MB,
+    min_docs: int = MIN_SEGMENT_DOCS,
+    workers: int | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Rules mined separately for every segment of ``tokens_df`` by ``keys``, in worker processes.
+
+    ``keys`` are columns such as ``Page Type`` or selected dims; ``period`` is derived from ``Date``
+    at ``unit``. Returns one rules frame with the key columns and a ``segment`` label in front, and a
+    per-segment report (documents, rules, and whether FP-growth replaced apriori or ``min_docs`` skipped it).
+    """
+    keys = list(keys)
+    rules_columns = [*keys, "segment", *RULE_COLUMNS]
+    if tokens_df is None or tokens_df.empty:
+        return pd.DataFrame(columns=rules_columns), pd.DataFrame(columns=SEGMENT_REPORT_COLUMNS)
+    if "period" in keys:
+        from .pivot import add_period_column
+
+        tokens_df = add_period_column(tokens_df.drop(columns="period", errors="ignore"), unit, "Date")
+    segments: List[Tuple[Tuple, List[List[str]]]] = []
+    if keys:
+        for values, group in tokens_df.groupby(keys, sort=True, observed=True, dropna=False):
+            values = values if isinstance(values, tuple) else (values,)
+            segments.append((values, group["tokens"].tolist()))
+    else:
+        segments.append(((), tokens_df["tokens"].tolist()))
+    labels = [" / ".join("(없음)" if pd.isna(v) else str(v) for v in values) or "전체" for values, _ in segments]
+    runnable = [i for i, (_, tx) in enumerate(segments) if len(tx) >= min_docs]
+    # 큰 세그먼트를 먼저 제출해 마지막 작업 하나가 늦게 끝나는 일을 줄인다
+    runnable.sort(key=lambda i: len(segments[i][1]), reverse=True)
+    jobs = [(segments[i][1], min_support, min_confidence, min_lift, max_len, memory_mb) for i in runnable]
+    workers = min(len(jobs), workers or os.cpu_count() or 1)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                mined = list(pool.map(_mine_segment, jobs))
+        except Exception:  # noqa: BLE001
+            # 프로세스 풀을 쓸 수 없는 환경(샌드박스/번들, 피클 실패, 깨진 풀 등)에서는 순차 처리
+            mined = [_mine_segment(job) for job in jobs]
+    else:
+        mined = [_mine_segment(job) for job in jobs]
+    results = dict(zip(runnable, mined))
+    frames, report = [], []
+    for i, (values, transactions) in enumerate(segments):
+        rules, status = results.get(i, (None, f"skipped: 문서 {min_docs}건 미만"))
+        report.append({"segment": labels[i], "docs": len(transactions), "rules": 0 if rules is None else len(rules), "status": status})
+        if rules is not None and not rules.empty:
+            frames.append(rules.sort_values("lift", ascending=False, kind="stable").assign(**dict(zip(keys, values)), segment=labels[i]))
+    report_df = pd.DataFrame(report, columns=SEGMENT_REPORT_COLUMNS)
+    if not frames:
+        return pd.DataFrame(columns=rules_columns), report_df
+    # 세그먼트는 그룹 키 순서, 세그먼트 안에서는 lift 내림차순
+    return pd.concat(frames, ignore_index=True)[rules_columns], report_df
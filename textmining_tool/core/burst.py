@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.special import xlogy
+
+
+# 기준선으로 쓰는 직전 기간 수
+BURST_WINDOW = 6
+# 대상 기간 문서 수가 이보다 적은 단어는 순위에서 뺀다(우연한 1~2건 급등 제외)
+BURST_MIN_COUNT = 5
+BURST_METHODS = ("zscore", "llr")
+BURST_TOP_N = 100
+EMERGING_COLUMNS = [
+    "token",
+    "period",
+    "count",
+    "rate",
+    "baseline_rate",
+    "growth",
+    "zscore",
+    "llr",
+]
+
+
+@dataclass
+class TermSeries:
+    """Documents per term and period (``counts`` is terms x periods) with documents per period.
+
+    ``periods`` covers the whole calendar range from the first to the last dated document in
+    chronological order; periods without documents have a zero ``totals`` entry.
+    """
+
+    terms: np.ndarray
+    periods: np.ndarray
+    counts: sparse.csc_matrix
+    totals: np.ndarray
+
+    @classmethod
+    def build(cls, tokens_df: pd.DataFrame, unit: str = "month", dt_col: str | None = "Date") -> "TermSeries":
+        from .pivot import _resolve_dt_col, calendar_codes, format_period_codes, period_codes
+
+        unit = unit.lower()
+        # 위치 기준 인덱스로 코드를 구해 날짜가 없는 행을 빼고 토큰과 맞춘다
+        row_codes = period_codes(tokens_df[_resolve_dt_col(tokens_df, dt_col)].reset_index(drop=True))[unit]
+        calendar = calendar_codes(unit, row_codes.to_numpy())
+        period_code = np.searchsorted(calendar, row_codes.to_numpy())
+        tokens = tokens_df["tokens"].to_numpy()[row_codes.index.to_numpy()]
+        # 문서 안의 중복 토큰은 한 번만 센다(문서 빈도 시계열)
+        token_sets = [list(dict.fromkeys(ts if isinstance(ts, list) else [])) for ts in tokens]
+        lengths = np.fromiter((len(ts) for ts in token_sets), dtype=np.int64, count=len(token_sets))
+        codes, terms = pd.factorize(pd.Series([t for ts in token_sets for t in ts], dtype=object), sort=False)
+        counts = sparse.csc_matrix(
+            (np.ones(len(codes), dtype=np.int64), (codes, np.repeat(period_code, lengths))),
+            shape=(len(terms), len(calendar)),
+        )
+        return cls(
+            terms=np.asarray(terms, dtype=object),
+            periods=format_period_codes(unit, pd.Series(calendar, dtype="int64")).to_numpy(dtype=object),
+            counts=counts,
+            totals=np.bincount(period_code, minlength=len(calendar)).astype(np.int64),
+        )
+
+    @property
+    def active_periods(self) -> np.ndarray:
+        """Labels of the periods that have documents."""
+        return self.periods[self.totals > 0]
+
+    def columns(self, start: int, stop: int) -> np.ndarray:
+        return self.counts[:, start:stop].toarray().astype(float)
+
+
+def score_period(series: TermSeries, target: int, window: int = BURST_WINDOW) -> pd.DataFrame:
+    """Burst statistics of every term in period ``target`` against the ``window`` periods before it.
+
+    Baseline periods without documents are left out of the mean, spread and pooled counts. ``zscore`` compares the term's document rate with the mean of its trailing rates; the spread
+    adds the binomial noise of the target period, so terms absent from the baseline are not
+    infinite. ``llr`` is the signed Dunning log-likelihood (G²) of target vs pooled baseline counts.
+    """
+    if series.totals[target] <= 0:
+        raise ValueError(f"문서가 없는 기간입니다: {series.periods[target]}")
+    start = max(0, target - window)
+    active = series.totals[start:target] > 0
+    if not active.any():
+        raise ValueError("비교할 이전 기간이 없습니다. 기간 단위를 줄이거나 이후 기간을 선택하세요.")
+    # 문서가 없는 기간은 비율이 정의되지 않으므로 평균/표준편차에서 뺀다
+    base = series.columns(start, target)[:, active]
+    base_totals = series.totals[start:target][active].astype(float)
+    current = series.columns(target, target + 1).ravel()
+    n_cur = float(series.totals[target])
+    rates = base / base_totals
+    mean = rates.mean(axis=1)
+    std = rates.std(axis=1)
+    pooled = base.sum(axis=1)
+    n_base = float(base_totals.sum())
+    rate = current / n_cur
+    # 기준선에 없던 단어도 0으로 나누지 않도록 0.5건을 더한 기준 비율
+    p = (pooled + 0.5) / (n_base + 1.0)
+    zscore = (rate - mean) / np.sqrt(std**2 + p * (1 - p) / n_cur)
+    return pd.DataFrame(
+        {
+            "token": series.terms,
+            "period": series.periods[target],
+            "count": current.astype(np.int64),
+            "rate": rate,
+            "baseline_rate": pooled / n_base,
+            "growth": rate / p,
+            "zscore": zscore,
+            "llr": _signed_llr(current, n_cur, pooled, n_base),
+        }
+    )
+
+
+def _signed_llr(a: np.ndarray, n1: float, b: np.ndarray, n2: float) -> np.ndarray:
+    """Dunning G² of the 2x2 table (a, n1 - a; b, n2 - b), negative when the rate fell."""
+    cells = [a, n1 - a, b, n2 - b]
+    total = n1 + n2
+    k = a + b
+    expected = [k * n1 / total, (total - k) * n1 / total, k * n2 / total, (total - k) * n2 / total]
+    g2 = 2 * sum(xlogy(o, o) - xlogy(o, e) for o, e in zip(cells, expected))
+    return np.where(a / n1 >= b / n2, 1.0, -1.0) * np.maximum(g2, 0.0)
+
+
+def emerging_keywords(
+    tokens_df: pd.DataFrame,
+    unit: str = "month",
+    period: str | None = None,
+    window: int = BURST_WINDOW,
+    method: str = "zscore",
+    min_count: int = BURST_MIN_COUNT,
+    top_n: int | None = BURST_TOP_N,
+    series: TermSeries | None = None,
+) -> pd.DataFrame:
+    """Terms rising in ``period`` (default: the latest) relative to their trailing baseline, ranked by ``method``.
+
+    Pass a prebuilt ``series`` to rescore other periods or windows without recounting.
+    """
+    if method not in BURST_METHODS:
+        raise ValueError(f"Unsupported burst method: {method}")
+    if tokens_df is None or tokens_df.empty:
+        return pd.DataFrame(columns=EMERGING_COLUMNS)
+    series = series if series is not None else TermSeries.build(tokens_df, unit)
+    if not len(series.active_periods):
+        return pd.DataFrame(columns=EMERGING_COLUMNS)
+    if period is None:
+        target = int(np.flatnonzero(series.totals > 0)[-1])
+    else:
+        found = np.flatnonzero(series.periods == period)
+        if not len(found):
+            raise ValueError(f"문서가 없는 기간입니다: {period}")
+        target = int(found[0])
+    scores = score_period(series, target, window)
+    # 늘어난 단어만(최소 문서 수 이상, 기준선보다 비율이 높고 선택한 지표가 양수) 순위를 매긴다
+    scores = scores[(scores["count"] >= min_count) & (scores["growth"] > 1) & (scores[method] > 0)]
+    scores = scores.sort_values([method, "count"], ascending=False, kind="stable")
+    if top_n:
+        scores = scores.head(top_n)
+    return scores.reset_index(drop=True)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .community import DEFAULT_SEED, to_csr
+
+
+PAGERANK_ALPHA = 0.85
+MAX_ITER = 200
+TOL = 1.0e-10
+# 매개 중심성 표본 출발점 수(0이면 모든 노드에서 출발하는 정확 계산)
+BETWEENNESS_SAMPLES = 256
+# 한 번에 BFS를 진행하는 출발점 수(n x batch 밀집 배열 크기를 제한)
+_BFS_BATCH = 64
+CENTRALITY_COLUMNS = ["weighted_degree", "pagerank", "eigenvector", "betweenness"]
+
+
+def weighted_degree(adj: sparse.csr_matrix) -> np.ndarray:
+    return np.asarray(adj.sum(axis=1)).ravel()
+
+
+def pagerank(adj: sparse.csr_matrix, alpha: float = PAGERANK_ALPHA, tol: float = TOL, max_iter: int = MAX_ITER) -> np.ndarray:
+    """Weighted PageRank by power iteration; dangling nodes spread their rank uniformly."""
+    n = adj.shape[0]
+    if n == 0:
+        return np.empty(0)
+    out = weighted_degree(adj)
+    dangling = out == 0
+    # 행 정규화 전이 행렬의 전치(x_new = alpha * P^T x)
+    inv = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+    transition = (sparse.diags(inv) @ adj).T.tocsr()
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        prev = x
+        x = alpha * (transition @ prev + prev[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x - prev).sum() < n * tol:
+            break
+    return x / x.sum()
+
+
+def eigenvector(adj: sparse.csr_matrix, tol: float = TOL, max_iter: int = MAX_ITER) -> np.ndarray:
+    """Eigenvector centrality (unit L2 norm) by power iteration on ``A + I``.
+
+    The shift keeps the iteration from oscillating on bipartite components and leaves the leading
+    eigenvector unchanged.
+    """
+    n = adj.shape[0]
+    if n == 0:
+        return np.empty(0)
+    x = np.full(n, 1.0 / np.sqrt(n))
+    for _ in range(max_iter):
+        prev = x
+        x = adj @ prev + prev
+        norm = np.linalg.norm(x)
+        if norm == 0:
+            return np.zeros(n)
+        x = x / norm
+        if np.abs(x - prev).sum() < n * tol:
+            break
+    return np.abs(x)
+
+
+def betweenness(adj: sparse.csr_matrix, samples: int = BETWEENNESS_SAMPLES, seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Normalized shortest-path (hop) betweenness, estimated from ``samples`` random source nodes.
+
+    Brandes' accumulation runs for a batch of sources at once: every BFS level is one sparse-dense
+    product for path counts, and dependencies flow back level by level the same way. With
+    ``samples`` of 0 or at least the node count every node is a source and the result is exact;
+    otherwise it is scaled by ``n / samples`` (fewer samples run faster with more variance).
+    """
+    n = adj.shape[0]
+    if n < 3:
+        return np.zeros(n)
+    links = (adj != 0).astype(np.float64).tocsr()
+    links.setdiag(0)
+    links.eliminate_zeros()
+    if 0 < samples < n:
+        sources = np.random.default_rng(seed).choice(n, size=samples, replace=False)
+    else:
+        sources = np.arange(n)
+    total = np.zeros(n)
+    for start in range(0, len(sources), _BFS_BATCH):
+        total += _brandes_batch(links, sources[start : start + _BFS_BATCH])
+    # 무방향 그래프는 쌍을 양방향으로 두 번 세므로 (n-1)(n-2)로 나누면 networkx normalized와 같다
+    return total * (n / len(sources)) / ((n - 1) * (n - 2))
+
+
+def _brandes_batch(links: sparse.csr_matrix, sources: np.ndarray) -> np.ndarray:
+    n, batch = links.shape[0], len(sources)
+    cols = np.arange(batch)
+    depth = np.full((n, batch), -1, dtype=np.int32)
+    sigma = np.zeros((n, batch))
+    depth[sources, cols] = 0
+    sigma[sources, cols] = 1.0
+    frontier = np.zeros((n, batch))
+    frontier[sources, cols] = 1.0
+    level = 0
+    while True:
+        reach = links @ frontier
+        new = (reach > 0) & (depth < 0)
+        if not new.any():
+            break
+        level += 1
+        depth[new] = level
+        frontier = np.where(new, reach, 0.0)
+        sigma += frontier
+    delta = np.zeros((n, batch))
+    safe_sigma = np.where(sigma > 0, sigma, 1.0)
+    for d in range(level, 0, -1):
+        # 깊이 d 노드의 (1 + delta) / sigma를 한 단계 앞(d-1) 노드로 되돌려 보낸다
+        coef = np.where(depth == d, (1.0 + delta) / safe_sigma, 0.0)
+        back = links @ coef
+        delta += np.where(depth == d - 1, sigma * back, 0.0)
+    delta[sources, cols] = 0.0
+    return delta.sum(axis=1)
+
+
+def add_centrality(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    weight: str = "weight",
+    samples: int = BETWEENNESS_SAMPLES,
+    seed: int = DEFAULT_SEED,
+) -> pd.DataFrame:
+    """``nodes_df`` with weighted degree, PageRank, eigenvector and approximate betweenness columns.
+
+    Weighted degree, PageRank and eigenvector use ``edges_df[weight]``; betweenness counts hops.
+    Nodes without edges get 0.
+    """
+    if nodes_df is None or nodes_df.empty:
+        return nodes_df
+    nodes_df = nodes_df.drop(columns=[c for c in CENTRALITY_COLUMNS if c in nodes_df.columns])
+    if edges_df is None or edges_df.empty:
+        return nodes_df.assign(**{c: 0.0 for c in CENTRALITY_COLUMNS})
+    weights = edges_df[weight].astype(float).clip(lower=0).to_numpy() if weight in edges_df.columns else None
+    labels, adj = to_csr(edges_df["source"].tolist(), edges_df["target"].tolist(), weights)
+    values = (weighted_degree(adj), pagerank(adj), eigenvector(adj), betweenness(adj, samples=samples, seed=seed))
+    positions = pd.Index(labels).get_indexer(nodes_df["id"])
+    found = positions >= 0
+    for name, column in zip(CENTRALITY_COLUMNS, values):
+        out = np.zeros(len(nodes_df))
+        out[found] = column[positions[found]]
+        nodes_df[name] = out
+    return nodes_df
+
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+DEFAULT_SEED = 42
+# 엣지 가중치로 쓸 값: 공기출현 수(weight), 엣지 점수(score), 가중치 없음
+WEIGHT_OPTIONS = ("weight", "score", "unweighted")
+MAX_LEVELS = 20
+MAX_PASSES = 50
+
+
+def to_csr(sources: Sequence, targets: Sequence, weights: Sequence[float] | None = None) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """Sorted node labels and a symmetric CSR adjacency matrix for an undirected edge list.
+
+    Nodes are numbered in label order, not edge order, so the same graph always gets the same
+    matrix (and the same community partition) however its edge rows are ordered.
+    """
+    codes, nodes = pd.factorize(pd.Series(list(sources) + list(targets), dtype=object), sort=True)
+    n_edges = len(sources)
+    src, dst = codes[:n_edges], codes[n_edges:]
+    w = np.ones(n_edges) if weights is None else np.asarray(weights, dtype=float)
+    adj = sparse.coo_matrix((np.concatenate([w, w]), (np.concatenate([src, dst]), np.concatenate([dst, src]))), shape=(len(nodes), len(nodes)))
+    # 중복 엣지는 합산된다
+    return np.asarray(nodes, dtype=object), adj.tocsr()
+
+
+def _local_moving(adj: sparse.csr_matrix, resolution: float, rng: np.random.Generator) -> np.ndarray:
+    """One Louvain level: move nodes between communities until no move raises modularity."""
+    n = adj.shape[0]
+    indptr, indices, data = adj.indptr.tolist(), adj.indices.tolist(), adj.data.tolist()
+    k = np.asarray(adj.sum(axis=1)).ravel().tolist()
+    m2 = float(adj.sum())
+    comm = list(range(n))
+    tot = list(k)
+    order = rng.permutation(n).tolist()
+    for _ in range(MAX_PASSES):
+        moves = 0
+        for i in order:
+            ci, ki = comm[i], k[i]
+            neigh: Dict[int, float] = {}
+            for p in range(indptr[i], indptr[i + 1]):
+                j = indices[p]
+                if j != i:
+                    c = comm[j]
+                    neigh[c] = neigh.get(c, 0.0) + data[p]
+            tot[ci] -= ki
+            scale = resolution * ki / m2
+            best, best_gain = ci, neigh.get(ci, 0.0) - tot[ci] * scale
+            for c, w in neigh.items():
+                gain = w - tot[c] * scale
+                # 같은 이득이면 번호가 작은 커뮤니티를 택해 결과가 순회 순서 외에는 흔들리지 않게 한다
+                if gain > best_gain + 1e-12 or (abs(gain - best_gain) <= 1e-12 and c < best):
+                    best, best_gain = c, gain
+            tot[best] += ki
+            if best != ci:
+                comm[i] = best
+                moves += 1
+        if not moves:
+            break
+    return np.unique(np.asarray(comm), return_inverse=True)[1]
+
+
+def louvain(adj: sparse.csr_matrix, resolution: float = 1.0, seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Seeded Louvain over a symmetric CSR adjacency matrix; returns a community label per row."""
+    n = adj.shape[0]
+    labels = np.arange(n)
+    if n == 0 or adj.nnz == 0:
+        return labels
+    rng = np.random.default_rng(seed)
+    for _ in range(MAX_LEVELS):
+        level = _local_moving(adj, resolution, rng)
+        n_comm = int(level.max()) + 1
+        labels = level[labels]
+        if n_comm == adj.shape[0]:
+            break
+        # 커뮤니티를 한 노드로 접은 그래프(내부 가중치는 대각 원소)로 다음 단계를 진행
+        member = sparse.csr_matrix((np.ones(adj.shape[0]), (np.arange(adj.shape[0]), level)), shape=(adj.shape[0], n_comm))
+        adj = (member.T @ adj @ member).tocsr()
+    return labels
+
+
+def leiden(adj: sparse.csr_matrix, resolution: float = 1.0, seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Leiden via ``leidenalg``/``igraph`` when installed, otherwise the seeded Louvain."""
+    try:
+        import igraph as ig
+        import leidenalg
+    except ImportError:
+        return louvain(adj, resolution=resolution, seed=seed)
+    upper = sparse.triu(adj).tocoo()
+    graph = ig.Graph(n=adj.shape[0], edges=list(zip(upper.row.tolist(), upper.col.tolist())))
+    partition = leidenalg.find_partition(
+        graph,
+        leidenalg.RBConfigurationVertexPartition,
+        weights=upper.data.tolist(),
+        resolution_parameter=resolution,
+        seed=seed,
+    )
+    return np.asarray(partition.membership)
+
+
+BACKENDS: Dict[str, Callable[..., np.ndarray]] = {"louvain": louvain, "leiden": leiden}
+
+
+def _relabel_by_size(labels: np.ndarray) -> np.ndarray:
+    """Number communities by size (largest = 0), ties by first member, so colors are stable."""
+    if not len(labels):
+        return labels
+    _, first, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    rank = np.lexsort((first, -counts))
+    order = np.empty_like(rank)
+    order[rank] = np.arange(len(rank))
+    return order[inverse]
+
+
+def detect_communities(
+    edges_df: pd.DataFrame,
+    method: str = "louvain",
+    resolution: float = 1.0,
+    weight: str = "weight",
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, int]:
+    """Community id per node of ``edges_df`` (source/target/weight/score columns).
+
+    ``weight="score"`` uses the edge score clipped at 0 (association scores can be negative).
+    """
+    if edges_df is None or edges_df.empty:
+        return {}
+    if weight == "unweighted" or weight not in edges_df.columns:
+        weights = None
+    else:
+        weights = edges_df[weight].astype(float).clip(lower=0).to_numpy()
+    nodes, adj = to_csr(edges_df["source"].tolist(), edges_df["target"].tolist(), weights)
+    if weights is not None and adj.sum() <= 0:
+        nodes, adj = to_csr(edges_df["source"].tolist(), edges_df["target"].tolist())
+    labels = _relabel_by_size(BACKENDS[method](adj, resolution=resolution, seed=seed))
+    return dict(zip(nodes.tolist(), labels.tolist()))
+
+
+def modularity(adj: sparse.csr_matrix, labels: np.ndarray, resolution: float = 1.0) -> float:
+    m2 = float(adj.sum())
+    if m2 == 0:
+        return 0.0
+    coo = adj.tocoo()
+    inside = float(coo.data[labels[coo.row] == labels[coo.col]].sum())
+    k = np.asarray(adj.sum(axis=1)).ravel()
+    tot = np.bincount(labels, weights=k)
+    return inside / m2 - resolution * float((tot**2).sum()) / (m2 * m2)
+
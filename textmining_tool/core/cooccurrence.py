@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from . import community, persist
+from .aggregates import CorpusStats
+from .network import score_pairs
+
+
+EGO_TOP_K = 30
+EGO_MAX_NODES = 300
+
+
+@dataclass
+class CooccurrenceIndex:
+    """Term -> neighbours document co-occurrence counts (symmetric CSR) with per-term marginals.
+
+    ``counts[i, j]`` is the number of documents containing both terms, ``doc_freq[i]`` the number
+    containing term ``i`` and ``docs`` the corpus size, i.e. everything ``_score_pair`` needs.
+    """
+
+    terms: np.ndarray
+    vocab: Dict[str, int]
+    counts: sparse.csr_matrix
+    doc_freq: np.ndarray
+    docs: int
+
+    @classmethod
+    def build(cls, token_sets: Iterable[List[str]]) -> "CooccurrenceIndex":
+        token_sets = [list(dict.fromkeys(ts or [])) for ts in token_sets]
+        lengths = np.fromiter((len(ts) for ts in token_sets), dtype=np.int64, count=len(token_sets))
+        codes, terms = pd.factorize(pd.Series(list(chain.from_iterable(token_sets)), dtype=object), sort=False)
+        doc = np.repeat(np.arange(len(token_sets)), lengths)
+        # 문서 x 단어 이진 행렬의 X^T X가 곧 공기출현 문서 수(대각은 문서빈도)
+        incidence = sparse.csr_matrix((np.ones(len(codes), dtype=np.int32), (doc, codes)), shape=(len(token_sets), len(terms)))
+        return cls._from_square((incidence.T @ incidence).tocsr(), np.asarray(terms, dtype=object), len(token_sets))
+
+    @classmethod
+    def from_stats(cls, stats: CorpusStats) -> "CooccurrenceIndex":
+        """Index over cumulative counts (``CorpusStats`` built ``with_pairs=True``), limited to its
+        ``PAIR_MAX_TERMS`` most frequent terms."""
+        terms, square, docs = stats.pair_counts()
+        return cls._from_square(square.astype(np.int32), terms, docs)
+
+    @classmethod
+    def _from_square(cls, square: sparse.csr_matrix, terms: np.ndarray, docs: int) -> "CooccurrenceIndex":
+        doc_freq = square.diagonal().astype(np.int64)
+        square.setdiag(0)
+        square.eliminate_zeros()
+        square.sort_indices()
+        return cls(terms=terms, vocab={t: i for i, t in enumerate(terms)}, counts=square, doc_freq=doc_freq, docs=int(docs))
+
+    def neighbors(self, term: str, score_method: str = "LLR (기본)", min_n11: int = 2, top_k: int | None = None) -> pd.DataFrame:
+        """Co-occurring terms of ``term`` with n11 and score, best score first."""
+        i = self.vocab.get(term)
+        if i is None:
+            return pd.DataFrame(columns=["token", "n11", "doc_freq", "score"])
+        start, end = self.counts.indptr[i], self.counts.indptr[i + 1]
+        idx, n11 = self.counts.indices[start:end], self.counts.data[start:end]
+        keep = n11 >= min_n11
+        idx, n11 = idx[keep], n11[keep]
+        score = score_pairs(score_method, n11, np.full(len(idx), self.doc_freq[i]), self.doc_freq[idx], self.docs)
+        order = np.argsort(-score, kind="stable")[:top_k]
+        return pd.DataFrame({"token": self.terms[idx[order]], "n11": n11[order], "doc_freq": self.doc_freq[idx[order]], "score": score[order]})
+
+    def ego_network(
+        self,
+        seed: str,
+        hops: int = 1,
+        score_method: str = "LLR (기본)",
+        min_n11: int = 2,
+        top_k: int = EGO_TOP_K,
+        max_nodes: int = EGO_MAX_NODES,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Nodes/edges (same columns as ``build_cooccurrence_network``) around ``seed``.
+
+        Each hop adds the ``top_k`` best-scoring neighbours of the previous layer; edges are every
+        pair among the selected terms with at least ``min_n11`` shared documents.
+        """
+        if seed not in self.vocab:
+            return pd.DataFrame(), pd.DataFrame()
+        hop_of = {seed: 0}
+        layer = [seed]
+        for hop in range(1, hops + 1):
+            next_layer = []
+            for term in layer:
+                for token in self.neighbors(term, score_method, min_n11, top_k)["token"]:
+                    if token not in hop_of and len(hop_of) < max_nodes:
+                        hop_of[token] = hop
+                        next_layer.append(token)
+            layer = next_layer
+        idx = np.asarray([self.vocab[t] for t in hop_of])
+        sub = sparse.triu(self.counts[idx][:, idx], k=1).tocoo()
+        keep = sub.data >= min_n11
+        a, b, n11 = idx[sub.row[keep]], idx[sub.col[keep]], sub.data[keep]
+        edges_df = pd.DataFrame(
+            {
+                "source": self.terms[a],
+                "target": self.terms[b],
+                "weight": n11,
+                "score": score_pairs(score_method, n11, self.doc_freq[a], self.doc_freq[b], self.docs),
+            }
+        )
+        degree = pd.concat([edges_df["source"], edges_df["target"]]).value_counts()
+        partition = community.detect_communities(edges_df)
+        nodes_df = pd.DataFrame({"id": list(hop_of)})
+        nodes_df["degree"] = nodes_df["id"].map(degree).fillna(0).astype(int)
+        nodes_df["community"] = nodes_df["id"].map(partition).fillna(0).astype(int)
+        nodes_df["hop"] = nodes_df["id"].map(hop_of)
+        nodes_df["doc_freq"] = self.doc_freq[idx]
+        return nodes_df, edges_df
+
+    def save(self, path: str | Path) -> Path:
+        """Save atomically and prune indexes saved for older fingerprints."""
+        return persist.save_pickle(self, path, keep=persist.KEEP_INDEXES)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CooccurrenceIndex | None":
+        return persist.load_pickle(path)
+
+
+def index_path(fingerprint: str) -> Path:
+    return persist.index_path("cooc", fingerprint)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import warnings
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+
+# 샘플로 먼저 시험해 보는 명시 포맷(맞으면 전체를 C 파서 한 번으로 처리)
+CANDIDATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y.%m.%d %H:%M:%S",
+    "%Y.%m.%d %H:%M",
+    "%Y.%m.%d",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d",
+    "%Y%m%d",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+]
+
+# "2024.01.05 13:22", "2024. 1. 5. 오후 1:22", "2024년 1월 5일 13시 22분" 등 한국식 표기
+_KO_DATE_RE = (
+    r"(?P<year>\d{4})\s*(?:년|[./-])\s*(?P<month>\d{1,2})\s*(?:월|[./-])\s*(?P<day>\d{1,2})\s*(?:일|\.)?"
+    r"\s*(?P<ampm>오전|오후|AM|PM|am|pm)?"
+    r"\s*(?:(?P<hour>\d{1,2})\s*(?:시|:)\s*(?:(?P<minute>\d{1,2})\s*분?)?\s*(?::\s*(?P<second>\d{1,2})\s*초?)?)?"
+)
+
+SAMPLE_SIZE = 200
+MIN_FORMAT_HIT_RATE = 0.9
+
+
+def infer_format(sample: pd.Series) -> str | None:
+    """Return the first candidate format that parses at least 90% of a string sample."""
+    sample = sample.dropna().astype(str).str.strip()
+    if sample.empty:
+        return None
+    for fmt in CANDIDATE_FORMATS:
+        if pd.to_datetime(sample, format=fmt, errors="coerce").notna().mean() >= MIN_FORMAT_HIT_RATE:
+            return fmt
+    return None
+
+
+def _parse_korean(values: pd.Series) -> pd.Series:
+    parts = values.str.extract(rf"^{_KO_DATE_RE}\s*$")
+    ok = parts["year"].notna()
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    if not ok.any():
+        return result
+    parts = parts[ok]
+    nums = parts[["year", "month", "day", "hour", "minute", "second"]].apply(pd.to_numeric, errors="coerce")
+    nums[["hour", "minute", "second"]] = nums[["hour", "minute", "second"]].fillna(0)
+    pm = parts["ampm"].str.lower().isin(["오후", "pm"]) & (nums["hour"] < 12)
+    am_midnight = parts["ampm"].str.lower().isin(["오전", "am"]) & (nums["hour"] == 12)
+    nums.loc[pm, "hour"] += 12
+    nums.loc[am_midnight, "hour"] = 0
+    result.loc[nums.index] = pd.to_datetime(nums, errors="coerce")
+    return result
+
+
+def parse_datetime_column(values: pd.Series) -> Tuple[pd.Series, Dict[str, Any]]:
+    """Parse a date column once and report how it went.
+
+    Already-typed columns are returned as-is. Strings are parsed with a format inferred from a
+    sample, then the Korean-format fast path, and only the leftovers go through pandas' generic
+    parser. The report holds row/parsed/unparseable counts and the inferred format.
+    """
+    report: Dict[str, Any] = {"rows": int(len(values)), "format": None}
+    if is_datetime64_any_dtype(values):
+        parsed = values
+        report["format"] = "datetime64"
+    elif is_numeric_dtype(values) or pd.api.types.infer_dtype(values.head(SAMPLE_SIZE), skipna=True) in {"datetime", "datetime64", "date"}:
+        parsed = pd.to_datetime(values, errors="coerce")
+    else:
+        text = values.astype(str).where(values.notna()).str.strip()
+        fmt = infer_format(text.head(SAMPLE_SIZE))
+        report["format"] = fmt
+        if fmt is not None:
+            parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        else:
+            parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+        missing = parsed.isna() & text.notna() & (text != "")
+        if missing.any():
+            parsed = parsed.where(~missing, _parse_korean(text[missing]).reindex(parsed.index))
+            missing = parsed.isna() & text.notna() & (text != "")
+        if missing.any():
+            with warnings.catch_warnings():
+                # 형식이 섞인 잔여 값만 일반 파서로 처리(포맷 추론 경고 억제)
+                warnings.simplefilter("ignore", UserWarning)
+                fallback = pd.to_datetime(text[missing], errors="coerce")
+            if getattr(fallback.dt, "tz", None) is not None:
+                fallback = fallback.dt.tz_localize(None)
+            parsed = parsed.where(~missing, fallback.reindex(parsed.index))
+    non_null = int(values.notna().sum())
+    report["parsed"] = int(parsed.notna().sum())
+    report["unparseable"] = non_null - report["parsed"]
+    return parsed, report
+
+
+def ensure_datetime(values: pd.Series) -> pd.Series:
+    """Return ``values`` unchanged when already datetime-typed, otherwise parse it once."""
+    if is_datetime64_any_dtype(values):
+        return values
+    return parse_datetime_column(values)[0]
@@ -20,6 +20,7 @@ SHEET_MAPPING = {
     "token_freq": "freq_df",
     "top50_preview": "top50_df",
     "monthly_top_words": "monthly_top_df",
+    "emerging_keywords": "emerging_df",
     "sentiment_sentence": "sentiment_sentence_df",
     "sentiment_doc": "sentiment_doc_df",
     "sentiment_month": "sentiment_month_df",
@@ -28,6 +29,11 @@ SHEET_MAPPING = {
     "empty_doc_report": "empty_doc_report_df",
     "network_nodes": "nodes_df",
     "network_edges": "edges_df",
+    "network_period_nodes": "period_nodes_df",
+    "network_period_edges": "period_edges_df",
+    "network_edge_delta": "edge_delta_df",
+    "association_rules": "rules_df",
+    "association_segments": "rules_segments_df",
     "logs": "logs",
 }
 
@@ -39,7 +45,7 @@ def export_selected_sheets(path: str | Path, app_state: AppState, selected_sheet
     with ExcelWriter(path, engine="xlsxwriter") as writer:
         for sheet in selected_sheets:
             attr = SHEET_MAPPING.get(sheet)
-            data = getattr(app_state, attr, None)
+            data = app_state.frame(attr)
             if data is None:
                 if include_empty:
                     pd.DataFrame().to_excel(writer, sheet_name=sheet, index=False)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List, Tuple
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
 
 from google import genai
 from google.genai import errors as genai_errors
@@ -15,78 +18,309 @@ GEMINI_PROMPT = (
 )
 
 
-def run_gemini(api_key: str, texts: List[Tuple[str, str]]) -> List[Dict[str, object]]:
-    """texts -> list of (key, clean_text)."""
-    client = genai.Client(api_key=api_key)
-
-    # Discover models that support generateContent; prioritize Gemini 3.x.
-    candidate_models: List[str] = []
-    try:
-        for m in client.models.list():
-            methods = getattr(m, "supported_generation_methods", None) or []
-            if "generateContent" in methods and m.name:
-                candidate_models.append(m.name)
-    except Exception:
-        candidate_models = []
-
-    def _prioritize(models: List[str]) -> List[str]:
-        # Gemini 3.x first, then 1.5 family.
-        pri_3 = [m for m in models if "gemini-3" in m]
-        pri_15 = [m for m in models if "gemini-1.5" in m and m not in pri_3]
-        others = [m for m in models if m not in pri_3 and m not in pri_15]
-        prioritized = pri_3 + pri_15 + others
-        # Ensure fully-qualified names
-        normalized = []
-        for name in prioritized:
-            if not name.startswith("models/"):
-                normalized.append(f"models/{name}")
-            else:
-                normalized.append(name)
-        # Deduplicate while preserving order
-        seen = set()
-        ordered = []
-        for n in normalized:
-            if n not in seen:
-                seen.add(n)
-                ordered.append(n)
+# 모델 탐색 결과/실패 모델 기억 시간(초)
+MODEL_CACHE_TTL = 600.0
+# 모델 목록 조회가 실패했을 때 기본 후보를 기억하는 시간(초); 장애 중 문장마다 목록 조회를 반복하지 않는다
+DISCOVERY_RETRY_TTL = 60.0
+
+FALLBACK_MODELS = [
+    "models/gemini-3.0-pro",
+    "models/gemini-3.0-flash",
+    "models/gemini-1.5-pro",
+    "models/gemini-1.5-flash",
+    "models/gemini-1.5-flash-001",
+]
+
+
+def _prioritize(models: List[str]) -> List[str]:
+    # Gemini 3.x first, then 1.5 family.
+    pri_3 = [m for m in models if "gemini-3" in m]
+    pri_15 = [m for m in models if "gemini-1.5" in m and m not in pri_3]
+    others = [m for m in models if m not in pri_3 and m not in pri_15]
+    prioritized = pri_3 + pri_15 + others
+    # Ensure fully-qualified names
+    normalized = []
+    for name in prioritized:
+        if not name.startswith("models/"):
+            normalized.append(f"models/{name}")
+        else:
+            normalized.append(name)
+    # Deduplicate while preserving order
+    seen = set()
+    ordered = []
+    for n in normalized:
+        if n not in seen:
+            seen.add(n)
+            ordered.append(n)
+    return ordered
+
+
+class NoModelAvailable(RuntimeError):
+    """Every candidate model for the API key failed recently; nothing is left to try."""
+
+
+class ClientRegistry:
+    """Process-wide cache of Gemini clients and model discovery per API key.
+
+    Clients are kept alive so their HTTP connection pool is reused across runs. The discovered
+    candidate list and the last working model are cached for ``ttl`` seconds, and models that
+    returned 404 are skipped until their entry expires. A failed discovery falls back to
+    ``FALLBACK_MODELS``, cached only for ``retry_ttl`` seconds so models are listed again soon.
+    """
+
+    def __init__(self, ttl: float = MODEL_CACHE_TTL, retry_ttl: float = DISCOVERY_RETRY_TTL) -> None:
+        self.ttl = ttl
+        self.retry_ttl = retry_ttl
+        self._lock = threading.Lock()
+        self._clients: Dict[str, genai.Client] = {}
+        # api_key -> (만료 시각, 후보 목록)
+        self._candidates: Dict[str, Tuple[float, List[str]]] = {}
+        self._working: Dict[str, Tuple[float, str]] = {}
+        self._failed: Dict[str, Dict[str, float]] = {}
+
+    def client(self, api_key: str) -> genai.Client:
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                client = genai.Client(api_key=api_key)
+                self._clients[api_key] = client
+            return client
+
+    def _discover(self, client: genai.Client) -> List[str] | None:
+        """Models that support generateContent, Gemini 3.x first; None when listing failed."""
+        discovered: List[str] = []
+        try:
+            for m in client.models.list():
+                methods = getattr(m, "supported_generation_methods", None) or []
+                if "generateContent" in methods and m.name:
+                    discovered.append(m.name)
+        except Exception:  # noqa: BLE001
+            return None
+        return _prioritize(discovered) if discovered else None
+
+    def candidates(self, api_key: str) -> List[str]:
+        """Return candidate models: cached working model first, recently failed models dropped.
+
+        Raises ``NoModelAvailable`` when every candidate is marked failed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._candidates.get(api_key)
+        if cached is None or now > cached[0]:
+            models = self._discover(self.client(api_key))
+            ttl = self.ttl
+            if models is None:
+                # 탐색 실패 시 기본 후보를 짧게만 캐시한다
+                models, ttl = _prioritize(FALLBACK_MODELS), self.retry_ttl
+            with self._lock:
+                self._candidates[api_key] = (now + ttl, models)
+        else:
+            models = cached[1]
+        with self._lock:
+            failed = self._failed.get(api_key, {})
+            for name in [n for n, ts in failed.items() if now - ts > self.ttl]:
+                del failed[name]
+            working = self._working.get(api_key)
+            if working is not None and now - working[0] > self.ttl:
+                del self._working[api_key]
+                working = None
+            ordered = [m for m in models if m not in failed]
+        if not ordered:
+            raise NoModelAvailable(
+                f"No Gemini model is available for this API key: all {len(models)} candidates failed "
+                f"within the last {self.ttl:.0f}s. Check the key/quota or retry later."
+            )
+        if working is not None and working[1] in ordered:
+            ordered.remove(working[1])
+            ordered.insert(0, working[1])
         return ordered
 
-    candidate_models = _prioritize(candidate_models) if candidate_models else []
+    def mark_working(self, api_key: str, model: str) -> None:
+        with self._lock:
+            self._working[api_key] = (time.monotonic(), model)
+
+    def mark_failed(self, api_key: str, model: str) -> None:
+        with self._lock:
+            self._failed.setdefault(api_key, {})[model] = time.monotonic()
+            working = self._working.get(api_key)
+            if working is not None and working[1] == model:
+                del self._working[api_key]
+
+    def invalidate(self, api_key: str | None = None) -> None:
+        """Forget the client and cached discovery for ``api_key`` (all keys when None)."""
+        with self._lock:
+            if api_key is None:
+                self._clients.clear()
+                self._candidates.clear()
+                self._working.clear()
+                self._failed.clear()
+                return
+            for cache in (self._clients, self._candidates, self._working, self._failed):
+                cache.pop(api_key, None)
+
+
+registry = ClientRegistry()
 
-    if not candidate_models:
-        candidate_models = _prioritize(
-            [
-                "models/gemini-3.0-pro",
-                "models/gemini-3.0-flash",
-                "models/gemini-1.5-pro",
-                "models/gemini-1.5-flash",
-                "models/gemini-1.5-flash-001",
-            ]
-        )
 
+# 지연시간 히스토그램 구간 상한(ms); 마지막 칸은 그 이상
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+class GeminiTelemetry:
+    """Thread-safe per-request counters for one Gemini run.
+
+    ``record`` is called for every request attempt (including 404 fallbacks and parse failures);
+    ``live`` gives a cheap throughput readout and ``summary`` a flat dict for ``AppState.logs``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.retries = 0
+        self.statuses: Counter[str] = Counter()
+        self.models: Counter[str] = Counter()
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.latencies: List[float] = []
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.last_error: str | None = None
+        self.aborted = False
+
+    def record(self, model: str, latency: float, usage: Any = None, status: str = "ok", error: Exception | None = None, retry: bool = False) -> None:
+        latency_ms = latency * 1000
+        bucket = next((i for i, edge in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= edge), len(LATENCY_BUCKETS_MS))
+        with self._lock:
+            self.requests += 1
+            self.retries += int(retry)
+            self.statuses[status] += 1
+            self.models[model] += 1
+            self.latencies.append(latency_ms)
+            self.histogram[bucket] += 1
+            if usage is not None:
+                self.prompt_tokens += int(getattr(usage, "prompt_token_count", 0) or 0)
+                self.response_tokens += int(getattr(usage, "candidates_token_count", 0) or 0)
+            if error is not None:
+                self.last_error = f"{type(error).__name__}: {error}"
+
+    def abort(self, error: Exception | None) -> None:
+        with self._lock:
+            self.aborted = True
+            if error is not None:
+                self.last_error = f"{type(error).__name__}: {error}"
+
+    def live(self) -> Dict[str, float]:
+        with self._lock:
+            minutes = max(time.monotonic() - self.started, 1e-6) / 60
+            return {
+                "ok": self.statuses["ok"],
+                "failed": self.requests - self.statuses["ok"],
+                "req_per_min": self.requests / minutes,
+                "tokens_per_min": (self.prompt_tokens + self.response_tokens) / minutes,
+            }
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            ordered = sorted(self.latencies)
+
+            def _pct(q: float) -> float:
+                return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1) if ordered else 0.0
+
+            edges = [f"<={e}ms" for e in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "requests": self.requests,
+                "ok": self.statuses["ok"],
+                "retries": self.retries,
+                "not_found": self.statuses["not_found"],
+                "client_errors": self.statuses["client_error"],
+                "parse_failures": self.statuses["parse_error"],
+                "other_errors": self.statuses["error"],
+                "prompt_tokens": self.prompt_tokens,
+                "response_tokens": self.response_tokens,
+                "latency_mean_ms": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                "latency_p50_ms": _pct(0.5),
+                "latency_p95_ms": _pct(0.95),
+                "latency_histogram": ", ".join(f"{e}:{n}" for e, n in zip(edges, self.histogram) if n),
+                "models": ", ".join(f"{m}:{n}" for m, n in self.models.most_common()),
+                "elapsed_s": round(elapsed, 2),
+                "req_per_min": round(self.requests / max(elapsed, 1e-6) * 60, 2),
+                "aborted": self.aborted,
+                "last_error": self.last_error,
+            }
+
+
+def run_gemini(
+    api_key: str,
+    texts: List[Tuple[str, str]],
+    on_result: Callable[[Dict[str, object]], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    telemetry: GeminiTelemetry | None = None,
+) -> List[Dict[str, object]]:
+    """texts -> list of (key, clean_text).
+
+    ``on_result`` is called with each parsed result as soon as it arrives; ``should_stop`` is polled
+    before every request so a caller can cancel between sentences. Pass ``telemetry`` to collect
+    latency/token/failure counters; errors that end the run are kept in ``telemetry.last_error``.
+    Raises ``NoModelAvailable`` when no candidate model is left to try.
+    """
+    client = registry.client(api_key)
+    telemetry = telemetry or GeminiTelemetry()
     results: List[Dict[str, object]] = []
     for key, text in texts:
+        if should_stop is not None and should_stop():
+            break
         prompt = GEMINI_PROMPT + f"\nText:\n{text}"
         last_error = None
-        for model in candidate_models:
+        try:
+            candidates = registry.candidates(api_key)
+        except NoModelAvailable as exc:
+            telemetry.abort(exc)
+            raise
+        for attempt, model in enumerate(candidates):
+            started = time.perf_counter()
             try:
                 resp = client.models.generate_content(model=model, contents=prompt)
-                content = resp.text or ""
-                parsed = json.loads(content)
-                results.append({"key": key, **parsed})
-                break
             except genai_errors.ClientError as client_err:
                 # Retry on 404/invalid model by moving to the next candidate; otherwise surface.
                 msg = str(client_err)
-                if "404" in msg or "not found" in msg.lower():
-                    last_error = client_err
-                    continue
+                not_found = "404" in msg or "not found" in msg.lower()
+                telemetry.record(
+                    model,
+                    time.perf_counter() - started,
+                    status="not_found" if not_found else "client_error",
+                    error=client_err,
+                    retry=attempt > 0,
+                )
                 last_error = client_err
+                if not_found:
+                    registry.mark_failed(api_key, model)
+                    continue
                 break
             except Exception as exc:  # noqa: BLE001
+                telemetry.record(model, time.perf_counter() - started, status="error", error=exc, retry=attempt > 0)
+                last_error = exc
+                break
+            latency = time.perf_counter() - started
+            usage = getattr(resp, "usage_metadata", None)
+            try:
+                parsed = json.loads(resp.text or "")
+                if not isinstance(parsed, dict):
+                    raise ValueError(f"expected a JSON object, got {type(parsed).__name__}")
+            except (ValueError, TypeError) as exc:
+                telemetry.record(model, latency, usage, status="parse_error", error=exc, retry=attempt > 0)
                 last_error = exc
                 break
+            telemetry.record(model, latency, usage, retry=attempt > 0)
+            result = {"key": key, **parsed}
+            results.append(result)
+            registry.mark_working(api_key, model)
+            if on_result is not None:
+                on_result(result)
+            break
         else:
-            # 모든 후보 실패 시 빈 결과를 반환하고 호출 측에서 룰 기반으로만 진행
-            return []
+            # 모든 후보가 404면 조용히 빈 결과를 내지 않고 오류로 알린다(받은 결과는 on_result로 이미 전달됨)
+            exc = NoModelAvailable(f"Every Gemini candidate model returned 404 (last error: {last_error})")
+            telemetry.abort(exc)
+            raise exc
     return results
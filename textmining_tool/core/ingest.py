@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+import pandas as pd
+
+from . import persist
+
+
+# SQLite 바인딩 변수 한도(기본 999) 안에서 IN 조회를 나눠 보낸다
+_QUERY_BATCH = 900
+
+
+def load_id_for(paths: Sequence[str | Path]) -> str:
+    """Stable id for one load (file paths, sizes and mtimes); re-applying the same load reuses it."""
+    digest = hashlib.sha1()
+    for path in sorted(Path(p).resolve() for p in paths):
+        stat = path.stat()
+        digest.update(f"{path}\x1f{stat.st_size}\x1f{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def project_index_path(paths: Sequence[str | Path]) -> Path:
+    """Key index for the project the files belong to (their common folder), under the data dir's index/."""
+    folders = {str(Path(p).resolve().parent) for p in paths}
+    project = os.path.commonpath(sorted(folders)) if folders else ""
+    return persist.data_dir("index") / f"seen-{hashlib.sha1(project.encode('utf-8')).hexdigest()[:16]}.sqlite"
+
+
+def reset_key_index(path: str | Path) -> bool:
+    """Delete the key index at ``path``; returns whether there was one."""
+    path = Path(path)
+    existed = path.exists()
+    for target in (path, path.with_name(path.name + "-journal")):
+        target.unlink(missing_ok=True)
+    return existed
+
+
+class KeyIndex:
+    """Persistent set of document keys already ingested, with the load that first brought each one.
+
+    One index per project (``project_index_path``); open it in the thread that uses it, since
+    SQLite connections are bound to their creating thread.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, load_id TEXT NOT NULL, source TEXT, added_at REAL)"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0])
+
+    def seen_before(self, keys: Iterable[str], load_id: str) -> set[str]:
+        """Keys from ``keys`` that an earlier load (not ``load_id``) already ingested."""
+        keys = list(dict.fromkeys(str(k) for k in keys))
+        found: set[str] = set()
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start : start + _QUERY_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self._conn.execute(f"SELECT key FROM seen WHERE load_id != ? AND key IN ({marks})", [load_id, *batch])
+            found.update(row[0] for row in rows)
+        return found
+
+    def add(self, keys: Iterable[str], load_id: str, source: str = "") -> int:
+        """Record new keys for ``load_id``; keys that are already indexed keep their original load."""
+        before = self._conn.total_changes
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (key, load_id, source, added_at) VALUES (?, ?, ?, ?)",
+                ((str(k), load_id, source, now) for k in keys),
+            )
+        return self._conn.total_changes - before
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM seen")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "KeyIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@dataclass
+class IngestReport:
+    load_id: str
+    files: int
+    rows: int
+    already_seen: int
+    new_rows: int
+
+
+def drop_seen(df: pd.DataFrame, index: KeyIndex, load_id: str, key_col: str = "key") -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Split ``df`` into rows whose key is new to the index and rows an earlier load already had."""
+    if df.empty:
+        return df, df.iloc[0:0]
+    seen = index.seen_before(df[key_col], load_id)
+    mask = df[key_col].astype(str).isin(seen)
+    return df[~mask], df[mask]
+
+
+def expand_paths(paths: Iterable[str | Path], suffixes: Sequence[str] = (".csv", ".xlsx", ".xls")) -> List[Path]:
+    """Files from ``paths``; directories contribute their supported files in name order."""
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.is_file() and p.suffix.lower() in suffixes and not p.name.startswith("~$")))
+        else:
+            files.append(path)
+    return files
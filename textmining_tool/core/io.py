@@ -1,18 +1,80 @@
 from __future__ import annotations
 
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, Optional, Sequence
 
 import pandas as pd
 
 
+# 스키마 매핑 화면에 필요한 만큼만 읽는다
+PREVIEW_ROWS = 100
+
+
 def load_table(path: str | Path, encoding: Optional[str] = None) -> pd.DataFrame:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(path)
     if path.suffix.lower() in {".xlsx", ".xls"}:
         return pd.read_excel(path)
-    return pd.read_csv(path, encoding=encoding or "utf-8", engine="python")
+    try:
+        return pd.read_csv(path, encoding=encoding or "utf-8")
+    except pd.errors.ParserError:
+        # 따옴표/구분자가 불규칙한 파일은 느리지만 관대한 python 엔진으로 다시 읽는다
+        return pd.read_csv(path, encoding=encoding or "utf-8", engine="python")
+
+
+def load_tables(paths: Sequence[str | Path], encoding: Optional[str] = None) -> pd.DataFrame:
+    """Load several exports with the same layout as one frame (columns are unioned)."""
+    frames = [load_table(path, encoding=encoding) for path in paths]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def _header_names(header: tuple) -> List[Any]:
+    """Column names as ``pd.read_excel`` would produce them (Unnamed: i, dup -> dup.1)."""
+    names: List[Any] = []
+    seen: dict[Any, int] = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def read_preview(path: str | Path, n_rows: int = PREVIEW_ROWS, encoding: Optional[str] = None) -> pd.DataFrame:
+    """Header plus the first ``n_rows`` rows without reading the rest of the file.
+
+    xlsx is streamed with openpyxl's read-only workbook, so the cost does not depend on the sheet
+    size; column names match what ``load_table`` later returns for the same file.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(path)
+    if path.suffix.lower() == ".xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            body = list(islice(rows, n_rows))
+            # read-only 모드는 서식만 남은 꼬리 열을 None으로 채우므로 값이 있는 마지막 열까지만 쓴다
+            width = max((i + 1 for row in [header, *body] for i, v in enumerate(row) if v is not None), default=0)
+            fit = lambda row: (*row[:width], *[None] * (width - len(row)))  # noqa: E731
+            return pd.DataFrame([fit(row) for row in body], columns=_header_names(fit(header)))
+        finally:
+            workbook.close()
+    if path.suffix.lower() == ".xls":
+        return pd.read_excel(path, nrows=n_rows)
+    return pd.read_csv(path, encoding=encoding or "utf-8", nrows=n_rows)
 
 
 def save_excel(path: str | Path, df: pd.DataFrame) -> None:
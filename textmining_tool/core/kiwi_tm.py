@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import os
 import re
+import threading
+import time
 import unicodedata
-from collections import Counter, defaultdict
-from typing import Dict, Iterable, List, Tuple
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
 
 import pandas as pd
-from kiwipiepy import Kiwi
+
+from . import search
+from .aggregates import CorpusStats
+from .dates import ensure_datetime
+from .memory import compact_frame
+
+if TYPE_CHECKING:
+    from kiwipiepy import Kiwi
 
 DEFAULT_STOPWORDS = {"하다", "되다", "있다", "없다", "이다", "그리고", "하지만", "그러나"}
 
@@ -21,17 +32,98 @@ _LAUGH_RE = re.compile(r"[ㅋㅎ]{2,}")
 _CRY_RE = re.compile(r"[ㅠㅜ]{2,}")
 
 
-class KiwiTextMiner:
-    def __init__(self, stopwords: Iterable[str] | None = None) -> None:
-        # Kiwi 초기화가 실패하거나 무거울 수 있으므로 지연 로딩
+def _rss_bytes() -> int | None:
+    try:
+        import psutil
+
+        return int(psutil.Process().memory_info().rss)
+    except Exception:  # noqa: BLE001
+        pass
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:  # noqa: BLE001
+        return None
+
+
+class KiwiService:
+    """Process-wide Kiwi analyzer shared by every consumer.
+
+    ``warm_up`` loads the model on a background thread at startup; ``get`` returns the shared
+    instance, waiting for an in-flight load instead of starting a second one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
         self._kiwi: Kiwi | None = None
+        self._thread: threading.Thread | None = None
+        self.load_seconds: float | None = None
+        self.memory_bytes: int | None = None
+        self.error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._kiwi is not None
+
+    def get(self) -> Kiwi:
+        with self._lock:
+            if self._kiwi is None:
+                started = time.perf_counter()
+                rss_before = _rss_bytes()
+                try:
+                    from kiwipiepy import Kiwi
+
+                    kiwi = Kiwi()
+                    # 첫 tokenize 호출 시의 내부 초기화까지 미리 끝내 둔다
+                    kiwi.tokenize("형태소 분석기 준비")
+                    self._kiwi = kiwi
+                except Exception as exc:  # noqa: BLE001
+                    self.error = f"{type(exc).__name__}: {exc}"
+                    raise
+                self.load_seconds = time.perf_counter() - started
+                rss_after = _rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    self.memory_bytes = max(0, rss_after - rss_before)
+                self.error = None
+            return self._kiwi
+
+    def warm_up(self) -> None:
+        if self._kiwi is not None or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        def _load() -> None:
+            try:
+                self.get()
+            except Exception:  # noqa: BLE001
+                # 실패는 error에 남기고, 실제 사용 시점에 다시 시도한다
+                pass
+
+        self._thread = threading.Thread(target=_load, name="kiwi-warmup", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kiwi_ready": self.ready,
+            "kiwi_load_s": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "kiwi_memory_mb": round(self.memory_bytes / 2**20, 1) if self.memory_bytes is not None else None,
+            "kiwi_error": self.error,
+        }
+
+
+kiwi_service = KiwiService()
+
+
+class KiwiTextMiner:
+    def __init__(self, stopwords: Iterable[str] | None = None, kiwi: Kiwi | None = None) -> None:
+        # 기본은 프로세스 공용 Kiwi(kiwi_service)를 사용하고, 필요 시 별도 인스턴스를 주입
+        self._kiwi: Kiwi | None = kiwi
         self.stopwords = set(stopwords or []).union(DEFAULT_STOPWORDS)
 
     @property
     def kiwi(self) -> Kiwi:
-        if self._kiwi is None:
-            self._kiwi = Kiwi()
-        return self._kiwi
+        if self._kiwi is not None:
+            return self._kiwi
+        return kiwi_service.get()
 
     def clean(self, text: str, options: Dict[str, any]) -> str:
         clean_text = text or ""
@@ -87,12 +179,16 @@ class KiwiTextMiner:
         df: pd.DataFrame,
         options: Dict[str, any],
         text_source: str = "both",
+        stats: CorpusStats | None = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Tokenize ``df``; freq/top50/monthly tables come from ``stats`` after adding these documents.
+
+        Pass a persisted ``CorpusStats`` to fold a new batch into cumulative counts; by default a fresh
+        one covers only ``df``.
+        """
         if df.empty:
             return df, df, df, df, df
         rows = []
-        freq_counter: Counter[str] = Counter()
-        doc_counter: defaultdict[str, int] = defaultdict(int)
         leaked_counter: Counter[str] = Counter()
         empty_clean_rows = []
         empty_token_rows = []
@@ -131,9 +227,6 @@ class KiwiTextMiner:
                 empty_clean_rows.append(row)
             if not tokens:
                 empty_token_rows.append(row)
-            freq_counter.update(tokens)
-            for tok in set(tokens):
-                doc_counter[tok] += 1
             rows.append(
                 {
                     "key": row.get("key"),
@@ -145,23 +238,13 @@ class KiwiTextMiner:
                 }
             )
         tokens_df = pd.DataFrame(rows)
-        freq_df = pd.DataFrame(
-            [
-                {"token": tok, "count": count, "doc_freq": doc_counter.get(tok, 0)}
-                for tok, count in freq_counter.items()
-                if count >= options.get("min_freq", 2)
-            ]
-        ).sort_values("count", ascending=False)
+        tokens_df["month"] = ensure_datetime(tokens_df["Date"]).dt.to_period("M").astype(str)
+        # 빈도/문서빈도/월별 빈도는 모두 가산 통계라 배치 단위로 누적할 수 있다
+        stats = stats if stats is not None else CorpusStats()
+        stats.add_documents(zip(tokens_df["key"], tokens_df["month"], tokens_df["tokens"]))
+        freq_df = stats.freq_df(options.get("min_freq", 2))
         top50_df = freq_df.head(50)
-        tokens_df["month"] = pd.to_datetime(tokens_df["Date"], errors="coerce").dt.to_period("M").astype(str)
-        monthly_top_df = (
-            tokens_df.explode("tokens")
-            .groupby(["month", "tokens"])
-            .size()
-            .reset_index(name="count")
-            .sort_values(["month", "count"], ascending=[True, False])
-        )
-        monthly_top_df = monthly_top_df.groupby("month").head(20)
+        monthly_top_df = stats.monthly_top_df(20)
         audit_rows = []
         for tok, count in leaked_counter.most_common(100):
             leak_type = "LATIN"
@@ -203,4 +286,48 @@ class KiwiTextMiner:
                 }
             )
         empty_report_df = pd.DataFrame(empty_report_rows)
-        return tokens_df, freq_df, top50_df, monthly_top_df, audit_df, empty_report_df
+        return compact_frame(tokens_df), freq_df, top50_df, monthly_top_df, audit_df, empty_report_df
+
+
+def compute_tokens(
+    miner: KiwiTextMiner,
+    df: pd.DataFrame,
+    options: Dict[str, Any],
+    text_source: str = "both",
+    stats_path: str | Path | None = None,
+    index_path: str | Path | None = None,
+) -> Dict[str, Any]:
+    """Outputs of the tokens stage, built off the GUI thread.
+
+    With ``stats_path`` the batch is folded into the cumulative ``CorpusStats`` stored there, which
+    is saved back (``added_docs`` reports how many documents were new). The token index is loaded
+    from ``index_path`` when it matches, otherwise built and saved there.
+    """
+    stats = CorpusStats.load(stats_path, with_pairs=True) if stats_path else None
+    docs_before = stats.docs if stats is not None else 0
+    tokens_df, freq_df, top50_df, monthly_df, audit_df, empty_df = miner.build_tokens(df, options, text_source=text_source, stats=stats)
+    if tokens_df.empty:
+        return {"tokens_df": tokens_df}
+    # 같은 데이터·옵션으로 만든 색인이 저장돼 있으면 다시 만들지 않는다
+    token_index = search.TokenIndex.load(index_path) if index_path else None
+    if token_index is None or len(token_index) != len(tokens_df):
+        token_index = search.TokenIndex.build(tokens_df)
+        if index_path:
+            token_index.save(index_path)
+    if stats is not None:
+        stats.save(stats_path)
+    return {
+        "tokens_df": tokens_df,
+        "freq_df": freq_df,
+        "top50_df": top50_df,
+        "monthly_top_df": monthly_df,
+        "audit_report_df": audit_df,
+        "empty_doc_report_df": empty_df,
+        "corpus_stats": stats,
+        "token_index": token_index,
+        "audit_snippets_df": search.keyword_snippets(token_index, top50_df["token"]),
+        "verbatim_df": None,
+        "cooccurrence_index": None,
+        # 파이프라인 속성이 아닌 실행 정보
+        "added_docs": stats.docs - docs_before if stats is not None else 0,
+    }
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import tempfile
+import weakref
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_object_dtype, is_string_dtype
+
+
+# 값 종류가 적은 컬럼은 category, 본문/해시 키는 Arrow 문자열로 보관한다
+CATEGORY_COLUMNS = ("Page Type", "page_type", "source_type", "period", "month", "toxicity_level", "context_mode")
+STRING_COLUMNS = (
+    "key",
+    "doc_id",
+    "sent_id",
+    "representative_key",
+    "Title",
+    "Full Text",
+    "title",
+    "text",
+    "clean_text",
+    "raw_text",
+    "sentence_clean",
+    "clean_text_snippet",
+    "raw_text_snippet",
+)
+
+# 고유값 비율이 이보다 높으면 category로 바꿔도 이득이 없다
+MAX_CATEGORY_RATIO = 0.5
+
+DEFAULT_BUDGET_MB = 4096
+# 화면에서는 다시 쓰지 않고 엑셀 내보내기에만 필요한 프레임(예산 초과 시 큰 것부터 디스크로 내린다)
+SPILLABLE_FRAMES = ("raw_df", "filtered_df", "canonical_export_df", "schema_mapping_df")
+SPILL_DIR = Path(tempfile.gettempdir()) / "textmining_tool" / "spill"
+
+
+def enable_copy_on_write() -> None:
+    """Turn on pandas copy-on-write so column selections and ``assign`` share data (default in pandas 3)."""
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+@lru_cache(maxsize=1)
+def arrow_string_dtype() -> pd.StringDtype | None:
+    """Arrow-backed string dtype with NaN missing values, or None when pyarrow is unavailable."""
+    if importlib.util.find_spec("pyarrow") is None:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        # pandas 2.2: 같은 의미의 저장소 이름
+        return pd.StringDtype("pyarrow_numpy")
+
+
+def _is_text_column(series: pd.Series) -> bool:
+    if not (is_object_dtype(series) or is_string_dtype(series)):
+        return False
+    return infer_dtype(series, skipna=True) in {"string", "empty"}
+
+
+def compact_frame(
+    df: pd.DataFrame | None,
+    categories: Iterable[str] = CATEGORY_COLUMNS,
+    strings: Iterable[str] = STRING_COLUMNS,
+) -> pd.DataFrame | None:
+    """Return ``df`` with low-cardinality labels as category and text/keys as Arrow strings.
+
+    Only columns that hold plain strings are converted; missing values stay NaN so comparisons,
+    ``.str`` methods and exports behave as before.
+    """
+    if df is None or df.empty:
+        return df
+    target: Dict[str, object] = {}
+    for col in categories:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype) and _is_text_column(df[col]):
+            if df[col].nunique(dropna=True) <= max(1, len(df) * MAX_CATEGORY_RATIO):
+                target[col] = "category"
+    string_dtype = arrow_string_dtype()
+    if string_dtype is not None:
+        for col in strings:
+            if col in df.columns and col not in target and df[col].dtype != string_dtype and _is_text_column(df[col]):
+                target[col] = string_dtype
+    return df.astype(target) if target else df
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    return float(df.memory_usage(deep=True).sum()) / 1024 / 1024
+
+
+class FrameSizes:
+    """Deep memory (MB) per DataFrame object, measured once and forgotten when the frame is freed.
+
+    Pipeline outputs are replaced rather than modified in place, so a frame's size is stable for
+    its lifetime and ``memory_usage(deep=True)`` runs only for frames not seen before.
+    """
+
+    def __init__(self) -> None:
+        self._sizes: Dict[int, Tuple[weakref.ref, float]] = {}
+
+    def __call__(self, df: pd.DataFrame) -> float:
+        key = id(df)
+        entry = self._sizes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+        size = frame_memory_mb(df)
+        self._sizes[key] = (weakref.ref(df, lambda ref, key=key: self._forget(key, ref)), size)
+        return size
+
+    def _forget(self, key: int, ref: weakref.ref) -> None:
+        # 같은 id가 새 프레임에 재사용된 경우 새 항목은 남긴다
+        entry = self._sizes.get(key)
+        if entry is not None and entry[0] is ref:
+            del self._sizes[key]
+
+
+def plan_spill(
+    frames: Dict[str, pd.DataFrame],
+    budget_mb: float,
+    spillable: Iterable[str] = SPILLABLE_FRAMES,
+    size_of: Callable[[pd.DataFrame], float] = frame_memory_mb,
+    extra_mb: float = 0.0,
+) -> List[str]:
+    """Names of spillable frames to move to disk, largest first, until the total fits ``budget_mb``.
+
+    Frames that share columns through copy-on-write are counted once per frame, so the total is an
+    upper bound. ``extra_mb`` is memory held elsewhere (e.g. memoized results) that counts against
+    the budget; ``size_of`` may be a ``FrameSizes`` cache.
+    """
+    sizes = {name: size_of(df) for name, df in frames.items()}
+    total = sum(sizes.values()) + extra_mb
+    plan: List[str] = []
+    for name in sorted((n for n in spillable if n in sizes), key=sizes.get, reverse=True):
+        if total <= budget_mb:
+            break
+        plan.append(name)
+        total -= sizes[name]
+    return plan
+
+
+def spill_frame(df: pd.DataFrame, name: str, spill_dir: str | Path | None = None) -> Path:
+    path = Path(spill_dir or SPILL_DIR) / f"{os.getpid()}-{name}.pkl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # pickle은 category/Arrow 문자열/리스트 컬럼을 그대로 보존한다
+    df.to_pickle(path)
+    return path
+
+
+def load_spilled(path: str | Path) -> pd.DataFrame:
+    return pd.read_pickle(path)
+
+
+def memory_report(frames: Dict[str, pd.DataFrame], spilled: Dict[str, Path] | None = None) -> pd.DataFrame:
+    """Per-frame rows/columns/deep memory (MB), largest first, plus spilled files and a total row."""
+    rows = [
+        {"frame": name, "location": "메모리", "rows": len(df), "columns": df.shape[1], "memory_mb": round(frame_memory_mb(df), 2)}
+        for name, df in frames.items()
+    ]
+    rows += [
+        {"frame": name, "location": "디스크", "rows": None, "columns": None, "memory_mb": round(Path(path).stat().st_size / 1024 / 1024, 2)}
+        for name, path in (spilled or {}).items()
+        if name not in frames and Path(path).exists()
+    ]
+    report = pd.DataFrame(rows, columns=["frame", "location", "rows", "columns", "memory_mb"])
+    report = report.sort_values(["location", "memory_mb"], ascending=[False, False], ignore_index=True)
+    in_memory = report[report["location"] == "메모리"]
+    total = {
+        "frame": "합계",
+        "location": "메모리",
+        "rows": int(in_memory["rows"].sum()),
+        "columns": int(in_memory["columns"].sum()),
+        "memory_mb": round(in_memory["memory_mb"].sum(), 2),
+    }
+    return pd.concat([report, pd.DataFrame([total])], ignore_index=True)
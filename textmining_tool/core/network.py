@@ -1,15 +1,27 @@
 from __future__ import annotations
 
 from collections import Counter
+import json
 import math
 from itertools import combinations
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
 import networkx as nx
+import numpy as np
 import pandas as pd
-from community import community_louvain
-from pyvis.network import Network
+
+from . import community
+from .aggregates import CorpusStats
+
+
+LAYOUT_ITERATIONS = 80
+# 이 노드 수 이하는 모든 쌍의 반발력을 정확히 계산하고, 초과하면 격자(FFT) 근사를 쓴다
+EXACT_REPULSION_MAX = 1000
+LAYOUT_GRID = 128
+_REPULSION_CHUNK = 512
+# 이보다 큰 그래프는 라벨 표시 기준을 높이고 드래그/줌 중 엣지를 숨긴다
+LARGE_GRAPH_NODES = 2000
 
 
 def _score_pair(method: str, n11: int, n1_: int, n_1: int, N: int) -> float:
@@ -39,6 +51,33 @@ def _score_pair(method: str, n11: int, n1_: int, n_1: int, N: int) -> float:
     return float(n11)
 
 
+def score_pairs(method: str, n11: np.ndarray, n1_: np.ndarray, n_1: np.ndarray, N: int) -> np.ndarray:
+    """Vectorized ``_score_pair`` over arrays of pair counts (same measures, same edge cases)."""
+    n11, n1_, n_1 = (np.asarray(a, dtype=float) for a in (n11, n1_, n_1))
+    N = float(N)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method.startswith("LLR"):
+            return np.log((n11 / N + 1e-9) / ((n1_ / N) * (n_1 / N) + 1e-9))
+        if method == "NPMI":
+            pxy, px, py = (n11 / N, n1_ / N, n_1 / N) if N else (n11 * 0, n1_ * 0, n_1 * 0)
+            valid = (pxy > 0) & (px > 0) & (py > 0)
+            pmi = np.log(np.where(valid, pxy / (px * py), 1.0))
+            return np.where(valid, pmi / -np.log(np.where(valid, pxy, 0.5)), -1.0)
+        if method == "Jaccard":
+            denom = n1_ + n_1 - n11
+            return np.where(denom != 0, n11 / denom, 0.0)
+        if method == "Cosine":
+            valid = (n1_ != 0) & (n_1 != 0)
+            return np.where(valid, n11 / np.sqrt(n1_ * n_1), 0.0)
+        if method == "Chi-square":
+            n10 = n1_ - n11
+            n01 = n_1 - n11
+            n00 = np.maximum(N - n11 - n10 - n01, 0)
+            denom = (n11 + n01) * (n11 + n10) * (n00 + n01) * (n00 + n10)
+            return (N * (n11 * n00 - n10 * n01) ** 2) / (denom + 1e-9)
+    return n11
+
+
 def build_cooccurrence_network(
     token_sets: Iterable[List[str]],
     min_edge_weight: int = 2,
@@ -47,17 +86,36 @@ def build_cooccurrence_network(
     top_edge_pct: float = 10.0,
     tightness: int = 5,
     hide_isolates: bool = False,
+    stats: CorpusStats | None = None,
+    community_method: str = "louvain",
+    resolution: float = 1.0,
+    community_weight: str = "weight",
+    seed: int = community.DEFAULT_SEED,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    counter: Counter[Tuple[str, str]] = Counter()
-    token_doc_freq: Counter[str] = Counter()
-    for tokens in token_sets:
-        unique_tokens = sorted(set(tokens))
-        for t in unique_tokens:
-            token_doc_freq[t] += 1
-        for a, b in combinations(unique_tokens, 2):
-            counter[(a, b)] += 1
+    """Co-occurrence network over ``token_sets``, or over the cumulative pair counts in ``stats``.
+
+    With ``stats`` (built ``with_pairs=True``) pair/document counts come from ``stats.pair_counts``
+    over its ``PAIR_MAX_TERMS`` most frequent terms; ``token_sets`` is ignored and only scoring, pruning and community detection run. Communities are detected on
+    the graph that is shown (after ``hide_isolates``) with a seeded backend from ``community.BACKENDS``.
+    """
+    if stats is not None and stats.with_pairs:
+        from scipy import sparse
+
+        terms, square, N = stats.pair_counts()
+        token_doc_freq = dict(zip(terms, square.diagonal().tolist()))
+        upper = sparse.triu(square, k=1).tocoo()
+        counter = {(terms[i], terms[j]): n for i, j, n in zip(upper.row.tolist(), upper.col.tolist(), upper.data.tolist())}
+    else:
+        counter: Counter[Tuple[str, str]] = Counter()
+        token_doc_freq: Counter[str] = Counter()
+        for tokens in token_sets:
+            unique_tokens = sorted(set(tokens))
+            for t in unique_tokens:
+                token_doc_freq[t] += 1
+            for a, b in combinations(unique_tokens, 2):
+                counter[(a, b)] += 1
+        N = len(token_sets)
     edges_scored = []
-    N = len(token_sets)
     for (a, b), n11 in counter.items():
         if n11 < max(min_edge_weight, min_n11):
             continue
@@ -76,10 +134,19 @@ def build_cooccurrence_network(
     G = nx.Graph()
     for a, b, n11, score in edges:
         G.add_edge(a, b, weight=n11, score=score)
-    partition = community_louvain.best_partition(G) if G.number_of_nodes() else {}
     if hide_isolates:
         isolate_nodes = [n for n in G.nodes if G.degree(n) <= 1]
         G.remove_nodes_from(isolate_nodes)
+    partition = community.detect_communities(
+        pd.DataFrame(
+            [(a, b, d.get("weight", 1), d.get("score", 0.0)) for a, b, d in G.edges(data=True)],
+            columns=["source", "target", "weight", "score"],
+        ),
+        method=community_method,
+        resolution=resolution,
+        weight=community_weight,
+        seed=seed,
+    )
     nodes_df = pd.DataFrame(
         {
             "id": list(G.nodes()),
@@ -98,6 +165,277 @@ def build_cooccurrence_network(
     return nodes_df, edges_df
 
 
+def build_period_networks(
+    tokens_df: pd.DataFrame,
+    unit: str = "month",
+    dt_col: str | None = "Date",
+    min_edge_weight: int = 2,
+    score_method: str = "LLR (기본)",
+    min_n11: int = 2,
+    top_edge_pct: float = 10.0,
+    community_method: str = "louvain",
+    resolution: float = 1.0,
+    seed: int = community.DEFAULT_SEED,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Co-occurrence networks per ``period`` (any unit of ``pivot._PERIOD_FORMATS``) in one pass.
+
+    Documents are grouped by period; each period's incidence ``X_p`` has only the terms that occur
+    in that period as columns, so ``X_p^T X_p`` gives its pair counts (off-diagonal) and document
+    frequencies (diagonal) without any cross-period block. Scoring, the top-% cut and communities
+    use each period's own counts, as if ``build_cooccurrence_network`` had run on that period alone.
+    Returns period-tagged nodes and edges plus ``edge_delta`` between consecutive periods that have
+    documents.
+    """
+    from scipy import sparse
+
+    from .pivot import add_period_column
+
+    if tokens_df is None or tokens_df.empty:
+        return pd.DataFrame(), pd.DataFrame(), edge_delta(pd.DataFrame(), [])
+    period = add_period_column(tokens_df[[c for c in tokens_df.columns if c != "period"]], unit, dt_col)["period"]
+    valid = period.notna().to_numpy()
+    # 범주는 시간순이므로 문서가 있는 기간만 그 순서대로 남긴다
+    labels = np.asarray([c for c in period.cat.categories if c in set(period[valid])], dtype=object)
+    token_sets = [list(dict.fromkeys(ts if isinstance(ts, list) else [])) for ts in tokens_df["tokens"][valid]]
+    lengths = np.fromiter((len(ts) for ts in token_sets), dtype=np.int64, count=len(token_sets))
+    # 정렬된 어휘 코드라 source < target이 되어 전체 네트워크, 다른 기간과 같은 방향으로 엣지가 맞춰진다
+    codes, terms = pd.factorize(pd.Series([t for ts in token_sets for t in ts], dtype=object), sort=True)
+    if not len(terms):
+        return pd.DataFrame(), pd.DataFrame(), edge_delta(pd.DataFrame(), [])
+    terms = np.asarray(terms, dtype=object)
+    period_code = pd.Categorical(period[valid], categories=labels).codes.astype(np.int64)
+    # 토큰을 기간 순으로 한 번 정렬해 두고 기간마다 연속 구간으로 잘라 쓴다
+    token_doc = np.repeat(np.arange(len(token_sets)), lengths)
+    by_period = np.argsort(period_code[token_doc], kind="stable")
+    token_bounds = np.searchsorted(period_code[token_doc][by_period], np.arange(len(labels) + 1))
+    docs_per_period = np.bincount(period_code, minlength=len(labels))
+    min_weight = max(min_edge_weight, min_n11)
+    edge_frames: List[pd.DataFrame] = []
+    doc_freq: dict = {}
+    for i, label in enumerate(labels):
+        positions = by_period[token_bounds[i] : token_bounds[i + 1]]
+        docs, doc_rows = np.unique(token_doc[positions], return_inverse=True)
+        # 기간에 나온 단어만 열로 쓰는 지역 코드(전역 코드 순서를 유지해 source < target도 유지)
+        local_terms, local = np.unique(codes[positions], return_inverse=True)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(local), dtype=np.int32), (doc_rows, local)),
+            shape=(len(docs), len(local_terms)),
+        )
+        square = sparse.triu(incidence.T @ incidence).tocoo()
+        on_diag = square.row == square.col
+        period_df = np.zeros(len(local_terms), dtype=np.int64)
+        period_df[square.row[on_diag]] = square.data[on_diag]
+        doc_freq[label] = pd.Series(period_df, index=terms[local_terms])
+        keep = ~on_diag & (square.data >= min_weight)
+        row, col, n11 = square.row[keep], square.col[keep], square.data[keep].astype(np.int64)
+        if not len(n11):
+            continue
+        score = score_pairs(score_method, n11, period_df[row], period_df[col], int(docs_per_period[i]))
+        order = np.lexsort((col, row, -score))
+        if 0 < top_edge_pct < 100:
+            # 기간마다 점수 상위 퍼센트만 남긴다(최소 1개)
+            order = order[: max(1, int(len(order) * (top_edge_pct / 100)))]
+        edge_frames.append(
+            pd.DataFrame(
+                {
+                    "period": label,
+                    "source": terms[local_terms[row[order]]],
+                    "target": terms[local_terms[col[order]]],
+                    "weight": n11[order],
+                    "score": score[order],
+                }
+            )
+        )
+    if not edge_frames:
+        return pd.DataFrame(), pd.DataFrame(), edge_delta(pd.DataFrame(), labels)
+    edges_df = pd.concat(edge_frames, ignore_index=True)
+    nodes_df = _period_nodes(edges_df, doc_freq, community_method, resolution, seed)
+    return nodes_df, edges_df, edge_delta(edges_df, labels)
+
+
+def _period_nodes(
+    edges_df: pd.DataFrame,
+    doc_freq: dict,
+    community_method: str,
+    resolution: float,
+    seed: int,
+) -> pd.DataFrame:
+    columns = ["period", "id", "degree", "doc_freq", "community"]
+    if edges_df.empty:
+        return pd.DataFrame(columns=columns)
+    frames = []
+    for period, group in edges_df.groupby("period", sort=False):
+        ends = pd.concat([group["source"], group["target"]], ignore_index=True)
+        degree = ends.value_counts(sort=False)
+        partition = community.detect_communities(group, method=community_method, resolution=resolution, seed=seed)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "period": period,
+                    "id": degree.index,
+                    "degree": degree.to_numpy(),
+                    "doc_freq": doc_freq[period].reindex(degree.index).to_numpy(),
+                    "community": [partition.get(n, 0) for n in degree.index],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+EDGE_DELTA_COLUMNS = [
+    "period_from",
+    "period_to",
+    "source",
+    "target",
+    "status",
+    "weight_prev",
+    "weight",
+    "weight_delta",
+    "score_prev",
+    "score",
+    "score_delta",
+]
+
+
+def edge_delta(edges_df: pd.DataFrame, periods: Iterable[str]) -> pd.DataFrame:
+    """Edge changes between consecutive ``periods``: new, dropped and kept edges with weight/score deltas.
+
+    Rows are ordered by period and then by the size of the weight change.
+    """
+    periods = list(periods)
+    if edges_df.empty or len(periods) < 2:
+        return pd.DataFrame(columns=EDGE_DELTA_COLUMNS)
+    empty = pd.DataFrame(columns=["weight", "score"], index=pd.MultiIndex.from_arrays([[], []], names=["source", "target"]))
+    by_period = {p: g.set_index(["source", "target"])[["weight", "score"]] for p, g in edges_df.groupby("period", sort=False)}
+    frames = []
+    for prev, cur in zip(periods, periods[1:]):
+        merged = by_period.get(prev, empty).join(by_period.get(cur, empty), how="outer", lsuffix="_prev").reset_index()
+        if merged.empty:
+            continue
+        merged["status"] = np.select([merged["weight_prev"].isna(), merged["weight"].isna()], ["new", "dropped"], default="kept")
+        merged["weight_delta"] = merged["weight"].fillna(0) - merged["weight_prev"].fillna(0)
+        merged["score_delta"] = merged["score"] - merged["score_prev"]
+        frames.append(merged.assign(period_from=prev, period_to=cur, _change=merged["weight_delta"].abs()))
+    if not frames:
+        return pd.DataFrame(columns=EDGE_DELTA_COLUMNS)
+    delta = pd.concat(frames, ignore_index=True)
+    delta = delta.sort_values(["period_to", "_change"], ascending=[True, False], kind="stable")
+    return delta[EDGE_DELTA_COLUMNS].reset_index(drop=True)
+
+
+def _mesh_repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+    """Approximate all-pairs repulsion: node mass on a grid convolved (FFT) with the k^2/r kernel."""
+    from scipy.signal import fftconvolve
+
+    grid = LAYOUT_GRID
+    lo = pos.min(0)
+    cell_size = max(float((pos.max(0) - lo).max()) / (grid - 1), 1e-9)
+    cell = np.minimum(((pos - lo) / cell_size + 0.5).astype(np.int64), grid - 1)
+    mass = np.zeros((grid, grid))
+    np.add.at(mass, (cell[:, 0], cell[:, 1]), 1.0)
+    offset = np.arange(-(grid - 1), grid) * cell_size
+    dx, dy = np.meshgrid(offset, offset, indexing="ij")
+    r2 = dx**2 + dy**2
+    r2[grid - 1, grid - 1] = np.inf
+    field_x = fftconvolve(mass, dx / r2, mode="same")
+    field_y = fftconvolve(mass, dy / r2, mode="same")
+    return k * k * np.column_stack([field_x[cell[:, 0], cell[:, 1]], field_y[cell[:, 0], cell[:, 1]]])
+
+
+def compute_layout(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    tightness: int = 5,
+    spread: float = 1.0,
+    iterations: int = LAYOUT_ITERATIONS,
+    seed: int = community.DEFAULT_SEED,
+) -> pd.DataFrame:
+    """Fruchterman-Reingold positions (``id``, ``x``, ``y``) computed with numpy.
+
+    Repulsion is exact for up to ``EXACT_REPULSION_MAX`` nodes; larger graphs use a particle-mesh
+    approximation (``LAYOUT_GRID`` x ``LAYOUT_GRID`` grid, FFT convolution), so each iteration is
+    linear in the number of nodes and edges. Nodes start near their community's anchor, so a seeded run is reproducible.
+    """
+    ids = nodes_df["id"].tolist()
+    n = len(ids)
+    if n == 0:
+        return pd.DataFrame(columns=["id", "x", "y"])
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2)) * 0.2 - 0.1
+    if "community" in nodes_df.columns:
+        comm = nodes_df["community"].to_numpy(dtype=np.int64)
+        angle = 2 * np.pi * comm / max(1, int(comm.max()) + 1)
+        pos += 0.35 * np.column_stack([np.cos(angle), np.sin(angle)])
+    pos += 0.5
+    lookup = pd.Index(ids)
+    src = lookup.get_indexer(edges_df["source"]) if not edges_df.empty else np.empty(0, dtype=np.int64)
+    dst = lookup.get_indexer(edges_df["target"]) if not edges_df.empty else np.empty(0, dtype=np.int64)
+    keep = (src >= 0) & (dst >= 0)
+    src, dst = src[keep], dst[keep]
+    weight = np.log1p(edges_df["weight"].to_numpy(dtype=float)[keep]) if "weight" in edges_df.columns and len(src) else np.ones(len(src))
+    weight = weight / weight.mean() if len(weight) and weight.mean() > 0 else weight
+    # 뭉침 정도가 클수록 노드 간 이상 거리(k)가 짧아진다
+    k = spread * max(0.3, 1.5 - tightness * 0.1) * np.sqrt(1.0 / n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        disp = np.zeros_like(pos)
+        if n <= EXACT_REPULSION_MAX:
+            for start in range(0, n, _REPULSION_CHUNK):
+                delta = pos[start : start + _REPULSION_CHUNK, None, :] - pos[None, :, :]
+                dist2 = np.maximum((delta**2).sum(-1), 1e-6)
+                disp[start : start + _REPULSION_CHUNK] += (delta * (k * k / dist2)[..., None]).sum(1)
+        else:
+            disp += _mesh_repulsion(pos, k)
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.sqrt((delta**2).sum(1))
+            pull = delta * (dist * weight / k)[:, None]
+            for ax in (0, 1):
+                disp[:, ax] -= np.bincount(src, pull[:, ax], minlength=n)
+                disp[:, ax] += np.bincount(dst, pull[:, ax], minlength=n)
+        # 연결되지 않은 덩어리가 멀리 흩어지지 않도록 약한 중심 인력
+        disp -= (pos - 0.5) * (k * k * n * 0.1)
+        length = np.maximum(np.sqrt((disp**2).sum(1)), 1e-12)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    return pd.DataFrame({"id": ids, "x": pos[:, 0], "y": pos[:, 1]})
+
+
+def _vis_network_js() -> str:
+    """vis-network bundled with pyvis (installed locally), so the page works without network access."""
+    from pyvis import __file__ as pyvis_file
+
+    lib = Path(pyvis_file).resolve().parent / "lib"
+    candidates = sorted(lib.glob("vis-*/vis-network.min.js"), reverse=True)
+    if not candidates:
+        raise FileNotFoundError("pyvis 패키지에서 vis-network.min.js를 찾을 수 없습니다.")
+    return candidates[0].read_text(encoding="utf-8")
+
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>html, body {{ margin: 0; height: 100%; }} #network {{ width: 100%; height: 640px; border: 1px solid #ddd; }}</style>
+<script>{script}</script>
+</head>
+<body>
+<div id="network"></div>
+<script>
+var nodes = new vis.DataSet({nodes});
+var edges = new vis.DataSet({edges});
+var network = new vis.Network(document.getElementById("network"), {{nodes: nodes, edges: edges}}, {options});
+</script>
+</body>
+</html>
+"""
+
+
+def _json_for_script(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+
 def render_pyvis_html(
     nodes_df: pd.DataFrame,
     edges_df: pd.DataFrame,
@@ -106,17 +444,42 @@ def render_pyvis_html(
     hide_isolates: bool = False,
     tightness: int = 5,
 ) -> Path:
-    net = Network(height="640px", width="100%", notebook=False, cdn_resources="remote")
-    physics_kwargs = {"spring_length": max(50, 200 - tightness * 10), "spring_strength": 0.01 + tightness * 0.002}
-    net.barnes_hut(**physics_kwargs)
-    for _, row in nodes_df.iterrows():
-        net.add_node(row["id"], title=row["id"], group=row.get("community", 0))
-    for _, row in edges_df.iterrows():
-        net.add_edge(row["source"], row["target"], value=row.get("weight", 1))
-    if avoid_overlap:
-        net.toggle_physics(True)
-    if hide_isolates:
-        net.filter_edges(lambda e: True)
+    """Write a self-contained network page with positions computed in Python and physics off.
+
+    vis-network is inlined, so nothing is fetched from a CDN. Labels are drawn by node size: at the
+    default zoom only high-degree nodes show text and the rest appear as the user zooms in.
+    """
+    if hide_isolates and not edges_df.empty:
+        linked = pd.unique(pd.concat([edges_df["source"], edges_df["target"]], ignore_index=True))
+        nodes_df = nodes_df[nodes_df["id"].isin(linked)]
+    layout = compute_layout(nodes_df, edges_df, tightness=tightness, spread=1.5 if avoid_overlap else 1.0)
+    n = len(layout)
+    scale = max(600.0, np.sqrt(max(n, 1)) * 60.0)
+    degree = nodes_df["degree"].to_numpy() if "degree" in nodes_df.columns else np.ones(n)
+    group = nodes_df["community"].to_numpy() if "community" in nodes_df.columns else np.zeros(n, dtype=int)
+    nodes = [
+        {"id": str(node_id), "label": str(node_id), "title": f"{node_id} (degree {int(deg)})", "group": int(grp), "value": float(deg), "x": round(float(x), 1), "y": round(float(y), 1)}
+        for node_id, grp, deg, x, y in zip(layout["id"], group, degree, (layout["x"] - 0.5) * scale, (layout["y"] - 0.5) * scale)
+    ]
+    edge_weight = edges_df["weight"] if "weight" in edges_df.columns else pd.Series(1, index=edges_df.index)
+    edges = [
+        {"from": str(a), "to": str(b), "value": float(w)}
+        for a, b, w in zip(edges_df.get("source", []), edges_df.get("target", []), edge_weight)
+    ]
+    large = n > LARGE_GRAPH_NODES
+    options = {
+        "physics": {"enabled": False},
+        "layout": {"improvedLayout": False},
+        "nodes": {
+            "shape": "dot",
+            # 화면상 글자 크기가 drawThreshold보다 작으면 라벨을 그리지 않는다(확대할수록 더 많은 라벨이 보임)
+            "scaling": {"min": 5, "max": 40, "label": {"enabled": True, "min": 8, "max": 36, "drawThreshold": 9 if large else 5, "maxVisible": 36}},
+        },
+        "edges": {"smooth": False, "color": {"inherit": "from", "opacity": 0.35}, "scaling": {"min": 0.5, "max": 6}},
+        "interaction": {"hideEdgesOnDrag": large, "hideEdgesOnZoom": large, "tooltipDelay": 150},
+    }
+    html = _HTML_TEMPLATE.format(script=_vis_network_js(), nodes=_json_for_script(nodes), edges=_json_for_script(edges), options=_json_for_script(options))
     output_path = Path(output_path)
-    net.show(str(output_path))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(html, encoding="utf-8")
     return output_path
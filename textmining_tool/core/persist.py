@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+from typing import Any
+
+from .pipeline import MEMO_SIZE
+
+
+# QApplication 이름이 없을 때(스크립트/테스트) 쓰는 사용자별 데이터 폴더
+FALLBACK_DATA_DIR = Path.home() / ".textmining_tool"
+# 지문별 색인은 종류마다 파이프라인 메모(되돌리기)에 남을 수 있는 만큼만 보관한다
+KEEP_INDEXES = MEMO_SIZE
+
+
+def data_dir(*parts: str) -> Path:
+    """Per-user folder (or a subfolder of it) for indexes, stats and journals that outlive the app.
+
+    Qt's ``AppDataLocation`` is used once the application is named, else ``~/.textmining_tool``.
+    A ``--onefile`` build unpacks the package into a temporary folder deleted on exit, so nothing
+    kept across runs may live next to the code.
+    """
+    root = FALLBACK_DATA_DIR
+    try:
+        from PyQt6.QtCore import QCoreApplication, QStandardPaths
+    except ImportError:
+        QCoreApplication = None
+    if QCoreApplication is not None and QCoreApplication.applicationName():
+        location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        if location:
+            root = Path(location)
+    return root.joinpath(*parts)
+
+
+def index_path(kind: str, fingerprint: str) -> Path:
+    """``<data dir>/index/<kind>-<fingerprint>.pkl`` for a per-fingerprint index."""
+    return data_dir("index") / f"{kind}-{fingerprint[:16]}.pkl"
+
+
+def save_pickle(obj: Any, path: str | Path, keep: int | None = None) -> Path:
+    """Pickle ``obj`` to ``path`` through a temporary file so a crash never leaves a partial file.
+
+    With ``keep``, files of the same kind next to ``path`` (``<kind>-*.pkl``) beyond the ``keep``
+    most recently written are deleted.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as fh:
+        pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+    if keep is not None:
+        prune(path, keep)
+    return path
+
+
+def load_pickle(path: str | Path | None) -> Any | None:
+    """Unpickled contents of ``path``, or None when it does not exist."""
+    if path is None or not Path(path).exists():
+        return None
+    with Path(path).open("rb") as fh:
+        return pickle.load(fh)
+
+
+def prune(path: str | Path, keep: int = KEEP_INDEXES) -> int:
+    """Delete older ``<kind>-*.pkl`` siblings of ``path``, keeping ``path`` and the newest ones."""
+    path = Path(path)
+    kind = path.name.split("-", 1)[0]
+    siblings = sorted(
+        (p for p in path.parent.glob(f"{kind}-*.pkl") if p != path),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    stale = siblings[max(0, keep - 1) :]
+    for old in stale:
+        old.unlink(missing_ok=True)
+    return len(stale)
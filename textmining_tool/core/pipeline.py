@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from .state import AppState
+
+
+# 단계 -> (상위 단계, AppState에 쓰는 결과 속성)
+STAGES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "preprocess": (
+        (),
+        ("filtered_df", "dedup_df", "canonical_df", "canonical_export_df", "schema_mapping_df"),
+    ),
+    "pivot": (("preprocess",), ("pivot_df",)),
+    "tokens": (
+        ("preprocess",),
+        (
+            "tokens_df",
+            "freq_df",
+            "top50_df",
+            "monthly_top_df",
+            "audit_report_df",
+            "empty_doc_report_df",
+            "corpus_stats",
+            "token_index",
+            "cooccurrence_index",
+            "audit_snippets_df",
+            "verbatim_df",
+        ),
+    ),
+    "burst": (("tokens",), ("emerging_df",)),
+    "toxicity": (("tokens",), ("toxicity_detail_df", "toxicity_summary_df")),
+    "sentiment": (
+        ("tokens", "toxicity"),
+        ("sentiment_df", "sentiment_sentence_df", "sentiment_doc_df", "sentiment_month_df", "gemini_evidence_df"),
+    ),
+    "network": (("tokens",), ("nodes_df", "edges_df", "pyvis_html_path")),
+    "period_network": (("tokens",), ("period_nodes_df", "period_edges_df", "edge_delta_df")),
+    "rules": (("tokens",), ("rules_df", "rules_segments_df")),
+    "export": (("pivot", "burst", "toxicity", "sentiment", "network", "period_network", "rules"), ()),
+}
+
+# 단계별로 보관하는 과거 결과 수(옵션을 되돌리면 재계산 없이 복원)
+MEMO_SIZE = 2
+
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def descendants(stage: str) -> List[str]:
+    """Stages downstream of ``stage`` in topological (declaration) order."""
+    found: set[str] = set()
+    for name, (parents, _) in STAGES.items():
+        if stage in parents or found.intersection(parents):
+            found.add(name)
+    return [name for name in STAGES if name in found]
+
+
+@dataclass
+class StageRecord:
+    fingerprint: str
+    upstream: Dict[str, str | None]
+
+
+@dataclass
+class Pipeline:
+    """Stage DAG over ``AppState`` with results memoized by a hash of parameters and upstream results.
+
+    A stage's fingerprint combines its parameters with the fingerprints of its parents, so any
+    change upstream changes every fingerprint below it. ``commit`` clears the outputs of downstream
+    stages that were computed from a different upstream, and ``lookup`` restores a memoized result
+    when the same fingerprint comes back.
+    """
+
+    records: Dict[str, StageRecord] = field(default_factory=dict)
+    memo: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = field(default_factory=dict)
+
+    def fingerprint(self, stage: str, params: Dict[str, Any]) -> str:
+        parents, _ = STAGES[stage]
+        upstream = {p: self.current(p) for p in parents}
+        return _digest({"stage": stage, "params": params, "upstream": upstream})
+
+    def current(self, stage: str) -> str | None:
+        record = self.records.get(stage)
+        return record.fingerprint if record else None
+
+    def is_stale(self, stage: str) -> bool:
+        """True when the stage has results that were computed from different upstream results."""
+        record = self.records.get(stage)
+        if record is None:
+            return False
+        parents, _ = STAGES[stage]
+        return any(record.upstream.get(p) != self.current(p) for p in parents)
+
+    def lookup(self, state: "AppState", stage: str, params: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Restore and return memoized outputs for these parameters, or None when they must be computed."""
+        fp = self.fingerprint(stage, params)
+        outputs = self.memo.get(stage, {}).get(fp)
+        if outputs is None:
+            return None
+        self.memo[stage].move_to_end(fp)
+        self._apply(state, stage, fp, outputs)
+        return outputs
+
+    def commit(self, state: "AppState", stage: str, params: Dict[str, Any], outputs: Dict[str, Any]) -> List[str]:
+        """Store a freshly computed result; returns the downstream stages that were invalidated."""
+        fp = self.fingerprint(stage, params)
+        stage_memo = self.memo.setdefault(stage, OrderedDict())
+        stage_memo[fp] = outputs
+        stage_memo.move_to_end(fp)
+        while len(stage_memo) > MEMO_SIZE:
+            stage_memo.popitem(last=False)
+        return self._apply(state, stage, fp, outputs)
+
+    def release(self, names: List[str]) -> None:
+        """Drop memoized references to attributes that were spilled to disk.
+
+        Only the current result of an owning stage is kept (with the attribute cleared, since the
+        spill file holds it); older results of that stage are forgotten so the memory is freed.
+        """
+        for stage, (_, attrs) in STAGES.items():
+            if not set(names).intersection(attrs) or stage not in self.memo:
+                continue
+            current = self.current(stage)
+            for fp in list(self.memo[stage]):
+                if fp != current:
+                    del self.memo[stage][fp]
+                    continue
+                for name in names:
+                    if name in self.memo[stage][fp]:
+                        self.memo[stage][fp][name] = None
+
+    def memoized_outputs(self) -> List[Any]:
+        """Output values held only by older memo entries (not the current result of their stage)."""
+        current: set[int] = set()
+        older: Dict[int, Any] = {}
+        for stage, entries in self.memo.items():
+            for fp, outputs in entries.items():
+                for value in outputs.values():
+                    if value is None:
+                        continue
+                    if fp == self.current(stage):
+                        current.add(id(value))
+                    else:
+                        older[id(value)] = value
+        return [value for key, value in older.items() if key not in current]
+
+    def trim(self) -> List[str]:
+        """Forget every memo entry except each stage's current result; returns the trimmed stages."""
+        trimmed: List[str] = []
+        for stage, entries in self.memo.items():
+            current = self.current(stage)
+            stale = [fp for fp in entries if fp != current]
+            for fp in stale:
+                del entries[fp]
+            if stale:
+                trimmed.append(stage)
+        return trimmed
+
+    def _apply(self, state: "AppState", stage: str, fp: str, outputs: Dict[str, Any]) -> List[str]:
+        attrs = {f.name for f in fields(state)}
+        for name, value in outputs.items():
+            if name in attrs:
+                setattr(state, name, value)
+        parents, _ = STAGES[stage]
+        self.records[stage] = StageRecord(fp, {p: self.current(p) for p in parents})
+        invalidated: List[str] = []
+        for name in descendants(stage):
+            # 위상 순서로 돌며 지우므로 비워진 단계의 하위 단계도 연쇄적으로 stale이 된다
+            if not self.is_stale(name):
+                continue
+            # 상위 결과가 바뀐 하위 단계는 결과를 비워 오래된 프레임이 재사용/내보내기 되지 않게 한다
+            for attr in STAGES[name][1]:
+                setattr(state, attr, None)
+            del self.records[name]
+            invalidated.append(name)
+        if invalidated:
+            state.update_log("pipeline", "invalidated", {"stage": stage, "stages": ", ".join(invalidated)})
+        return invalidated
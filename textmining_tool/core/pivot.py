@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from datetime import date
+
+import numpy as np
 import pandas as pd
 
+from .dates import ensure_datetime
+
 
 _PERIOD_FORMATS = {
     "year": "%Y",
@@ -22,32 +27,153 @@ def detect_dt_col(df: pd.DataFrame) -> str | None:
     return None
 
 
-def add_period_column(df: pd.DataFrame, unit: str, dt_col: str | None = "Date") -> pd.DataFrame:
+_EPOCH = pd.Timestamp("1970-01-01")
+
+
+def _resolve_dt_col(df: pd.DataFrame, dt_col: str | None) -> str:
     if dt_col is None or dt_col not in df.columns:
         dt_col = detect_dt_col(df)
     if dt_col is None or dt_col not in df.columns:
         raise ValueError(f"Date column missing for period derivation. Available: {list(df.columns)}")
     if df[dt_col].isna().all():
         raise ValueError("Date column is empty after parsing")
+    return dt_col
+
+
+def add_period_column(df: pd.DataFrame, unit: str, dt_col: str | None = "Date") -> pd.DataFrame:
+    """``df`` with a categorical ``period`` label per row (NaN where the date is missing).
+
+    Labels come from ``format_period_codes`` and categories are in chronological order.
+    """
+    dt_col = _resolve_dt_col(df, dt_col)
     unit = unit.lower()
-    result = df.copy()
-    date_series = pd.to_datetime(result[dt_col], errors="coerce")
-    if unit == "half":
-        result["period"] = date_series.dt.year.astype(str) + "-H" + (((date_series.dt.month - 1) // 6) + 1).astype(str)
-    elif unit == "quarter":
-        result["period"] = date_series.dt.year.astype(str) + "-Q" + (((date_series.dt.month - 1) // 3) + 1).astype(str)
-    elif unit in _PERIOD_FORMATS and _PERIOD_FORMATS[unit]:
-        result["period"] = date_series.dt.strftime(_PERIOD_FORMATS[unit])
-    else:
+    if unit not in _PERIOD_FORMATS:
         raise ValueError(f"Unsupported period unit: {unit}")
-    return result
+    # 위치 기준 인덱스로 코드를 구해 중복 인덱스에서도 행이 어긋나지 않게 한다
+    codes = period_codes(df[dt_col].reset_index(drop=True))[unit]
+    uniq = np.sort(codes.unique())
+    positions = np.full(len(df), -1, dtype=np.int64)
+    positions[codes.index.to_numpy()] = np.searchsorted(uniq, codes.to_numpy())
+    labels = format_period_codes(unit, pd.Series(uniq, dtype="int64"))
+    period = pd.Categorical.from_codes(positions, categories=pd.Index(labels.to_numpy()))
+    # copy-on-write: 기존 컬럼은 원본과 공유하고 period만 추가
+    return df.assign(period=pd.Series(period, index=df.index))
+
+
+def period_codes(dates: pd.Series) -> pd.DataFrame:
+    """Integer period codes for every unit in ``_PERIOD_FORMATS`` (NaT rows dropped).
+
+    Codes sort chronologically: year, year*2+half, year*4+quarter, year*12+month, ISO year*100+week,
+    days since epoch and hours since epoch.
+    """
+    dates = ensure_datetime(dates)
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_localize(None)
+    dates = dates[dates.notna()]
+    year = dates.dt.year.astype("int64")
+    month = dates.dt.month.astype("int64")
+    iso = dates.dt.isocalendar()
+    return pd.DataFrame(
+        {
+            "year": year,
+            "half": year * 2 + (month - 1) // 6,
+            "quarter": year * 4 + (month - 1) // 3,
+            "month": year * 12 + month - 1,
+            "week": iso["year"].astype("int64") * 100 + iso["week"].astype("int64"),
+            "day": (dates.dt.normalize() - _EPOCH) // pd.Timedelta(days=1),
+            "hour": (dates.dt.floor("h") - _EPOCH) // pd.Timedelta(hours=1),
+        },
+        index=dates.index,
+    )
+
+
+def format_period_codes(unit: str, codes: pd.Series) -> pd.Series:
+    """Render codes from ``period_codes`` as the labels ``add_period_column`` produces."""
+    unit = unit.lower()
+    codes = codes.astype("int64")
+    if unit == "year":
+        return codes.astype(str)
+    if unit == "half":
+        return (codes // 2).astype(str) + "-H" + (codes % 2 + 1).astype(str)
+    if unit == "quarter":
+        return (codes // 4).astype(str) + "-Q" + (codes % 4 + 1).astype(str)
+    if unit == "month":
+        return (codes // 12).astype(str).str.zfill(4) + "-" + (codes % 12 + 1).astype(str).str.zfill(2)
+    if unit == "week":
+        return (codes // 100).astype(str).str.zfill(4) + "-W" + (codes % 100).astype(str).str.zfill(2)
+    if unit == "day":
+        return (_EPOCH + pd.to_timedelta(codes, unit="D")).dt.strftime(_PERIOD_FORMATS["day"])
+    if unit == "hour":
+        return (_EPOCH + pd.to_timedelta(codes, unit="h")).dt.strftime(_PERIOD_FORMATS["hour"])
+    raise ValueError(f"Unsupported period unit: {unit}")
+
+
+def calendar_codes(unit: str, codes: np.ndarray) -> np.ndarray:
+    """Every ``period_codes`` code from the earliest to the latest of ``codes``, including empty periods."""
+    unit = unit.lower()
+    codes = np.asarray(codes, dtype=np.int64)
+    if not len(codes):
+        return codes
+    if unit == "week":
+        # ISO 주 코드(year*100+week)는 연도 경계에서 건너뛰므로 실제 월요일을 7일씩 밟아 만든다
+        first, last = (date.fromisocalendar(int(c // 100), int(c % 100), 1) for c in (codes.min(), codes.max()))
+        return period_codes(pd.Series(pd.date_range(first, last, freq="7D")))["week"].to_numpy()
+    return np.arange(codes.min(), codes.max() + 1, dtype=np.int64)
+
+
+class PivotCube:
+    """Hour-level count cube over (hour, Page Type, dims) built with a single date parse.
+
+    ``rollup`` re-aggregates the cube for any unit/Page Type/dim combination, so its cost depends
+    on the number of cells rather than the number of documents.
+    """
+
+    def __init__(self, df: pd.DataFrame, dt_col: str | None = "Date", dims: list[str] | None = None) -> None:
+        self.source = df
+        self.dt_col = _resolve_dt_col(df, dt_col)
+        self.dims = [d for d in (dims or []) if d in df.columns]
+        self.has_page_type = "Page Type" in df.columns
+        keys = self.dims + (["Page Type"] if self.has_page_type and "Page Type" not in self.dims else [])
+        hours = period_codes(df[self.dt_col])["hour"]
+        self.unparsed = int(len(df) - len(hours))
+        frame = df.loc[hours.index, keys].assign(_hour=hours.to_numpy())
+        # NaN 차원 값도 셀로 보존하고, 해당 차원을 집계 키로 쓸 때만 제외(groupby 기본 동작과 동일)
+        self.cells = frame.groupby(["_hour"] + keys, dropna=False, sort=False, observed=True).size().reset_index(name="count")
+        self._unit_codes: dict[str, pd.Series] = {}
+
+    def covers(self, df: pd.DataFrame, dims: list[str] | None = None) -> bool:
+        return df is self.source and all(d in self.dims for d in (dims or []) if d in df.columns)
+
+    def _codes(self, unit: str) -> pd.Series:
+        if unit not in self._unit_codes:
+            hours = _EPOCH + pd.to_timedelta(self.cells["_hour"], unit="h")
+            self._unit_codes[unit] = period_codes(hours)[unit]
+        return self._unit_codes[unit]
+
+    def rollup(self, unit: str, include_page_type: bool, group_dims: list[str] | None = None) -> pd.DataFrame:
+        unit = unit.lower()
+        if unit not in _PERIOD_FORMATS:
+            raise ValueError(f"Unsupported period unit: {unit}")
+        group_dims = [d for d in (group_dims or []) if d in self.dims]
+        group_cols = ["_code"] + group_dims
+        if include_page_type and self.has_page_type and "Page Type" not in group_cols:
+            group_cols.append("Page Type")
+        cells = self.cells.assign(_code=self._codes(unit).to_numpy())
+        pivoted = cells.groupby(group_cols, observed=True)["count"].sum().reset_index()
+        pivoted.insert(0, "period", format_period_codes(unit, pivoted.pop("_code")))
+        return pivoted
 
 
-def build_pivot(df: pd.DataFrame, unit: str, include_page_type: bool, group_dims: list[str] | None = None, dt_col: str | None = "Date") -> pd.DataFrame:
-    enriched = add_period_column(df, unit, dt_col=dt_col)
+def build_pivot(
+    df: pd.DataFrame,
+    unit: str,
+    include_page_type: bool,
+    group_dims: list[str] | None = None,
+    dt_col: str | None = "Date",
+    cube: PivotCube | None = None,
+) -> pd.DataFrame:
+    """Count documents per period; pass a ``PivotCube`` built from ``df`` to skip the row scan."""
     group_dims = group_dims or []
-    group_cols = ["period"] + group_dims
-    if include_page_type and "Page Type" in enriched.columns and "Page Type" not in group_cols:
-        group_cols.append("Page Type")
-    pivoted = enriched.groupby(group_cols).size().reset_index(name="count")
-    return pivoted
+    if cube is None or not cube.covers(df, group_dims):
+        cube = PivotCube(df, dt_col=dt_col, dims=group_dims)
+    return cube.rollup(unit, include_page_type, group_dims)
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import hashlib
 import re
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import pandas as pd
 from rapidfuzz import fuzz, process
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from . import ingest, memory
+from .dates import ensure_datetime, parse_datetime_column
 
 
 REQUIRED_COLUMNS = ["Date", "Title", "Full Text", "Page Type"]
@@ -26,7 +31,7 @@ def map_columns(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
         raise ValueError(f"Missing mapping for: {', '.join(missing)}")
     renamed = df.rename(columns={mapping[k]: k for k in mapping})
     if "Date" in renamed.columns:
-        renamed["Date"] = pd.to_datetime(renamed["Date"], errors="coerce")
+        renamed["Date"] = ensure_datetime(renamed["Date"])
     return renamed
 
 
@@ -40,7 +45,12 @@ def profile_columns(df: pd.DataFrame) -> Dict[str, List[str]]:
     # add heuristics for datetime
     for col in df.columns:
         sample = df[col].dropna().astype(str).head(50)
-        parse_success = pd.to_datetime(sample, errors="coerce").notna().mean() if not sample.empty else 0
+        if is_datetime64_any_dtype(df[col]):
+            parse_success = 1.0
+        elif is_numeric_dtype(df[col]) or sample.empty:
+            parse_success = 0
+        else:
+            parse_success = parse_datetime_column(sample)[1]["parsed"] / len(sample)
         if parse_success > 0.6 and col not in suggestions["dt"]:
             suggestions["dt"].append(col)
         avg_len = sample.str.len().mean() if not sample.empty else 0
@@ -60,17 +70,20 @@ def build_canonical(
     source_type_col: Optional[str],
     extra_dims: Sequence[str],
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    work = df.copy()
-    work["dt"] = pd.to_datetime(work[dt_col], errors="coerce")
-    work["text"] = work[text_cols].astype(str).agg(" ".join, axis=1).str.strip()
-    work["title"] = work[title_col] if title_col else ""
-    work["source_type"] = work[source_type_col] if source_type_col else ""
-    for dim in extra_dims:
-        work[f"dim_{dim}"] = work[dim]
-    key_parts = work[["dt", "title", "text", "source_type"] + [f"dim_{d}" for d in extra_dims] if extra_dims else []].astype(str).agg("|".join, axis=1)
-    work["doc_id"] = key_parts.apply(lambda x: hashlib.sha1(x.encode("utf-8")).hexdigest())
-    canonical_cols = ["doc_id", "dt", "text", "title", "source_type"] + [f"dim_{d}" for d in extra_dims]
-    canonical_df = work[canonical_cols]
+    # 원본 전체를 복사하지 않고 필요한 컬럼만으로 새 프레임을 만든다
+    dims = {f"dim_{dim}": df[dim] for dim in extra_dims}
+    canonical_df = pd.DataFrame(
+        {
+            "dt": ensure_datetime(df[dt_col]),
+            "text": df[list(text_cols)].astype(str).agg(" ".join, axis=1).str.strip(),
+            "title": df[title_col] if title_col else "",
+            "source_type": df[source_type_col] if source_type_col else "",
+            **dims,
+        },
+        index=df.index,
+    )
+    key_parts = canonical_df[["dt", "title", "text", "source_type", *dims]].astype(str).agg("|".join, axis=1)
+    canonical_df.insert(0, "doc_id", key_parts.map(lambda x: hashlib.sha1(x.encode("utf-8")).hexdigest()))
     mapping_df = pd.DataFrame(
         {
             "dt_col": [dt_col],
@@ -86,12 +99,12 @@ def build_canonical(
 def filter_page_types(df: pd.DataFrame, allowed: Iterable[str], exclude_news: bool) -> pd.DataFrame:
     if "Page Type" not in df.columns:
         return df
-    result = df.copy()
+    mask = pd.Series(True, index=df.index)
     if allowed:
-        result = result[result["Page Type"].isin(list(allowed))]
+        mask &= df["Page Type"].isin(list(allowed))
     if exclude_news:
-        result = result[result["Page Type"].str.lower() != "news"]
-    return result
+        mask &= df["Page Type"].astype(str).str.lower() != "news"
+    return df if mask.all() else df[mask]
 
 
 def build_key(row: pd.Series) -> str:
@@ -102,9 +115,7 @@ def build_key(row: pd.Series) -> str:
 
 
 def generate_keys(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["key"] = df.apply(build_key, axis=1)
-    return df
+    return df.assign(key=df.apply(build_key, axis=1))
 
 
 def remove_exact_duplicates(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -119,8 +130,7 @@ def remove_similar(df: pd.DataFrame, threshold: int = 95) -> tuple[pd.DataFrame,
     """Naive similarity-based dedup using rapidfuzz on title+text."""
     if df.empty:
         return df, df
-    merged = df.copy()
-    merged["_concat"] = (merged.get("Title", "") + " " + merged.get("Full Text", "")).fillna("")
+    merged = df.assign(_concat=(df.get("Title", "") + " " + df.get("Full Text", "")).fillna(""))
     selected_indices: List[int] = []
     removed_rows: List[int] = []
     for idx, text in merged["_concat"].items():
@@ -128,7 +138,7 @@ def remove_similar(df: pd.DataFrame, threshold: int = 95) -> tuple[pd.DataFrame,
             continue
         selected_indices.append(idx)
         matches = process.extract(text, merged["_concat"].to_dict(), scorer=fuzz.token_set_ratio, limit=None)
-        for match_idx, score, _ in matches:
+        for _, score, match_idx in matches:
             if match_idx == idx:
                 continue
             if score >= threshold:
@@ -136,3 +146,90 @@ def remove_similar(df: pd.DataFrame, threshold: int = 95) -> tuple[pd.DataFrame,
     deduped = merged.loc[selected_indices].drop(columns=["_concat"]) if selected_indices else merged.drop(columns=["_concat"])  # type: ignore[arg-type]
     removed = merged.loc[removed_rows].drop(columns=["_concat"]) if removed_rows else merged.iloc[0:0]
     return deduped, removed
+
+
+def compute_preprocess(
+    df: pd.DataFrame,
+    params: Dict[str, Any],
+    checked_types: Sequence[str],
+    key_index: str | Path | None = None,
+    load_id: str | None = None,
+    source: str = "",
+    files: int = 0,
+) -> Tuple[Dict[str, Any], List[Tuple[str, Dict[str, Any]]]]:
+    """Run the preprocess stage off the GUI thread; returns the stage outputs and log entries.
+
+    With ``params["incremental"]`` rows whose key an earlier load already ingested are dropped, and
+    only the documents left after exact and near-duplicate removal are recorded in ``key_index``.
+    Besides the ``AppState`` attributes the outputs hold ``removed``, ``date_report``,
+    ``page_types`` (the selected ones) and ``page_type_values`` for the page.
+    """
+    dt_col = params["dt_col"]
+    text_cols = params["text_cols"]
+    extra_dims = params["dims"]
+    logs: List[Tuple[str, Dict[str, Any]]] = []
+    # 날짜 컬럼은 여기서 한 번만 파싱하고 이후 단계는 datetime 컬럼을 그대로 재사용한다
+    date_report: Dict[str, Any] = {}
+    if dt_col in df.columns:
+        parsed_dates, date_report = parse_datetime_column(df[dt_col])
+        df = df.assign(**{dt_col: parsed_dates})
+        logs.append(("dates parsed", {"column": dt_col, **date_report}))
+    canonical_df, mapping_df = build_canonical(
+        df,
+        dt_col=dt_col,
+        text_cols=text_cols,
+        title_col=params["title_col"],
+        source_type_col=params["page_type_col"],
+        extra_dims=extra_dims,
+    )
+    mapping = {
+        "Date": dt_col,
+        "Title": params["title_col"],
+        "Full Text": text_cols[0] if text_cols else params["title_col"],
+        "Page Type": params["page_type_col"],
+    }
+    df = memory.compact_frame(map_columns(df, mapping))
+    if "Page Type" in df.columns:
+        page_type_values = [str(v) for v in sorted(df["Page Type"].dropna().unique())]
+        # 목록을 새로 채워도 사용자가 체크해 둔 Page Type은 유지한다
+        selected_types = [v for v in page_type_values if v in set(checked_types)]
+    else:
+        page_type_values = None
+        selected_types = list(checked_types)
+    filtered = filter_page_types(df, selected_types, params["exclude_news"])
+    deduped, removed = remove_exact_duplicates(generate_keys(filtered))
+    index = ingest.KeyIndex(key_index) if params["incremental"] and key_index and load_id else None
+    try:
+        rows = len(deduped)
+        if index is not None:
+            # 이전 로드에서 이미 적재한 키는 제외하고 새 문서만 하위 단계로 보낸다
+            deduped, seen = ingest.drop_seen(deduped, index, load_id)
+            removed = pd.concat([removed, seen])
+        if params["similar"] is not None:
+            deduped, similar_removed = remove_similar(deduped, threshold=params["similar"])
+            removed = pd.concat([removed, similar_removed])
+        if index is not None:
+            # 최종 중복 제거까지 통과한 문서만 기록한다(유사중복으로 빠진 문서는 적재된 것이 아니다)
+            added = index.add(deduped["key"], load_id, source=source)
+            report = ingest.IngestReport(load_id, files, rows, len(seen), len(deduped))
+            logs.append(("incremental", {**vars(report), "indexed": added, "index_size": len(index)}))
+    finally:
+        if index is not None:
+            index.close()
+    deduped = memory.compact_frame(deduped)
+    outputs = {
+        # sync canonical with dedup info
+        "canonical_df": canonical_df[canonical_df["doc_id"].isin(deduped["key"])],
+        "canonical_export_df": canonical_df,
+        "schema_mapping_df": mapping_df,
+        "filtered_df": filtered,
+        "dedup_df": deduped,
+        "date_col": dt_col,
+        "selected_dims": extra_dims,
+        # 화면 복원용(AppState 속성이 아님)
+        "removed": removed,
+        "date_report": date_report,
+        "page_types": selected_types,
+        "page_type_values": page_type_values,
+    }
+    return outputs, logs
@@ -15,6 +15,8 @@ class Evidence:
     target: str | None = None
 
 
+EVIDENCE_FIELDS = ["phrase", "type", "strength", "aspect", "target"]
+
 PROFANITY_MODES = {"ONCE_FIXED", "COUNT_ACCUM", "COUNT_CAP_TO_2"}
 PROFANITY_SCOPES = {"CLEAN_TEXT_ONLY", "RAW_TEXT_ONLY", "BOTH"}
 
@@ -98,13 +100,15 @@ def build_sentiment_df(
 ) -> pd.DataFrame:
     engine = RuleEngine(rules.get("profanity_fixed_list", []))
     if evidence_df is None or evidence_df.empty:
-        evidence_df = pd.DataFrame(columns=["key", "phrase", "type", "strength", "aspect", "target"])
+        evidence_df = pd.DataFrame(columns=["key"] + EVIDENCE_FIELDS)
     if "key" not in evidence_df.columns:
         evidence_df["key"] = []
     results = []
     for _, row in df.iterrows():
-        evidences = evidence_df[evidence_df["key"] == row.get("key")]
-        evidence_rows = evidences.to_dict(orient="records") if not evidences.empty else []
+        # 문장 단위 evidence는 sent_id로 묶여 있으므로 있으면 우선 사용
+        evidence_key = row.get("sent_id") or row.get("key")
+        evidences = evidence_df[evidence_df["key"] == evidence_key]
+        evidence_rows = evidences.reindex(columns=EVIDENCE_FIELDS).to_dict(orient="records") if not evidences.empty else []
         tox_roles: List[Dict[str, str]] = []
         tox_level = None
         tox_delta = 0
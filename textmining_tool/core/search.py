@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import persist
+from .memory import compact_frame
+
+
+# 원문과 함께 보여 주는 문서 메타 컬럼(있는 것만 보관)
+DOC_COLUMNS = ("key", "Date", "Page Type", "clean_text")
+KWIC_WINDOW = 30
+KWIC_COLUMNS = ["key", "Date", "Page Type", "keyword", "position", "left", "match", "right"]
+
+
+def _first_of_runs(values: np.ndarray) -> np.ndarray:
+    """Mask of the first element in each run of equal values (``values`` sorted)."""
+    mask = np.ones(len(values), dtype=bool)
+    mask[1:] = values[1:] != values[:-1]
+    return mask
+
+
+@dataclass
+class TokenIndex:
+    """Positional inverted index over ``tokens_df``.
+
+    Postings are stored CSR-style: the occurrences of term ``t`` are
+    ``post_doc[term_ptr[t]:term_ptr[t + 1]]`` (row in ``docs``) and ``post_pos`` (token position in
+    that document), sorted by document then position.
+    """
+
+    docs: pd.DataFrame
+    vocab: Dict[str, int]
+    term_ptr: np.ndarray
+    post_doc: np.ndarray
+    post_pos: np.ndarray
+
+    @classmethod
+    def build(cls, tokens_df: pd.DataFrame) -> "TokenIndex":
+        token_lists = tokens_df["tokens"].tolist()
+        lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+        codes, terms = pd.factorize(pd.Series(list(chain.from_iterable(token_lists)), dtype=object), sort=False)
+        doc = np.repeat(np.arange(len(token_lists), dtype=np.int32), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pos = (np.arange(len(codes), dtype=np.int64) - starts).astype(np.int32)
+        # 문서 순서로 펼친 토큰을 단어 기준 안정 정렬하면 단어별로 (문서, 위치) 오름차순이 된다
+        order = np.argsort(codes, kind="stable")
+        term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(terms)), out=term_ptr[1:])
+        docs = tokens_df[[c for c in DOC_COLUMNS if c in tokens_df.columns]].reset_index(drop=True)
+        return cls(
+            docs=compact_frame(docs),
+            vocab={term: i for i, term in enumerate(terms)},
+            term_ptr=term_ptr,
+            post_doc=doc[order],
+            post_pos=pos[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def postings(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        code = self.vocab.get(term)
+        if code is None:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty
+        start, end = self.term_ptr[code], self.term_ptr[code + 1]
+        return self.post_doc[start:end], self.post_pos[start:end]
+
+    def doc_rows(self, term: str) -> np.ndarray:
+        doc, _ = self.postings(term)
+        return doc[_first_of_runs(doc)]
+
+    def doc_freq(self, term: str) -> int:
+        return len(self.doc_rows(term))
+
+    def search(self, terms: Sequence[str], mode: str = "all", within: int | None = None) -> np.ndarray:
+        """Rows of ``docs`` containing all (or any) of ``terms``.
+
+        With ``within``, every other term must also occur within that many tokens of the first term.
+        """
+        terms = [t for t in dict.fromkeys(terms) if t]
+        if not terms:
+            return np.empty(0, dtype=np.int32)
+        row_sets = [self.doc_rows(t) for t in terms]
+        if mode == "any":
+            return np.unique(np.concatenate(row_sets))
+        rows = row_sets[0]
+        for other in sorted(row_sets[1:], key=len):
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        if within is not None and len(terms) > 1:
+            anchor_doc, anchor_pos = self.postings(terms[0])
+            for term in terms[1:]:
+                rows = np.intersect1d(rows, self._near(anchor_doc, anchor_pos, *self.postings(term), within), assume_unique=True)
+        return rows
+
+    @staticmethod
+    def _near(a_doc: np.ndarray, a_pos: np.ndarray, b_doc: np.ndarray, b_pos: np.ndarray, window: int) -> np.ndarray:
+        """Documents where some occurrence of b is within ``window`` tokens of an occurrence of a."""
+        if not len(a_doc) or not len(b_doc):
+            return np.empty(0, dtype=np.int32)
+        a_key = (a_doc.astype(np.int64) << 32) | a_pos
+        b_key = (b_doc.astype(np.int64) << 32) | b_pos
+        idx = np.searchsorted(a_key, b_key)
+        prev = np.clip(idx - 1, 0, len(a_key) - 1)
+        nxt = np.clip(idx, 0, len(a_key) - 1)
+        ok = ((idx > 0) & (a_doc[prev] == b_doc) & (b_pos - a_pos[prev] <= window)) | (
+            (idx < len(a_key)) & (a_doc[nxt] == b_doc) & (a_pos[nxt] - b_pos <= window)
+        )
+        return np.unique(b_doc[ok])
+
+    def kwic(
+        self,
+        terms: Sequence[str],
+        mode: str = "all",
+        within: int | None = None,
+        limit: int = 500,
+        window: int = KWIC_WINDOW,
+    ) -> pd.DataFrame:
+        """Keyword-in-context rows for the first term in the documents matching ``terms``.
+
+        ``position`` is the token position; ``left``/``match``/``right`` come from ``clean_text``
+        around the same occurrence of the keyword.
+        """
+        terms = [t for t in dict.fromkeys(terms) if t]
+        rows = self.search(terms, mode=mode, within=within)
+        if not len(rows):
+            return pd.DataFrame(columns=KWIC_COLUMNS)
+        # 문서마다 출현이 최소 한 번은 있으므로 앞쪽 limit개 문서만 보면 충분하다
+        rows = rows[:limit]
+        out: List[dict] = []
+        for term in terms if mode == "any" else terms[:1]:
+            doc, pos = self.postings(term)
+            hit = np.isin(doc, rows)
+            doc, pos = doc[hit], pos[hit]
+            # 같은 문서 안에서 몇 번째 출현인지(원문에서 같은 순번의 위치를 찾는다)
+            first = np.flatnonzero(_first_of_runs(doc))
+            nth = np.arange(len(doc)) - np.repeat(first, np.diff(np.append(first, len(doc))))
+            for row, position, occurrence in zip(doc[: limit - len(out)], pos, nth):
+                out.append({"row": int(row), "keyword": term, "position": int(position), **self._context(int(row), term, int(occurrence), window)})
+            if len(out) >= limit:
+                break
+        result = pd.DataFrame(out)
+        meta = self.docs.drop(columns=["clean_text"], errors="ignore").iloc[result["row"].to_numpy()].reset_index(drop=True)
+        result = pd.concat([meta, result.drop(columns="row")], axis=1)
+        return result[[c for c in KWIC_COLUMNS if c in result.columns]]
+
+    def _context(self, row: int, term: str, occurrence: int, window: int) -> Dict[str, str]:
+        text = self.docs["clean_text"].iat[row] if "clean_text" in self.docs.columns else ""
+        text = text if isinstance(text, str) else ""
+        start = -1
+        for _ in range(occurrence + 1):
+            found = text.find(term, start + 1)
+            if found < 0:
+                break
+            start = found
+        if start < 0:
+            # 원형 복원 등으로 원문에 그대로 없는 토큰은 문서 앞부분을 보여 준다
+            return {"left": "", "match": term, "right": text[: window * 2]}
+        end = start + len(term)
+        return {"left": text[max(0, start - window) : start], "match": text[start:end], "right": text[end : end + window]}
+
+    def save(self, path: str | Path) -> Path:
+        """Save atomically and prune indexes saved for older fingerprints."""
+        return persist.save_pickle(self, path, keep=persist.KEEP_INDEXES)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TokenIndex | None":
+        return persist.load_pickle(path)
+
+
+def index_path(fingerprint: str) -> Path:
+    return persist.index_path("tokens", fingerprint)
+
+
+def parse_query(text: str) -> List[str]:
+    """Terms of a query box entry; spaces, commas and ``+`` all separate terms."""
+    return [t for t in text.replace(",", " ").replace("+", " ").split() if t]
+
+
+def keyword_snippets(index: TokenIndex, terms: Iterable[str], per_term: int = 3, window: int = KWIC_WINDOW) -> pd.DataFrame:
+    """A few KWIC rows per keyword (e.g. the Top 50) for checking what each keyword refers to."""
+    frames = [index.kwic([t], limit=per_term, window=window) for t in terms]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=KWIC_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
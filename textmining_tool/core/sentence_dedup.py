@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from rapidfuzz import fuzz, process
+
+from .triage import LexiconScorer
+
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ]+")
+_REPEAT_RE = re.compile(r"(.)\1{2,}")
+
+# 근사중복 비교 후보를 줄이기 위한 앞/뒤 블록 길이
+_BLOCK_LEN = 5
+
+
+def normalize_sentence(text: str) -> str:
+    """Normalization used for duplicate grouping (NFKC, lowercase, no punctuation/space, ㅋㅋㅋ→ㅋㅋ)."""
+    norm = unicodedata.normalize("NFKC", text or "").lower()
+    norm = _NON_WORD_RE.sub("", norm)
+    return _REPEAT_RE.sub(r"\1\1", norm)
+
+
+@dataclass
+class SentenceGroups:
+    representatives: List[Tuple[str, str]] = field(default_factory=list)
+    members: Dict[str, List[str]] = field(default_factory=dict)
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+
+    @property
+    def saved(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+
+def group_sentences(
+    texts: List[Tuple[str, str]],
+    near_threshold: int | None = None,
+    scorer: LexiconScorer | None = None,
+) -> SentenceGroups:
+    """Group (key, text) pairs so only one representative per group needs an LLM call.
+
+    Exact duplicates share a normalized form; by default (``near_threshold=None`` or >= 100) that is
+    the only grouping. With a threshold, near-duplicates are matched with rapidfuzz ``ratio`` against
+    earlier representatives that share the first or last few normalized characters and exactly the
+    same positive/negative/negation cues (``scorer.cues``), so "좋아요" never absorbs "안 좋아요".
+    """
+    groups = SentenceGroups()
+    rep_by_norm: Dict[str, str] = {}
+    norm_owner: Dict[str, str] = {}
+    prefix_blocks: defaultdict[Tuple[frozenset, str], List[str]] = defaultdict(list)
+    suffix_blocks: defaultdict[Tuple[frozenset, str], List[str]] = defaultdict(list)
+    use_near = near_threshold is not None and near_threshold < 100
+    if use_near and scorer is None:
+        scorer = LexiconScorer()
+    for key, text in texts:
+        norm = normalize_sentence(text)
+        if not norm:
+            # 정규화 후 비는 문장(기호만 등)은 원문 기준으로만 묶는다
+            norm = f"\x00{(text or '').strip()}"
+        owner = norm_owner.get(norm)
+        if owner is not None:
+            groups.members[rep_by_norm[owner]].append(key)
+            groups.exact_duplicates += 1
+            continue
+        if use_near and not norm.startswith("\x00"):
+            # 감성 단서(부정어 포함)가 다르면 한 글자 차이여도 극성이 바뀔 수 있어 같은 단서 집합끼리만 비교
+            cues = scorer.cues(text)
+            prefix, suffix = (cues, norm[:_BLOCK_LEN]), (cues, norm[-_BLOCK_LEN:])
+            candidates = prefix_blocks.get(prefix, []) + suffix_blocks.get(suffix, [])
+            match = (
+                process.extractOne(norm, candidates, scorer=fuzz.ratio, score_cutoff=near_threshold)
+                if candidates
+                else None
+            )
+            if match is not None:
+                norm_owner[norm] = match[0]
+                groups.members[rep_by_norm[match[0]]].append(key)
+                groups.near_duplicates += 1
+                continue
+            prefix_blocks[prefix].append(norm)
+            suffix_blocks[suffix].append(norm)
+        norm_owner[norm] = norm
+        rep_by_norm[norm] = key
+        groups.representatives.append((key, text))
+        groups.members[key] = [key]
+    return groups
+
+
+def fan_out(results: List[Dict[str, object]], groups: SentenceGroups) -> List[Dict[str, object]]:
+    """Copy each representative's result to every member key of its group."""
+    expanded: List[Dict[str, object]] = []
+    for result in results:
+        rep_key = result.get("key")
+        for member in groups.members.get(rep_key, [rep_key]):
+            expanded.append({**result, "key": member, "representative_key": rep_key})
+    return expanded
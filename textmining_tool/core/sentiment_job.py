@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from . import gemini_client, persist
+
+
+# 끝나지 않은 작업 저널은 최근 것만 남긴다
+MAX_JOURNALS = 20
+
+
+def job_id_for(texts: List[Tuple[str, str]]) -> str:
+    """Stable id for a batch of (key, text) pairs; the same input resumes the same journal."""
+    digest = hashlib.sha1()
+    for key, text in texts:
+        digest.update(f"{key}\x1f{text}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SentimentJournal:
+    """Append-only JSONL log of parsed Gemini results for one job."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._handle = None
+
+    def load(self) -> Dict[str, Dict[str, object]]:
+        done: Dict[str, Dict[str, object]] = {}
+        if not self.path.exists():
+            return done
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 비정상 종료로 마지막 줄이 잘린 경우 해당 줄만 버린다
+                    continue
+                if isinstance(record, dict) and "key" in record:
+                    done[str(record["key"])] = record
+        return done
+
+    def append(self, result: Dict[str, object]) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+        self._handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def prune_journals(jobs_dir: str | Path | None = None, keep: int = MAX_JOURNALS) -> int:
+    """Delete all but the ``keep`` most recently modified journals; returns how many were removed."""
+    root = Path(jobs_dir or persist.data_dir("jobs"))
+    if not root.is_dir():
+        return 0
+    journals = sorted(root.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in journals[keep:]:
+        path.unlink(missing_ok=True)
+    return max(0, len(journals) - keep)
+
+
+@dataclass
+class JobOutcome:
+    results: List[Dict[str, object]] = field(default_factory=list)
+    resumed: int = 0
+    fetched: int = 0
+    complete: bool = False
+    journal_path: Path | None = None
+    telemetry: Dict[str, object] = field(default_factory=dict)
+
+
+def run_sentiment_job(
+    api_key: str,
+    texts: List[Tuple[str, str]],
+    jobs_dir: str | Path | None = None,
+    on_result: Callable[[Dict[str, object]], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    telemetry: gemini_client.GeminiTelemetry | None = None,
+) -> JobOutcome:
+    """Run ``gemini_client.run_gemini`` as a journaled job.
+
+    Results already in the job's journal are replayed through ``on_result`` and skipped; every new
+    result is appended to the journal before being forwarded, so a crash or cancel loses nothing
+    that was already paid for. A complete job deletes its journal (``journal_path`` is then None);
+    unfinished journals beyond ``MAX_JOURNALS`` are pruned oldest first.
+    """
+    telemetry = telemetry or gemini_client.GeminiTelemetry()
+    journal = SentimentJournal(Path(jobs_dir or persist.data_dir("jobs")) / f"{job_id_for(texts)}.jsonl")
+    done = journal.load()
+    outcome = JobOutcome(resumed=len(done), journal_path=journal.path)
+    for key, _ in texts:
+        cached = done.get(str(key))
+        if cached is not None and on_result is not None:
+            on_result(cached)
+    pending = [(key, text) for key, text in texts if str(key) not in done]
+
+    def _record(result: Dict[str, object]) -> None:
+        journal.append(result)
+        done[str(result["key"])] = result
+        outcome.fetched += 1
+        if on_result is not None:
+            on_result(result)
+
+    try:
+        if pending:
+            gemini_client.run_gemini(api_key, pending, on_result=_record, should_stop=should_stop, telemetry=telemetry)
+    finally:
+        journal.close()
+    outcome.results = [done[str(key)] for key, _ in texts if str(key) in done]
+    outcome.complete = len(outcome.results) == len(texts)
+    outcome.telemetry = telemetry.summary()
+    if outcome.complete:
+        # 모두 받았으면 이어서 할 것이 없으므로 저널을 지운다
+        journal.discard()
+        outcome.journal_path = None
+    prune_journals(journal.path.parent)
+    return outcome
@@ -1,10 +1,49 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .pipeline import Pipeline
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .aggregates import CorpusStats
+    from .cooccurrence import CooccurrenceIndex
+    from .memory import FrameSizes
+    from .search import TokenIndex
+
+
+def _default_runtime_options() -> Dict[str, Any]:
+    # pandas를 끌어오는 memory 모듈은 상태를 만들 때에야 임포트한다(메인 창 임포트를 가볍게 유지)
+    from .memory import DEFAULT_BUDGET_MB
+
+    return {
+        "news_excluded": False,
+        "page_type_filter": [],
+        "remove_similar": False,
+        "similarity_threshold": 95,
+        "memory_budget_mb": DEFAULT_BUDGET_MB,
+        "cleaning": {
+            "korean_only": True,
+            "keep_number": False,
+            "keep_english": False,
+            "remove_url": True,
+            "remove_email": True,
+            "remove_hashtag": True,
+            "remove_mention": True,
+            "strip_whitespace": True,
+            "min_length": 2,
+            "pos": "noun",
+            "min_freq": 2,
+        },
+        "profanity": {
+            "mode": "ONCE_FIXED",
+            "per_hit_delta": -2,
+            "scope": "CLEAN_TEXT_ONLY",
+        },
+    }
 
 
 @dataclass
@@ -34,6 +73,14 @@ class AppState:
     freq_df: Optional[pd.DataFrame] = None
     top50_df: Optional[pd.DataFrame] = None
     monthly_top_df: Optional[pd.DataFrame] = None
+    # 직전 기간 대비 급상승 키워드(burst.emerging_keywords)
+    emerging_df: Optional[pd.DataFrame] = None
+    # 증분 모드에서 누적된 토큰/공기출현 통계(assets/stats에 저장)
+    corpus_stats: Optional[CorpusStats] = None
+    # tokens_df 위치 역색인(키워드 -> 원문 KWIC, assets/index에 저장)
+    token_index: Optional[TokenIndex] = None
+    # 단어 -> 공기출현 이웃 색인(키워드 중심 네트워크용, 처음 조회할 때 만들어 assets/index에 저장)
+    cooccurrence_index: Optional[CooccurrenceIndex] = None
 
     sentiment_df: Optional[pd.DataFrame] = None
     sentiment_sentence_df: Optional[pd.DataFrame] = None
@@ -42,9 +89,15 @@ class AppState:
     gemini_evidence_df: Optional[pd.DataFrame] = None
 
     rules_df: Optional[pd.DataFrame] = None
+    # 세그먼트별 연관 규칙 마이닝 결과 요약(문서 수, 규칙 수, 메모리 가드/건너뜀 여부)
+    rules_segments_df: Optional[pd.DataFrame] = None
     nodes_df: Optional[pd.DataFrame] = None
     edges_df: Optional[pd.DataFrame] = None
     pyvis_html_path: Optional[Path] = None
+    # 기간별 네트워크(period 컬럼 포함)와 인접 기간 사이 엣지 변화표
+    period_nodes_df: Optional[pd.DataFrame] = None
+    period_edges_df: Optional[pd.DataFrame] = None
+    edge_delta_df: Optional[pd.DataFrame] = None
 
     toxicity_detail_df: Optional[pd.DataFrame] = None
     toxicity_summary_df: Optional[pd.DataFrame] = None
@@ -55,34 +108,13 @@ class AppState:
     canonical_export_df: Optional[pd.DataFrame] = None
 
     export_sheet_flags: Dict[str, bool] = field(default_factory=dict)
+    spilled: Dict[str, Path] = field(default_factory=dict)
+    pipeline: Pipeline = field(default_factory=Pipeline)
+    # 프레임별 메모리 측정 캐시(enforce_memory_budget가 처음 쓸 때 만든다)
+    frame_sizes: Optional[FrameSizes] = field(default=None, repr=False)
     logs: List[Dict[str, Any]] = field(default_factory=list)
 
-    runtime_options: Dict[str, Any] = field(
-        default_factory=lambda: {
-            "news_excluded": False,
-            "page_type_filter": [],
-            "remove_similar": False,
-            "similarity_threshold": 95,
-            "cleaning": {
-                "korean_only": True,
-                "keep_number": False,
-                "keep_english": False,
-                "remove_url": True,
-                "remove_email": True,
-                "remove_hashtag": True,
-                "remove_mention": True,
-                "strip_whitespace": True,
-                "min_length": 2,
-                "pos": "noun",
-                "min_freq": 2,
-            },
-            "profanity": {
-                "mode": "ONCE_FIXED",
-                "per_hit_delta": -2,
-                "scope": "CLEAN_TEXT_ONLY",
-            },
-        }
-    )
+    runtime_options: Dict[str, Any] = field(default_factory=_default_runtime_options)
 
     def update_log(self, stage: str, message: str, payload: Optional[Dict[str, Any]] = None) -> None:
         entry = {"stage": stage, "message": message}
@@ -90,6 +122,57 @@ class AppState:
             entry.update(payload)
         self.logs.append(entry)
 
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """All DataFrame attributes that are currently set, by attribute name."""
+        import pandas as pd
+
+        return {f.name: value for f in fields(self) if isinstance(value := getattr(self, f.name), pd.DataFrame)}
+
+    def frame(self, name: str) -> Any:
+        """Attribute ``name``, reloaded from disk when it was spilled by ``enforce_memory_budget``."""
+        value = getattr(self, name, None)
+        if value is None and name in self.spilled:
+            from . import memory
+
+            return memory.load_spilled(self.spilled[name])
+        return value
+
+    def enforce_memory_budget(self) -> List[str]:
+        """Keep current frames plus memoized pipeline results within the configured budget.
+
+        Sizes are cached per frame object, so only newly committed frames are measured. When over
+        budget, older memo entries are released first, then export-only frames are spilled to disk.
+        """
+        budget = self.runtime_options.get("memory_budget_mb")
+        if not budget:
+            return []
+        import pandas as pd
+
+        from . import memory
+
+        if self.frame_sizes is None:
+            self.frame_sizes = memory.FrameSizes()
+        frames = self.frames()
+        memo_mb = sum(self.frame_sizes(v) for v in self.pipeline.memoized_outputs() if isinstance(v, pd.DataFrame))
+        if memo_mb and sum(map(self.frame_sizes, frames.values())) + memo_mb > budget:
+            # 되돌리기용 과거 결과는 다시 계산할 수 있으므로 디스크로 내리기 전에 먼저 버린다
+            stages = self.pipeline.trim()
+            self.update_log("memory", "memo released", {"stages": ", ".join(stages), "memo_mb": round(memo_mb, 1), "budget_mb": budget})
+            memo_mb = 0.0
+        names = memory.plan_spill(frames, budget, size_of=self.frame_sizes, extra_mb=memo_mb)
+        for name in names:
+            self.spilled[name] = memory.spill_frame(getattr(self, name), name)
+            setattr(self, name, None)
+        if names:
+            self.pipeline.release(names)
+            self.update_log("memory", "spilled", {"frames": ", ".join(names), "budget_mb": budget})
+        return names
+
+    def discard_spilled(self) -> None:
+        for path in self.spilled.values():
+            Path(path).unlink(missing_ok=True)
+        self.spilled.clear()
+
 
 DEFAULT_EXPORT_SHEETS = [
     "raw_original",
@@ -100,11 +183,15 @@ DEFAULT_EXPORT_SHEETS = [
     "token_freq",
     "top50_preview",
     "monthly_top_words",
+    "emerging_keywords",
     "sentiment_sentence",
     "sentiment_doc",
     "sentiment_month",
     "network_nodes",
     "network_edges",
+    "network_period_edges",
+    "network_edge_delta",
+    "association_rules",
     "audit_report",
     "audit_snippets",
     "empty_doc_report",
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Tuple
 
 import pandas as pd
 
+from .memory import compact_frame
+
 
 DEFAULT_DICTS = {
     "PROFANITY_TOKENS": ["씨발", "ㅅㅂ", "좆", "병신", "개새끼"],
@@ -26,6 +31,28 @@ ROLE_SCORES = {
     "SLUR_HATE": 0.95,
 }
 
+DEFAULT_ROLE_TO_DELTA = {
+    "EMPHASIS_POS": 0,
+    "GENERAL_EXPLETIVE": -1,
+    "EMPHASIS_NEG": -1,
+    "TARGETED_INSULT": -2,
+    "SLUR_HATE": -2,
+}
+
+# 청크 하나가 워커 프로세스 하나에서 처리되는 행 수
+SCAN_CHUNK_SIZE = 20000
+
+_SCAN_COLUMNS = (
+    "toxicity_score",
+    "toxicity_level",
+    "targeted_attack",
+    "profanity_count",
+    "profanity_matches",
+    "profanity_roles_json",
+    "evidence_phrases",
+    "profanity_sentiment_delta",
+)
+
 TOXICITY_LEVELS = [
     (0.8, "HIGH"),
     (0.4, "MED"),
@@ -92,54 +119,142 @@ def classify_level(score: float) -> str:
     return "LOW"
 
 
-def scan_dataframe(df: pd.DataFrame, text_col: str, dictionaries: Dict[str, List[str]], whitelist: Iterable[str] | None = None, context_mode: str = "CONTEXT_AWARE", role_to_delta: Dict[str, int] | None = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    role_to_delta = role_to_delta or {
-        "EMPHASIS_POS": 0,
-        "GENERAL_EXPLETIVE": -1,
-        "EMPHASIS_NEG": -1,
-        "TARGETED_INSULT": -2,
-        "SLUR_HATE": -2,
+def _build_scan_context(
+    dictionaries: Dict[str, List[str]],
+    whitelist: Iterable[str] | None,
+    context_mode: str,
+    role_to_delta: Dict[str, int],
+) -> Dict[str, Any]:
+    return {
+        "dictionaries": dictionaries,
+        "whitelist": list(whitelist or []),
+        "context_mode": context_mode,
+        "role_to_delta": role_to_delta,
+        "profanity": frozenset(dictionaries.get("PROFANITY_TOKENS", [])),
     }
-    rows = []
-    for _, row in df.iterrows():
-        text = str(row.get(text_col, ""))
-        matches, roles, targeted = detect_roles(text, dictionaries, whitelist)
-        score = score_toxicity(roles)
-        level = classify_level(score)
+
+
+_SCAN_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_scan_worker(*args: Any) -> None:
+    # 사전은 워커 프로세스당 한 번만 전달하고 청크마다 다시 피클링하지 않는다
+    _SCAN_CONTEXT.clear()
+    _SCAN_CONTEXT.update(_build_scan_context(*args))
+
+
+def _scan_chunk(texts: List[str], context: Dict[str, Any] | None = None) -> Dict[str, list]:
+    """Scan a partition of texts and return column lists (one entry per text)."""
+    ctx = context or _SCAN_CONTEXT
+    dictionaries = ctx["dictionaries"]
+    whitelist = ctx["whitelist"]
+    context_mode = ctx["context_mode"]
+    role_to_delta = ctx["role_to_delta"]
+    profanity = ctx["profanity"]
+    low_level = classify_level(0.0)
+    columns: Dict[str, list] = {name: [] for name in _SCAN_COLUMNS}
+    for text in texts:
+        if profanity.isdisjoint(text.split()):
+            # 욕설 토큰이 없는 행은 역할 판정 없이 기본값만 채운다
+            matches: List[str] = []
+            roles: List[RoleResult] = []
+            targeted = False
+            score = 0.0
+            level = low_level
+        else:
+            matches, roles, targeted = detect_roles(text, dictionaries, whitelist)
+            score = score_toxicity(roles)
+            level = classify_level(score)
         delta = 0
         if context_mode == "ALWAYS_PENALIZE" and matches:
             delta = -2
         elif matches:
             delta = sum(role_to_delta.get(r.role, 0) for r in roles)
             delta = max(-2, min(2, delta))
-        roles_json = [r.__dict__ for r in roles]
-        rows.append(
-            {
-                "key": row.get("key"),
-                "date": row.get("Date"),
-                "month": row.get("month") or row.get("period"),
-                "page_type": row.get("Page Type"),
-                "title": row.get("Title"),
-                "clean_text_snippet": text[:200],
-                "raw_text_snippet": str(row.get("Full Text", ""))[:200],
-                "toxicity_score": score,
-                "toxicity_level": level,
-                "targeted_attack": targeted,
-                "profanity_count": len(matches),
-                "profanity_matches": matches,
-                "profanity_roles_json": roles_json,
-                "evidence_phrases": [r.window for r in roles],
-                "notes": "",
-                "profanity_sentiment_delta": delta,
-                "context_mode": context_mode,
-            }
-        )
-    detail_df = pd.DataFrame(rows)
+        columns["toxicity_score"].append(score)
+        columns["toxicity_level"].append(level)
+        columns["targeted_attack"].append(targeted)
+        columns["profanity_count"].append(len(matches))
+        columns["profanity_matches"].append(matches)
+        columns["profanity_roles_json"].append([r.__dict__ for r in roles])
+        columns["evidence_phrases"].append([r.window for r in roles])
+        columns["profanity_sentiment_delta"].append(delta)
+    return columns
+
+
+def _column(df: pd.DataFrame, name: str, default: Any = None) -> list:
+    return df[name].tolist() if name in df.columns else [default] * len(df)
+
+
+def _resolve_jobs(n_jobs: int | None, n_chunks: int) -> int:
+    if n_chunks <= 1:
+        return 1
+    if n_jobs is None or n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, n_chunks))
+
+
+def scan_dataframe(
+    df: pd.DataFrame,
+    text_col: str,
+    dictionaries: Dict[str, List[str]],
+    whitelist: Iterable[str] | None = None,
+    context_mode: str = "CONTEXT_AWARE",
+    role_to_delta: Dict[str, int] | None = None,
+    n_jobs: int | None = None,
+    chunk_size: int = SCAN_CHUNK_SIZE,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Scan ``df`` in chunks; chunks are spread over a process pool when there is more than one.
+
+    ``n_jobs`` caps the worker count (``None`` = CPU count, ``1`` = single process).
+    """
+    role_to_delta = role_to_delta or dict(DEFAULT_ROLE_TO_DELTA)
+    texts = [str(v) for v in _column(df, text_col, "")]
+    init_args = (dictionaries, list(whitelist or []), context_mode, role_to_delta)
+    chunk_size = max(1, int(chunk_size))
+    chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    workers = _resolve_jobs(n_jobs, len(chunks))
+    parts: List[Dict[str, list]] | None = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker, initargs=init_args) as pool:
+                parts = list(pool.map(_scan_chunk, chunks))
+        except Exception:  # noqa: BLE001
+            # 프로세스 풀을 쓸 수 없는 환경(샌드박스/번들 등)에서는 단일 프로세스로 폴백
+            parts = None
+    if parts is None:
+        context = _build_scan_context(*init_args)
+        parts = [_scan_chunk(chunk, context) for chunk in chunks]
+    scanned = {name: list(chain.from_iterable(part[name] for part in parts)) for name in _SCAN_COLUMNS}
+    months = [m or p for m, p in zip(_column(df, "month"), _column(df, "period"))]
+    detail_df = pd.DataFrame(
+        {
+            "key": _column(df, "key"),
+            "date": _column(df, "Date"),
+            "month": months,
+            "page_type": _column(df, "Page Type"),
+            "title": _column(df, "Title"),
+            "clean_text_snippet": [t[:200] for t in texts],
+            "raw_text_snippet": [str(v)[:200] for v in _column(df, "Full Text", "")],
+            "toxicity_score": scanned["toxicity_score"],
+            "toxicity_level": scanned["toxicity_level"],
+            "targeted_attack": scanned["targeted_attack"],
+            "profanity_count": scanned["profanity_count"],
+            "profanity_matches": scanned["profanity_matches"],
+            "profanity_roles_json": scanned["profanity_roles_json"],
+            "evidence_phrases": scanned["evidence_phrases"],
+            "notes": "",
+            "profanity_sentiment_delta": scanned["profanity_sentiment_delta"],
+            "context_mode": context_mode,
+        }
+    )
+    detail_df = compact_frame(detail_df)
     summary_df = (
-        detail_df.groupby(["month", "page_type"])
+        detail_df.assign(_is_high=detail_df["toxicity_level"].eq("HIGH"))
+        .groupby(["month", "page_type"], observed=True)
         .agg(
             avg_toxicity=("toxicity_score", "mean"),
-            high_count=("toxicity_level", lambda x: (x == "HIGH").sum()),
+            high_count=("_is_high", "sum"),
             count=("key", "count"),
         )
         .reset_index()
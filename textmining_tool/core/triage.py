@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from .toxicity import DEFAULT_DICTS
+
+
+NEGATION_CUES = ["안 ", "않", "못", "없", "아니"]
+
+# 이 값 이상이면 로컬에서 확정하고 Gemini로 보내지 않는다
+DEFAULT_CONFIDENCE = 0.7
+
+
+def _cue_regex(cues: Iterable[str]) -> re.Pattern[str] | None:
+    cues = sorted({c for c in cues if c}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(c) for c in cues)) if cues else None
+
+
+class LexiconScorer:
+    """Fast cue-count scorer over POS_CUES/NEG_CUES that emits Gemini-shaped results.
+
+    Confidence is ``|pos - neg| / (pos + neg) * (1 - 0.5 ** (pos + neg))``, halved when a negation
+    cue is present, so a single cue gives 0.5, two agreeing cues 0.75 and any mix much less.
+    Sentences without cues have confidence 0 and always go to the LLM.
+    """
+
+    def __init__(self, dictionaries: Dict[str, List[str]] | None = None, negations: Iterable[str] | None = None) -> None:
+        dictionaries = dictionaries or DEFAULT_DICTS
+        self._pos = _cue_regex(dictionaries.get("POS_CUES", []))
+        self._neg = _cue_regex(dictionaries.get("NEG_CUES", []))
+        self._negation = _cue_regex(NEGATION_CUES if negations is None else negations)
+
+    def cues(self, text: str) -> frozenset:
+        """Positive, negative and negation cues found in ``text``, tagged by kind."""
+        text = text or ""
+        return frozenset(
+            (kind, hit)
+            for kind, pattern in (("positive", self._pos), ("negative", self._neg), ("negation", self._negation))
+            if pattern is not None
+            for hit in pattern.findall(text)
+        )
+
+    def score(self, text: str) -> Tuple[float, Dict[str, object]]:
+        text = text or ""
+        pos_hits = self._pos.findall(text) if self._pos else []
+        neg_hits = self._neg.findall(text) if self._neg else []
+        total = len(pos_hits) + len(neg_hits)
+        if total == 0:
+            return 0.0, {}
+        confidence = abs(len(pos_hits) - len(neg_hits)) / total * (1 - 0.5**total)
+        if self._negation and self._negation.search(text):
+            confidence *= 0.5
+        if len(pos_hits) > len(neg_hits):
+            polarity = "positive"
+        elif len(neg_hits) > len(pos_hits):
+            polarity = "negative"
+        else:
+            polarity = "mixed"
+        evidences = [
+            {"phrase": hit, "type": kind, "strength": "strong" if len(hits) >= 2 else "mild", "aspect": "기타", "target": ""}
+            for kind, hits in (("positive", pos_hits), ("negative", neg_hits))
+            for hit in hits
+        ]
+        result = {
+            "overall_polarity": polarity,
+            "overall_intensity": round(confidence, 3),
+            "evidences": evidences,
+            "summary_ko": "",
+            "source": "lexicon",
+        }
+        return confidence, result
+
+
+@dataclass
+class TriageResult:
+    local_results: List[Dict[str, object]] = field(default_factory=list)
+    to_llm: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def avoided_share(self) -> float:
+        total = len(self.local_results) + len(self.to_llm)
+        return len(self.local_results) / total if total else 0.0
+
+
+def triage(
+    texts: List[Tuple[str, str]],
+    threshold: float = DEFAULT_CONFIDENCE,
+    scorer: LexiconScorer | None = None,
+) -> TriageResult:
+    """Split (key, text) pairs into locally decided results and the remainder for the LLM."""
+    scorer = scorer or LexiconScorer()
+    outcome = TriageResult()
+    for key, text in texts:
+        confidence, result = scorer.score(text)
+        if result and confidence >= threshold:
+            outcome.local_results.append({"key": key, **result})
+        else:
+            outcome.to_llm.append((key, text))
+    return outcome
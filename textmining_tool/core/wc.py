@@ -1,53 +1,83 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, Optional
+import hashlib
+import io
 import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
 from wordcloud import WordCloud
 
 
+WC_SIZE = (900, 500)
+# 최근 렌더링한 워드클라우드 PNG를 (빈도 해시, Top N, 제외 토큰, 폰트, 크기) 단위로 보관
+CACHE_SIZE = 16
+
+
 def resource_path(*parts: str) -> Path:
     """Return absolute path for resources (handles PyInstaller _MEIPASS)."""
     base_path = Path(getattr(sys, "_MEIPASS", Path(__file__).resolve().parents[2]))
     return base_path.joinpath(*parts) if parts else base_path
 
 
-def generate_wordcloud(tokens: Iterable[str], font_path: Optional[str], output_path: str | Path) -> Path:
-    tokens_list = [str(t) for t in tokens if str(t).strip()]
-    if not tokens_list:
-        raise ValueError("워드클라우드를 생성할 토큰이 없습니다.")
+def _is_font(path: Path) -> bool:
+    from PIL import ImageFont
 
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        ImageFont.truetype(str(path), 10)
+        return True
+    except OSError:
+        # 자리표시자 파일 등 실제 폰트가 아닌 경우
+        return False
 
-    kwargs = {"width": 800, "height": 600, "background_color": "white"}
 
-    # Prefer provided font_path, otherwise fall back to bundled NanumGothic (PyInstaller-safe).
+@lru_cache(maxsize=8)
+def _resolve_font(font_path: str | None, env_font: str | None) -> str | None:
     candidate_paths = []
-    env_font = os.environ.get("TEXTMINING_FONT_PATH")
     if env_font:
         candidate_paths.append(Path(env_font))
     if font_path:
         candidate_paths.append(Path(font_path))
     candidate_paths.append(resource_path("assets", "fonts", "NanumGothic.ttf"))
     candidate_paths.append(resource_path("assets", "fonts", "NanumSquareNeo-bRg.ttf"))
+    candidate_paths.append(Path(__file__).resolve().parents[1] / "assets" / "fonts" / "NanumGothic.ttf")
+    candidate_paths.append(Path(__file__).resolve().parents[1] / "assets" / "fonts" / "NanumSquareNeo-bRg.ttf")
     candidate_paths.append(Path.cwd() / "textmining_tool" / "assets" / "fonts" / "NanumSquareNeo-bRg.ttf")
     candidate_paths.append(Path(r"C:\Users\70089004\tm_test\text_mining\textmining_tool\assets\fonts\NanumSquareNeo-bRg.ttf"))
-    chosen_font = None
     for cand in candidate_paths:
-        if cand and cand.exists():
-            chosen_font = str(cand)
-            break
+        if cand and cand.exists() and _is_font(cand):
+            return str(cand)
+    return None
+
 
+def resolve_font(font_path: Optional[str] = None) -> str:
+    """First usable Korean font (env var, given path, bundled fonts); candidates are probed once."""
+    chosen_font = _resolve_font(font_path, os.environ.get("TEXTMINING_FONT_PATH"))
     if not chosen_font:
         raise FileNotFoundError(
             "한글 폰트 파일(NanumGothic.ttf 또는 NanumSquareNeo-bRg.ttf)을 찾을 수 없습니다. "
             "assets/fonts 경로나 번들 포함 여부를 확인하고, 필요 시 TEXTMINING_FONT_PATH 환경변수로 폰트 경로를 지정하세요."
         )
+    return chosen_font
+
+
+def generate_wordcloud(tokens: Iterable[str], font_path: Optional[str], output_path: str | Path) -> Path:
+    tokens_list = [str(t) for t in tokens if str(t).strip()]
+    if not tokens_list:
+        raise ValueError("워드클라우드를 생성할 토큰이 없습니다.")
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    kwargs["font_path"] = chosen_font
+    kwargs = {"width": 800, "height": 600, "background_color": "white"}
+
+    # Prefer provided font_path, otherwise fall back to bundled NanumGothic (PyInstaller-safe).
+    kwargs["font_path"] = resolve_font(font_path)
 
     try:
         wc = WordCloud(**kwargs)
@@ -68,29 +98,7 @@ def generate_wordcloud_from_freq(freqs: dict[str, int], font_path: Optional[str]
 
     kwargs = {"width": 900, "height": 500, "background_color": "white"}
 
-    candidate_paths = []
-    env_font = os.environ.get("TEXTMINING_FONT_PATH")
-    if env_font:
-        candidate_paths.append(Path(env_font))
-    if font_path:
-        candidate_paths.append(Path(font_path))
-    candidate_paths.append(resource_path("assets", "fonts", "NanumGothic.ttf"))
-    candidate_paths.append(resource_path("assets", "fonts", "NanumSquareNeo-bRg.ttf"))
-    candidate_paths.append(Path.cwd() / "textmining_tool" / "assets" / "fonts" / "NanumSquareNeo-bRg.ttf")
-    candidate_paths.append(Path(r"C:\Users\70089004\tm_test\text_mining\textmining_tool\assets\fonts\NanumSquareNeo-bRg.ttf"))
-    chosen_font = None
-    for cand in candidate_paths:
-        if cand and cand.exists():
-            chosen_font = str(cand)
-            break
-
-    if not chosen_font:
-        raise FileNotFoundError(
-            "한글 폰트 파일(NanumGothic.ttf 또는 NanumSquareNeo-bRg.ttf)을 찾을 수 없습니다. "
-            "assets/fonts 경로나 번들 포함 여부를 확인하고, 필요 시 TEXTMINING_FONT_PATH 환경변수로 폰트 경로를 지정하세요."
-        )
-
-    kwargs["font_path"] = chosen_font
+    kwargs["font_path"] = resolve_font(font_path)
 
     try:
         wc = WordCloud(**kwargs)
@@ -99,3 +107,100 @@ def generate_wordcloud_from_freq(freqs: dict[str, int], font_path: Optional[str]
         return output_path
     except Exception as exc:  # noqa: BLE001
         raise RuntimeError(f"워드클라우드 생성 실패: {exc}") from exc
+
+
+def render_wordcloud_png(freqs: Dict[str, int], font_path: str, width: int = WC_SIZE[0], height: int = WC_SIZE[1]) -> bytes:
+    """Wordcloud from a frequency mapping as PNG bytes (no file is written)."""
+    if not freqs:
+        raise ValueError("워드클라우드를 생성할 토큰 빈도가 없습니다.")
+    wc = WordCloud(width=width, height=height, background_color="white", font_path=font_path)
+    wc.generate_from_frequencies(freqs)
+    buffer = io.BytesIO()
+    wc.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _render_job(job: Tuple[Dict[str, int], str, int, int]) -> bytes:
+    return render_wordcloud_png(*job)
+
+
+def freq_digest(freqs: Dict[str, int]) -> str:
+    digest = hashlib.sha1()
+    for token, count in freqs.items():
+        digest.update(f"{token}\t{count}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class WordcloudCache:
+    """LRU cache of rendered wordcloud PNGs; misses for several Top N tabs render in parallel.
+
+    Safe to call from worker threads. Images are returned as PNG bytes for ``QPixmap.loadFromData``.
+    """
+
+    def __init__(self, max_items: int = CACHE_SIZE) -> None:
+        self.max_items = max_items
+        self._items: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _keys(
+        self, freqs: Dict[str, int], top_ns: Sequence[int], excluded: Iterable[str], font: str, size: Tuple[int, int]
+    ) -> Dict[int, tuple]:
+        base = (freq_digest(freqs), tuple(sorted(set(excluded))), font, tuple(size))
+        return {n: (base[0], n, *base[1:]) for n in top_ns}
+
+    def cached(
+        self,
+        freqs: Dict[str, int],
+        top_ns: Sequence[int],
+        excluded: Iterable[str] = (),
+        font_path: Optional[str] = None,
+        size: Tuple[int, int] = WC_SIZE,
+    ) -> Dict[int, bytes]:
+        """Images already in the cache, by Top N (no rendering)."""
+        keys = self._keys(freqs, top_ns, excluded, resolve_font(font_path), size)
+        with self._lock:
+            hits = {n: self._items[key] for n, key in keys.items() if key in self._items}
+            for n in hits:
+                self._items.move_to_end(keys[n])
+        return hits
+
+    def render(
+        self,
+        freqs: Dict[str, int],
+        top_ns: Sequence[int],
+        excluded: Iterable[str] = (),
+        font_path: Optional[str] = None,
+        size: Tuple[int, int] = WC_SIZE,
+    ) -> Dict[int, bytes]:
+        """PNG per Top N for ``freqs`` (ordered by count) minus ``excluded``, rendering only misses."""
+        excluded = set(excluded)
+        font = resolve_font(font_path)
+        filtered = {t: c for t, c in freqs.items() if t not in excluded}
+        if not filtered:
+            raise ValueError("모든 토큰이 제외되었습니다.")
+        keys = self._keys(freqs, top_ns, excluded, font, size)
+        images = self.cached(freqs, top_ns, excluded, font, size)
+        # 큰 Top N일수록 오래 걸리므로 먼저 제출한다
+        missing = sorted((n for n in top_ns if n not in images), reverse=True)
+        jobs = [(dict(list(filtered.items())[:n]), font, size[0], size[1]) for n in missing]
+        workers = min(len(jobs), os.cpu_count() or 1)
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    rendered = list(pool.map(_render_job, jobs))
+            except (OSError, RuntimeError):
+                # 프로세스를 띄울 수 없는 환경이면 순차 렌더링
+                rendered = [_render_job(job) for job in jobs]
+        else:
+            rendered = [_render_job(job) for job in jobs]
+        with self._lock:
+            for n, data in zip(missing, rendered):
+                images[n] = data
+                self._items[keys[n]] = data
+                self._items.move_to_end(keys[n])
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return images
+
+
+wordcloud_cache = WordcloudCache()
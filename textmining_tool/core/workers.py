@@ -9,16 +9,22 @@ class Worker(QObject):
     finished = pyqtSignal(object)
     failed = pyqtSignal(Exception)
     progress = pyqtSignal(int)
+    partial = pyqtSignal(object)
 
-    def __init__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    def __init__(self, fn: Callable[..., Any], *args: Any, stream_partial: bool = False, **kwargs: Any) -> None:
         super().__init__()
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
+        self.stream_partial = stream_partial
 
     def run(self) -> None:
         try:
-            result = self.fn(*self.args, **self.kwargs)
+            kwargs = dict(self.kwargs)
+            if self.stream_partial:
+                # fn은 중간 결과마다 on_result(item)을 호출하고, 이는 GUI 스레드로 전달된다
+                kwargs["on_result"] = self.partial.emit
+            result = self.fn(*self.args, **kwargs)
             self.finished.emit(result)
         except Exception as exc:  # noqa: BLE001
             self.failed.emit(exc)
@@ -27,16 +33,39 @@ class Worker(QObject):
 class WorkerRunner:
     def __init__(self) -> None:
         self._threads: list[QThread] = []
+        self._workers: list[Worker] = []
 
-    def start(self, fn: Callable[..., Any], on_finish: Callable[[Any], None], on_error: Callable[[Exception], None], *args: Any, **kwargs: Any) -> None:
+    def start(
+        self,
+        fn: Callable[..., Any],
+        on_finish: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        *args: Any,
+        on_partial: Callable[[Any], None] | None = None,
+        **kwargs: Any,
+    ) -> None:
         thread = QThread()
-        worker = Worker(fn, *args, **kwargs)
+        worker = Worker(fn, *args, stream_partial=on_partial is not None, **kwargs)
         worker.moveToThread(thread)
+        if on_partial is not None:
+            worker.partial.connect(on_partial)
         worker.finished.connect(on_finish)
         worker.failed.connect(on_error)
         thread.started.connect(worker.run)
         worker.finished.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
         thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self._forget(thread, worker))
         self._threads.append(thread)
+        self._workers.append(worker)
         thread.start()
+
+    def _forget(self, thread: QThread, worker: Worker) -> None:
+        if thread in self._threads:
+            self._threads.remove(thread)
+        if worker in self._workers:
+            self._workers.remove(worker)
+
+    def is_running(self) -> bool:
+        return bool(self._threads)
@@ -1,15 +1,47 @@
 from __future__ import annotations
 
-from PyQt6.QtWidgets import QMainWindow, QTabWidget, QVBoxLayout, QWidget
+import importlib
+
+from PyQt6.QtWidgets import QLabel, QMainWindow, QTabWidget, QVBoxLayout, QWidget
 
 from ..core.state import AppState, DEFAULT_EXPORT_SHEETS
-from .pages.buzz_page import BuzzPage
-from .pages.export_page import ExportPage
-from .pages.network_page import NetworkPage
-from .pages.preprocess_page import PreprocessPage
-from .pages.sentiment_page import SentimentPage
-from .pages.textmining_page import TextMiningPage
-from .pages.toxicity_page import ToxicityPage
+
+
+# (탭 이름, pages 하위 모듈, 클래스) - 페이지 모듈은 탭을 처음 열 때 임포트한다
+PAGE_SPECS = [
+    ("Data Prep", "preprocess_page", "PreprocessPage"),
+    ("Trends", "buzz_page", "BuzzPage"),
+    ("Keywords", "textmining_page", "TextMiningPage"),
+    ("Toxicity / Context", "toxicity_page", "ToxicityPage"),
+    ("Sentiment / Evidence", "sentiment_page", "SentimentPage"),
+    ("Network", "network_page", "NetworkPage"),
+    ("Export", "export_page", "ExportPage"),
+]
+
+
+class LazyPage(QWidget):
+    """Tab placeholder that imports and constructs its page on first activation."""
+
+    def __init__(self, name: str, module: str, class_name: str, app_state: AppState, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.app_state = app_state
+        self.page: QWidget | None = None
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def ensure_built(self) -> QWidget:
+        if self.page is None:
+            try:
+                module = importlib.import_module(f"{__package__}.pages.{self.module}")
+                self.page = getattr(module, self.class_name)(self.app_state)
+            except Exception as exc:  # noqa: BLE001
+                self.page = QLabel(f"{self.name} 초기화 오류: {exc}")
+            self.layout().addWidget(self.page)
+        return self.page
 
 
 class MainWindow(QMainWindow):
@@ -43,6 +75,7 @@ class MainWindow(QMainWindow):
             """
         )
         self._init_pages()
+        self.tab.currentChanged.connect(self._on_tab_changed)
         container = QWidget()
         layout = QVBoxLayout()
         layout.addWidget(self.tab)
@@ -50,20 +83,11 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(container)
 
     def _init_pages(self) -> None:
-        page_builders = [
-            ("Data Prep", PreprocessPage),
-            ("Trends", BuzzPage),
-            ("Keywords", TextMiningPage),
-            ("Toxicity / Context", ToxicityPage),
-            ("Sentiment / Evidence", SentimentPage),
-            ("Network", NetworkPage),
-            ("Export", ExportPage),
-        ]
-        for name, page_cls in page_builders:
-            try:
-                widget = page_cls(self.app_state)
-            except Exception as exc:  # noqa: BLE001
-                from PyQt6.QtWidgets import QLabel
+        for name, module, class_name in PAGE_SPECS:
+            self.tab.addTab(LazyPage(name, module, class_name, self.app_state), name)
+        self._on_tab_changed(self.tab.currentIndex())
 
-                widget = QLabel(f"{name} 초기화 오류: {exc}")
-            self.tab.addTab(widget, name)
+    def _on_tab_changed(self, index: int) -> None:
+        widget = self.tab.widget(index)
+        if isinstance(widget, LazyPage):
+            widget.ensure_built()
@@ -25,11 +25,17 @@ class BuzzPage(QWidget):
         self.period_combo = QComboBox()
         self.period_combo.addItems(["year", "half", "quarter", "month", "week", "day", "hour"])
         self.include_page_type = QCheckBox("page_type별 보기")
+        self.include_dims = QCheckBox("선택 Dim별 보기")
         self.pivot_model = PandasModel(pd.DataFrame())
         self.pivot_table = QTableView()
         self.pivot_table.setModel(self.pivot_model)
         self.status_strip = StatusStrip()
+        self._cube: pivot.PivotCube | None = None
         self._build_ui()
+        # 큐브가 있으면 단위/page_type 전환은 셀 재집계만 하므로 즉시 갱신
+        self.period_combo.currentTextChanged.connect(self._refresh_if_ready)
+        self.include_page_type.toggled.connect(self._refresh_if_ready)
+        self.include_dims.toggled.connect(self._refresh_if_ready)
 
     def _build_ui(self) -> None:
         config_box = QGroupBox("버즈 피벗")
@@ -37,6 +43,7 @@ class BuzzPage(QWidget):
         cfg_layout.addWidget(QLabel("기간 단위"))
         cfg_layout.addWidget(self.period_combo)
         cfg_layout.addWidget(self.include_page_type)
+        cfg_layout.addWidget(self.include_dims)
         btn = QPushButton("피벗 생성")
         btn.clicked.connect(self.generate_pivot)
         cfg_layout.addWidget(btn)
@@ -50,17 +57,33 @@ class BuzzPage(QWidget):
         layout.addStretch()
         self.setLayout(layout)
 
+    def _refresh_if_ready(self, *_: object) -> None:
+        if self._cube is not None and self._cube.covers(self.app_state.dedup_df, self.app_state.selected_dims):
+            self.generate_pivot()
+
     def generate_pivot(self) -> None:
         if self.app_state.dedup_df is None:
             return
         unit = self.period_combo.currentText()
         self.app_state.period_unit = unit
-        self.app_state.pivot_df = pivot.build_pivot(
-            self.app_state.dedup_df,
-            unit,
-            self.include_page_type.isChecked(),
-            dt_col=self.app_state.date_col,
-        )
+        dims = self.app_state.selected_dims
+        if self._cube is None or not self._cube.covers(self.app_state.dedup_df, dims):
+            self._cube = pivot.PivotCube(self.app_state.dedup_df, dt_col=self.app_state.date_col, dims=dims)
+        params = {
+            "unit": unit,
+            "include_page_type": self.include_page_type.isChecked(),
+            "group_dims": list(dims) if self.include_dims.isChecked() else [],
+        }
+        if self.app_state.pipeline.lookup(self.app_state, "pivot", params) is None:
+            pivot_df = pivot.build_pivot(
+                self.app_state.dedup_df,
+                unit,
+                params["include_page_type"],
+                group_dims=params["group_dims"],
+                dt_col=self.app_state.date_col,
+                cube=self._cube,
+            )
+            self.app_state.pipeline.commit(self.app_state, "pivot", params, {"pivot_df": pivot_df})
         self.pivot_model.update(self.app_state.pivot_df)
         rows = len(self.app_state.dedup_df)
         self.status_strip.update(rows, unit, self.app_state.runtime_options.get("news_excluded", False))
@@ -2,19 +2,26 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pandas as pd
+
 from PyQt6.QtWidgets import (
     QCheckBox,
+    QComboBox,
     QFileDialog,
     QGridLayout,
+    QHBoxLayout,
     QLabel,
     QPushButton,
     QScrollArea,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from ...core.exporter import SHEET_MAPPING, export_selected_sheets
+from ...core.memory import memory_report
 from ...core.state import AppState
+from ..widgets import PandasModel
 
 
 class ExportPage(QWidget):
@@ -42,14 +49,45 @@ class ExportPage(QWidget):
         btn_save = QPushButton("엑셀 생성")
         btn_save.clicked.connect(self.save_excel)
 
+        self.memory_model = PandasModel(pd.DataFrame())
+        self.memory_table = QTableView()
+        self.memory_table.setModel(self.memory_model)
+        btn_memory = QPushButton("메모리 사용량 새로고침")
+        btn_memory.clicked.connect(self.refresh_memory_report)
+        # 한도를 넘으면 내보내기 전용 프레임(원본/필터/캐노니컬)을 임시 폴더로 내린다
+        self.budget_combo = QComboBox()
+        self.budget_combo.addItems(["4096", "2048", "8192", "16384", "끄기"])
+        budget = self.app_state.runtime_options.get("memory_budget_mb")
+        self.budget_combo.setCurrentText(str(budget) if budget else "끄기")
+        self.budget_combo.currentTextChanged.connect(self._on_budget_changed)
+        memory_row = QHBoxLayout()
+        memory_row.addWidget(QLabel("메모리 한도(MB)"))
+        memory_row.addWidget(self.budget_combo)
+        memory_row.addWidget(btn_memory)
+        memory_row.addStretch()
+
         layout = QVBoxLayout()
         layout.addWidget(QLabel("저장할 시트 선택"))
         layout.addWidget(scroll)
         layout.addWidget(self.include_empty)
         layout.addWidget(btn_save)
-        layout.addStretch()
+        layout.addWidget(QLabel("데이터프레임별 메모리 사용량"))
+        layout.addWidget(self.memory_table)
+        layout.addLayout(memory_row)
         self.setLayout(layout)
 
+    def showEvent(self, event) -> None:  # noqa: N802
+        super().showEvent(event)
+        self.refresh_memory_report()
+
+    def refresh_memory_report(self) -> None:
+        self.memory_model.update(memory_report(self.app_state.frames(), self.app_state.spilled))
+
+    def _on_budget_changed(self, text: str) -> None:
+        self.app_state.runtime_options["memory_budget_mb"] = int(text) if text.isdigit() else None
+        self.app_state.enforce_memory_budget()
+        self.refresh_memory_report()
+
     def save_excel(self) -> None:
         path, _ = QFileDialog.getSaveFileName(self, "경로 선택", filter="Excel (*.xlsx)")
         if not path:
@@ -13,6 +13,7 @@ from PyQt6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QMessageBox,
     QPushButton,
     QSlider,
@@ -22,8 +23,9 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from ...core import network
+from ...core import aggregates, association, centrality, community, cooccurrence, network, pivot
 from ...core.state import AppState
+from ...core.workers import WorkerRunner
 from ..widgets import PandasModel, StatusStrip
 
 
@@ -46,8 +48,57 @@ class NetworkPage(QWidget):
         self.layout_tightness = QSlider(Qt.Orientation.Horizontal)
         self.layout_tightness.setRange(1, 10)
         self.layout_tightness.setValue(5)
+        self.community_method = QComboBox()
+        self.community_method.addItems(["louvain", "leiden"])
+        self.community_weight = QComboBox()
+        self.community_weight.addItems(list(community.WEIGHT_OPTIONS))
+        self.resolution = QDoubleSpinBox()
+        self.resolution.setRange(0.1, 5.0)
+        self.resolution.setSingleStep(0.1)
+        self.resolution.setValue(1.0)
+        self.betweenness_samples = QSpinBox()
+        self.betweenness_samples.setRange(0, 10000)
+        self.betweenness_samples.setSingleStep(64)
+        self.betweenness_samples.setValue(centrality.BETWEENNESS_SAMPLES)
+        self.betweenness_samples.setToolTip("표본이 많을수록 정확하고 느려집니다. 0이면 모든 노드로 정확히 계산합니다.")
         self.hide_isolates = QCheckBox("고립 노드 숨기기")
         self.avoid_overlap = QCheckBox("라벨 겹침 방지")
+        self.ego_seed = QLineEdit()
+        self.ego_seed.setPlaceholderText("중심 키워드")
+        self.ego_seed.returnPressed.connect(self.run_ego)
+        self.ego_hops = QComboBox()
+        self.ego_hops.addItems(["1", "2"])
+        self.ego_top_k = QSpinBox()
+        self.ego_top_k.setRange(5, 200)
+        self.ego_top_k.setValue(cooccurrence.EGO_TOP_K)
+        self.period_unit = QComboBox()
+        self.period_unit.addItems(list(pivot._PERIOD_FORMATS))
+        self.period_unit.setCurrentText(app_state.period_unit)
+        self.period_select = QComboBox()
+        self.period_select.currentTextChanged.connect(self._show_period)
+        self.rule_support = QDoubleSpinBox()
+        self.rule_support.setDecimals(3)
+        self.rule_support.setRange(0.001, 1.0)
+        self.rule_support.setSingleStep(0.005)
+        self.rule_support.setValue(0.01)
+        self.rule_confidence = QDoubleSpinBox()
+        self.rule_confidence.setRange(0.0, 1.0)
+        self.rule_confidence.setSingleStep(0.05)
+        self.rule_confidence.setValue(0.3)
+        self.rule_lift = QDoubleSpinBox()
+        self.rule_lift.setRange(0.0, 100.0)
+        self.rule_lift.setSingleStep(0.1)
+        self.rule_lift.setValue(1.0)
+        self.rule_max_len = QSpinBox()
+        self.rule_max_len.setRange(2, 6)
+        self.rule_max_len.setValue(association.MAX_ITEMSET_LEN)
+        self.rule_by_page_type = QCheckBox("Page Type별")
+        self.rule_by_period = QCheckBox("기간별(기간 단위)")
+        self.rule_by_dims = QCheckBox("선택 Dim별")
+        self.rules_runner = WorkerRunner()
+        self.rules_button = QPushButton("연관 규칙")
+        self.rules_button.clicked.connect(self.run_rules)
+        self.rules_label = QLabel("")
 
         self.nodes_model = PandasModel(pd.DataFrame())
         self.nodes_table = QTableView()
@@ -57,6 +108,20 @@ class NetworkPage(QWidget):
         self.edges_table = QTableView()
         self.edges_table.setModel(self.edges_model)
 
+        self.verbatim_model = PandasModel(pd.DataFrame())
+        self.verbatim_table = QTableView()
+        self.verbatim_table.setModel(self.verbatim_model)
+        self.verbatim_label = QLabel("엣지를 더블클릭하면 두 키워드가 함께 나온 원문을 보여 줍니다.")
+        self.edges_table.doubleClicked.connect(self._show_edge_verbatim)
+
+        self.delta_model = PandasModel(pd.DataFrame())
+        self.delta_table = QTableView()
+        self.delta_table.setModel(self.delta_model)
+
+        self.rules_model = PandasModel(pd.DataFrame())
+        self.rules_table = QTableView()
+        self.rules_table.setModel(self.rules_model)
+
         self.web_view = QWebEngineView()
         self.status_strip = StatusStrip()
         self._build_ui()
@@ -68,6 +133,10 @@ class NetworkPage(QWidget):
         score_form.addRow("최소 공기출현 n11", self.edge_threshold)
         score_form.addRow("상위 Edge % 유지", self.top_edge_pct)
         score_form.addRow("레이아웃 뭉침 정도", self.layout_tightness)
+        score_form.addRow("커뮤니티 알고리즘", self.community_method)
+        score_form.addRow("커뮤니티 가중치", self.community_weight)
+        score_form.addRow("커뮤니티 해상도", self.resolution)
+        score_form.addRow("매개 중심성 표본 수", self.betweenness_samples)
         score_form.addRow(self.hide_isolates, self.avoid_overlap)
         score_box = QGroupBox("네트워크/레이아웃")
         score_box.setLayout(score_form)
@@ -78,8 +147,44 @@ class NetworkPage(QWidget):
         btn_row.addStretch()
         btn_row.addWidget(btn)
 
+        ego_form = QFormLayout()
+        ego_form.addRow("중심 키워드", self.ego_seed)
+        ego_form.addRow("확장 단계(hop)", self.ego_hops)
+        ego_form.addRow("단계별 이웃 수", self.ego_top_k)
+        ego_btn = QPushButton("중심 네트워크")
+        ego_btn.clicked.connect(self.run_ego)
+        ego_form.addRow(ego_btn)
+        ego_box = QGroupBox("키워드 중심 네트워크(전체 어휘)")
+        ego_box.setLayout(ego_form)
+
+        period_form = QFormLayout()
+        period_form.addRow("기간 단위", self.period_unit)
+        period_btn = QPushButton("기간별 네트워크")
+        period_btn.clicked.connect(self.run_periods)
+        period_form.addRow(period_btn)
+        period_form.addRow("표시할 기간", self.period_select)
+        period_box = QGroupBox("기간별 네트워크/엣지 변화")
+        period_box.setLayout(period_form)
+
+        rules_form = QFormLayout()
+        rules_form.addRow("최소 지지도", self.rule_support)
+        rules_form.addRow("최소 신뢰도", self.rule_confidence)
+        rules_form.addRow("최소 lift", self.rule_lift)
+        rules_form.addRow("항목 집합 최대 길이", self.rule_max_len)
+        segment_row = QHBoxLayout()
+        segment_row.addWidget(self.rule_by_page_type)
+        segment_row.addWidget(self.rule_by_period)
+        segment_row.addWidget(self.rule_by_dims)
+        rules_form.addRow(segment_row)
+        rules_form.addRow(self.rules_button)
+        rules_box = QGroupBox("연관 규칙(세그먼트별 Apriori)")
+        rules_box.setLayout(rules_form)
+
         top_row = QHBoxLayout()
         top_row.addWidget(score_box)
+        top_row.addWidget(ego_box)
+        top_row.addWidget(period_box)
+        top_row.addWidget(rules_box)
 
         layout = QVBoxLayout()
         layout.setContentsMargins(6, 6, 6, 6)
@@ -89,6 +194,12 @@ class NetworkPage(QWidget):
         layout.addWidget(self.nodes_table)
         layout.addWidget(QLabel("Edges"))
         layout.addWidget(self.edges_table)
+        layout.addWidget(self.verbatim_label)
+        layout.addWidget(self.verbatim_table)
+        layout.addWidget(QLabel("Edge 변화(인접 기간)"))
+        layout.addWidget(self.delta_table)
+        layout.addWidget(self.rules_label)
+        layout.addWidget(self.rules_table)
         layout.addWidget(self.web_view)
         layout.addWidget(self.status_strip)
         layout.addStretch()
@@ -101,52 +212,277 @@ class NetworkPage(QWidget):
         try:
             token_sets = self.app_state.tokens_df["tokens"].tolist()
             doc_count = len(token_sets)
-            unique_tokens = set()
-            for ts in token_sets:
-                for t in ts:
-                    unique_tokens.add(t)
-                    if len(unique_tokens) > 8000:
+            stats = self.app_state.corpus_stats
+            if stats is not None and stats.with_pairs:
+                # 누적 통계가 있으면 전체 누적 코퍼스로 네트워크를 만든다. 쌍은 문서 빈도 상위
+                # PAIR_MAX_TERMS개 단어 사이에서만 세므로 아래 크기 제한에 걸리지 않는다
+                doc_count = 0
+                unique_tokens = set()
+            else:
+                stats = None
+                unique_tokens = set()
+                for ts in token_sets:
+                    for t in ts:
+                        unique_tokens.add(t)
+                        if len(unique_tokens) > aggregates.PAIR_MAX_TERMS:
+                            break
+                    if len(unique_tokens) > aggregates.PAIR_MAX_TERMS:
                         break
-                if len(unique_tokens) > 8000:
-                    break
-            if doc_count > 50000 or len(unique_tokens) > 8000:
+            if doc_count > 50000 or len(unique_tokens) > aggregates.PAIR_MAX_TERMS:
                 QMessageBox.warning(
                     self,
                     "연관/네트워크",
                     "데이터가 너무 커서 네트워크를 생성할 수 없습니다. 샘플링하거나 불용어/최소빈도를 높여주세요.",
                 )
                 return
-            nodes_df, edges_df = network.build_cooccurrence_network(
-                token_sets,
-                self.min_edge.value(),
-                score_method=self.edge_score.currentText(),
-                min_n11=self.edge_threshold.value(),
-                top_edge_pct=self.top_edge_pct.value(),
-                tightness=self.layout_tightness.value(),
-                hide_isolates=self.hide_isolates.isChecked(),
-            )
-            self.app_state.nodes_df = nodes_df
-            self.app_state.edges_df = edges_df
-            self.nodes_model.update(nodes_df)
-            self.edges_model.update(edges_df)
-            if not nodes_df.empty:
-                assets_dir = Path(__file__).resolve().parents[2] / "assets"
-                assets_dir.mkdir(parents=True, exist_ok=True)
-                html_path = assets_dir / "network.html"
-                network.render_pyvis_html(
-                    nodes_df,
-                    edges_df,
-                    html_path,
-                    avoid_overlap=self.avoid_overlap.isChecked(),
-                    hide_isolates=self.hide_isolates.isChecked(),
-                    tightness=self.layout_tightness.value(),
+            params = {
+                "min_edge": self.min_edge.value(),
+                "score_method": self.edge_score.currentText(),
+                "min_n11": self.edge_threshold.value(),
+                "top_edge_pct": self.top_edge_pct.value(),
+                "tightness": self.layout_tightness.value(),
+                "hide_isolates": self.hide_isolates.isChecked(),
+                "community_method": self.community_method.currentText(),
+                "community_weight": self.community_weight.currentText(),
+                "resolution": round(self.resolution.value(), 2),
+                "cumulative": stats is not None,
+                "betweenness_samples": self.betweenness_samples.value(),
+            }
+            # 같은 옵션·같은 토큰 결과면 이전 네트워크를 재사용하고 HTML만 다시 그린다
+            if self.app_state.pipeline.lookup(self.app_state, "network", params) is None:
+                nodes_df, edges_df = network.build_cooccurrence_network(
+                    token_sets,
+                    params["min_edge"],
+                    score_method=params["score_method"],
+                    min_n11=params["min_n11"],
+                    top_edge_pct=params["top_edge_pct"],
+                    tightness=params["tightness"],
+                    hide_isolates=params["hide_isolates"],
+                    stats=stats,
+                    community_method=params["community_method"],
+                    resolution=params["resolution"],
+                    community_weight=params["community_weight"],
                 )
-                self.app_state.pyvis_html_path = html_path
-                self.web_view.setUrl(QUrl.fromLocalFile(str(html_path)))
-            rows = len(self.app_state.dedup_df) if self.app_state.dedup_df is not None else 0
-            self.status_strip.update(rows, self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
+                nodes_df = centrality.add_centrality(nodes_df, edges_df, samples=params["betweenness_samples"])
+                self.app_state.pipeline.commit(
+                    self.app_state, "network", params, {"nodes_df": nodes_df, "edges_df": edges_df, "pyvis_html_path": None}
+                )
+            self._show_network()
             self.app_state.update_log("network", "completed")
         except MemoryError:
             QMessageBox.critical(self, "연관/네트워크 오류", "메모리 한도를 초과했습니다. 데이터량을 줄이거나 옵션을 높여주세요.")
         except Exception as exc:  # noqa: BLE001
             QMessageBox.critical(self, "연관/네트워크 오류", f"네트워크 생성 중 오류가 발생했습니다: {exc}")
+
+    def run_ego(self) -> None:
+        seed = self.ego_seed.text().strip()
+        if not seed:
+            return
+        if self.app_state.tokens_df is None or self.app_state.tokens_df.empty:
+            QMessageBox.warning(self, "연관/네트워크", "텍스트마이닝 결과가 없습니다. 먼저 텍스트마이닝을 실행하세요.")
+            return
+        try:
+            params = {
+                "mode": "ego",
+                "seed": seed,
+                "hops": int(self.ego_hops.currentText()),
+                "top_k": self.ego_top_k.value(),
+                "score_method": self.edge_score.currentText(),
+                "min_n11": self.edge_threshold.value(),
+                "betweenness_samples": self.betweenness_samples.value(),
+            }
+            if self.app_state.pipeline.lookup(self.app_state, "network", params) is None:
+                index = self._cooccurrence_index()
+                if seed not in index.vocab:
+                    QMessageBox.information(self, "연관/네트워크", f"'{seed}'는 토큰 사전에 없습니다.")
+                    return
+                nodes_df, edges_df = index.ego_network(
+                    seed, hops=params["hops"], score_method=params["score_method"], min_n11=params["min_n11"], top_k=params["top_k"]
+                )
+                nodes_df = centrality.add_centrality(nodes_df, edges_df, samples=params["betweenness_samples"])
+                self.app_state.pipeline.commit(
+                    self.app_state, "network", params, {"nodes_df": nodes_df, "edges_df": edges_df, "pyvis_html_path": None}
+                )
+            self._show_network()
+            self.app_state.update_log("network", "ego", {"seed": seed, "hops": params["hops"], "nodes": len(self.app_state.nodes_df)})
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "연관/네트워크 오류", f"중심 네트워크 생성 중 오류가 발생했습니다: {exc}")
+
+    def run_periods(self) -> None:
+        if self.app_state.tokens_df is None or self.app_state.tokens_df.empty:
+            QMessageBox.warning(self, "연관/네트워크", "텍스트마이닝 결과가 없습니다. 먼저 텍스트마이닝을 실행하세요.")
+            return
+        try:
+            params = {
+                "unit": self.period_unit.currentText(),
+                "min_edge": self.min_edge.value(),
+                "score_method": self.edge_score.currentText(),
+                "min_n11": self.edge_threshold.value(),
+                "top_edge_pct": self.top_edge_pct.value(),
+                "community_method": self.community_method.currentText(),
+                "resolution": round(self.resolution.value(), 2),
+            }
+            if self.app_state.pipeline.lookup(self.app_state, "period_network", params) is None:
+                nodes_df, edges_df, delta_df = network.build_period_networks(
+                    self.app_state.tokens_df,
+                    params["unit"],
+                    min_edge_weight=params["min_edge"],
+                    score_method=params["score_method"],
+                    min_n11=params["min_n11"],
+                    top_edge_pct=params["top_edge_pct"],
+                    community_method=params["community_method"],
+                    resolution=params["resolution"],
+                )
+                self.app_state.pipeline.commit(
+                    self.app_state,
+                    "period_network",
+                    params,
+                    {"period_nodes_df": nodes_df, "period_edges_df": edges_df, "edge_delta_df": delta_df},
+                )
+            edges_df = self.app_state.period_edges_df
+            periods = list(dict.fromkeys(edges_df["period"])) if not edges_df.empty else []
+            self.delta_model.update(self.app_state.edge_delta_df)
+            self.period_select.blockSignals(True)
+            self.period_select.clear()
+            self.period_select.addItems([str(p) for p in periods])
+            self.period_select.blockSignals(False)
+            if periods:
+                self.period_select.setCurrentIndex(len(periods) - 1)
+                self._show_period(self.period_select.currentText())
+            self.app_state.update_log(
+                "network", "periods", {"unit": params["unit"], "periods": len(periods), "edges": len(edges_df)}
+            )
+        except ValueError as exc:
+            QMessageBox.warning(self, "연관/네트워크", f"기간을 나눌 수 없습니다: {exc}")
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "연관/네트워크 오류", f"기간별 네트워크 생성 중 오류가 발생했습니다: {exc}")
+
+    def _show_period(self, period: str) -> None:
+        nodes_df, edges_df = self.app_state.period_nodes_df, self.app_state.period_edges_df
+        if not period or nodes_df is None or edges_df is None or edges_df.empty:
+            return
+        # 선택한 기간만 떼어 전체 네트워크와 같은 표/그래프로 보여 준다(period 컬럼 제외)
+        self._show_network(
+            nodes_df[nodes_df["period"] == period].drop(columns="period").reset_index(drop=True),
+            edges_df[edges_df["period"] == period].drop(columns="period").reset_index(drop=True),
+        )
+        delta_df = self.app_state.edge_delta_df
+        if delta_df is not None and not delta_df.empty:
+            self.delta_model.update(delta_df[delta_df["period_to"] == period].reset_index(drop=True))
+
+    def run_rules(self) -> None:
+        tokens_df = self.app_state.tokens_df
+        if tokens_df is None or tokens_df.empty:
+            QMessageBox.warning(self, "연관/네트워크", "텍스트마이닝 결과가 없습니다. 먼저 텍스트마이닝을 실행하세요.")
+            return
+        if self.rules_runner.is_running():
+            return
+        dims = list(self.app_state.selected_dims) if self.rule_by_dims.isChecked() else []
+        keys = (["Page Type"] if self.rule_by_page_type.isChecked() else []) + (["period"] if self.rule_by_period.isChecked() else []) + dims
+        params = {
+            "keys": keys,
+            "unit": self.period_unit.currentText(),
+            "min_support": round(self.rule_support.value(), 4),
+            "min_confidence": round(self.rule_confidence.value(), 3),
+            "min_lift": round(self.rule_lift.value(), 3),
+            "max_len": self.rule_max_len.value(),
+        }
+        if self.app_state.pipeline.lookup(self.app_state, "rules", params) is not None:
+            self._show_rules()
+            return
+        frame = tokens_df[[c for c in ("key", "Date", "Page Type", "tokens") if c in tokens_df.columns]]
+        if dims and self.app_state.dedup_df is not None:
+            # 선택 Dim은 tokens_df에 없으므로 문서 키로 원본에서 붙인다
+            dim_cols = [d for d in dims if d in self.app_state.dedup_df.columns]
+            frame = frame.merge(self.app_state.dedup_df[["key", *dim_cols]].drop_duplicates("key"), on="key", how="left")
+        missing = [k for k in keys if k != "period" and k not in frame.columns]
+        if missing:
+            QMessageBox.warning(self, "연관/네트워크", f"세그먼트 컬럼이 없습니다: {', '.join(missing)}")
+            return
+        self.rules_button.setEnabled(False)
+        self.rules_label.setText("연관 규칙 마이닝 중...")
+        self.rules_runner.start(
+            association.segment_rules,
+            lambda result: self._on_rules(params, result),
+            self._on_rules_failed,
+            frame,
+            keys,
+            params["min_support"],
+            params["min_confidence"],
+            params["min_lift"],
+            max_len=params["max_len"],
+            unit=params["unit"],
+        )
+
+    def _on_rules(self, params: dict, result: tuple) -> None:
+        rules_df, segments_df = result
+        self.app_state.pipeline.commit(self.app_state, "rules", params, {"rules_df": rules_df, "rules_segments_df": segments_df})
+        self.app_state.update_log(
+            "network", "rules", {"segments": len(segments_df), "rules": len(rules_df), "keys": ", ".join(params["keys"]) or "전체"}
+        )
+        self._show_rules()
+
+    def _on_rules_failed(self, exc: Exception) -> None:
+        self.rules_button.setEnabled(True)
+        self.rules_label.setText("")
+        QMessageBox.critical(self, "연관/네트워크 오류", f"연관 규칙 생성 중 오류가 발생했습니다: {exc}")
+
+    def _show_rules(self) -> None:
+        self.rules_button.setEnabled(True)
+        rules_df, segments_df = self.app_state.rules_df, self.app_state.rules_segments_df
+        self.rules_model.update(rules_df)
+        skipped = int((segments_df["status"] != "ok").sum()) if segments_df is not None and not segments_df.empty else 0
+        segments = 0 if segments_df is None else len(segments_df)
+        self.rules_label.setText(f"규칙 {len(rules_df):,}개 / 세그먼트 {segments:,}개 (건너뜀 {skipped:,}개, association_segments 시트 참고)")
+
+    def _cooccurrence_index(self) -> cooccurrence.CooccurrenceIndex:
+        """Co-occurrence index for the current tokens, loaded from the data dir's index/ or built once."""
+        if self.app_state.cooccurrence_index is not None:
+            return self.app_state.cooccurrence_index
+        fingerprint = self.app_state.pipeline.current("tokens")
+        path = cooccurrence.index_path(fingerprint) if fingerprint else None
+        index = cooccurrence.CooccurrenceIndex.load(path) if path else None
+        if index is None:
+            stats = self.app_state.corpus_stats
+            if stats is not None and stats.with_pairs:
+                index = cooccurrence.CooccurrenceIndex.from_stats(stats)
+            else:
+                index = cooccurrence.CooccurrenceIndex.build(self.app_state.tokens_df["tokens"])
+            if path:
+                index.save(path)
+        self.app_state.cooccurrence_index = index
+        return index
+
+    def _show_network(self, nodes_df: pd.DataFrame | None = None, edges_df: pd.DataFrame | None = None) -> None:
+        if nodes_df is None or edges_df is None:
+            nodes_df, edges_df = self.app_state.nodes_df, self.app_state.edges_df
+        self.nodes_model.update(nodes_df)
+        self.edges_model.update(edges_df)
+        if not nodes_df.empty:
+            assets_dir = Path(__file__).resolve().parents[2] / "assets"
+            assets_dir.mkdir(parents=True, exist_ok=True)
+            html_path = assets_dir / "network.html"
+            network.render_pyvis_html(
+                nodes_df,
+                edges_df,
+                html_path,
+                avoid_overlap=self.avoid_overlap.isChecked(),
+                hide_isolates=self.hide_isolates.isChecked(),
+                tightness=self.layout_tightness.value(),
+            )
+            self.app_state.pyvis_html_path = html_path
+            self.web_view.setUrl(QUrl.fromLocalFile(str(html_path)))
+        rows = len(self.app_state.dedup_df) if self.app_state.dedup_df is not None else 0
+        self.status_strip.update(rows, self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
+
+    def _show_edge_verbatim(self, index) -> None:  # noqa: ANN001
+        token_index = self.app_state.token_index
+        if token_index is None:
+            return
+        source = index.sibling(index.row(), 0).data()
+        target = index.sibling(index.row(), 1).data()
+        verbatim_df = token_index.kwic([source, target])
+        self.app_state.verbatim_df = verbatim_df
+        self.verbatim_model.update(verbatim_df)
+        doc_count = len(token_index.search([source, target]))
+        self.verbatim_label.setText(f"{source} + {target}: 문서 {doc_count:,}건 (표시 {len(verbatim_df):,}행)")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Dict, List
 
 import pandas as pd
@@ -14,6 +15,7 @@ from PyQt6.QtWidgets import (
     QLabel,
     QListWidget,
     QListWidgetItem,
+    QMessageBox,
     QLineEdit,
     QPushButton,
     QSlider,
@@ -22,7 +24,7 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from ...core import preprocess
+from ...core import ingest, io, preprocess
 from ...core.state import AppState
 from ...core.workers import WorkerRunner
 from ..widgets import PandasModel, StatusStrip
@@ -33,6 +35,12 @@ class PreprocessPage(QWidget):
         super().__init__(parent)
         self.app_state = app_state
         self.worker_runner = WorkerRunner()
+        # 미리보기만 읽은 파일들(전체 로드는 스키마 확정 시 백그라운드에서)
+        self._pending_paths: List[Path] = []
+        self._load_id: str | None = None
+        self._file_count = 0
+        # 증분 적재 키 인덱스(불러온 파일의 폴더 단위 프로젝트별)
+        self._key_index_path: Path | None = None
 
         self.file_info = QLabel("파일을 업로드하세요")
         self.path_edit = QLineEdit()
@@ -47,6 +55,7 @@ class PreprocessPage(QWidget):
 
         self.page_type_list = QListWidget()
         self.exclude_news_chk = QCheckBox("뉴스 제외")
+        self.incremental_chk = QCheckBox("증분 적재(이전 로드에 있던 문서 제외)")
 
         self.similar_chk = QCheckBox("유사중복 제거")
         self.similar_slider = QSlider(Qt.Orientation.Horizontal)
@@ -87,17 +96,28 @@ class PreprocessPage(QWidget):
         dup_layout.addWidget(self.similar_chk)
         dup_layout.addWidget(QLabel("Threshold"))
         dup_layout.addWidget(self.similar_slider)
-        duplicate_box.setLayout(dup_layout)
+        btn_reset_index = QPushButton("키 인덱스 초기화")
+        btn_reset_index.clicked.connect(self.reset_key_index)
+        inc_layout = QHBoxLayout()
+        inc_layout.addWidget(self.incremental_chk)
+        inc_layout.addWidget(btn_reset_index)
+        dup_box_layout = QVBoxLayout()
+        dup_box_layout.addLayout(dup_layout)
+        dup_box_layout.addLayout(inc_layout)
+        duplicate_box.setLayout(dup_box_layout)
 
         btn_browse = QPushButton("찾아보기")
         btn_browse.clicked.connect(self.load_file)
-        btn_apply = QPushButton("적용/스키마 확정")
-        btn_apply.clicked.connect(self.apply_preprocess)
+        btn_folder = QPushButton("폴더")
+        btn_folder.clicked.connect(self.load_folder)
+        self.apply_btn = QPushButton("적용/스키마 확정")
+        self.apply_btn.clicked.connect(self.apply_preprocess)
 
         load_bar = QHBoxLayout()
         load_bar.addWidget(QLabel("데이터 로드"))
         load_bar.addWidget(self.path_edit)
         load_bar.addWidget(btn_browse)
+        load_bar.addWidget(btn_folder)
         load_bar.addStretch()
 
         top_grid = QGridLayout()
@@ -107,7 +127,7 @@ class PreprocessPage(QWidget):
 
         btn_row = QHBoxLayout()
         btn_row.addStretch()
-        btn_row.addWidget(btn_apply)
+        btn_row.addWidget(self.apply_btn)
 
         layout = QVBoxLayout()
         layout.addLayout(load_bar)
@@ -124,16 +144,56 @@ class PreprocessPage(QWidget):
     def load_file(self) -> None:
         from PyQt6.QtWidgets import QFileDialog
 
-        path, _ = QFileDialog.getOpenFileName(self, "파일 선택", filter="CSV or Excel (*.csv *.xlsx)")
-        if not path:
+        paths, _ = QFileDialog.getOpenFileNames(self, "파일 선택", filter="CSV or Excel (*.csv *.xlsx)")
+        if paths:
+            self._open_paths(paths)
+
+    def load_folder(self) -> None:
+        from PyQt6.QtWidgets import QFileDialog
+
+        folder = QFileDialog.getExistingDirectory(self, "폴더 선택")
+        if folder:
+            self._open_paths([folder])
+
+    def _open_paths(self, paths: List[str]) -> None:
+        if self.worker_runner.is_running():
+            QMessageBox.information(self, "로드 중", "이전 파일을 불러오는 중입니다. 완료 후 다시 시도하세요.")
             return
-        df = pd.read_excel(path) if path.lower().endswith("xlsx") else pd.read_csv(path)
-        self.app_state.raw_df = df
-        self.path_edit.setText(path)
-        self.file_info.setText(path)
-        self._populate_columns(df.columns)
-        self.preview_model.update(df.head(100))
-        self.status_strip.update(len(df), self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
+        files = ingest.expand_paths(paths)
+        if not files:
+            QMessageBox.information(self, "파일 없음", "CSV/Excel 파일을 찾지 못했습니다.")
+            return
+        try:
+            # 여러 파일은 같은 레이아웃이라고 보고 첫 파일로 미리보기/매핑한다
+            preview = io.read_preview(files[0])
+            load_id = ingest.load_id_for(files)
+        except Exception as exc:  # noqa: BLE001
+            QMessageBox.critical(self, "파일 열기 실패", f"파일을 읽을 수 없습니다:\n{exc}")
+            return
+        self.app_state.discard_spilled()
+        self.app_state.raw_df = None
+        self._pending_paths = files
+        self._load_id = load_id
+        self._file_count = len(files)
+        self._key_index_path = ingest.project_index_path(files)
+        label = str(files[0]) if len(files) == 1 else f"{files[0]} 외 {len(files) - 1}개"
+        self.path_edit.setText(label)
+        self.file_info.setText(f"{label}  ·  미리보기 {len(preview):,}행 (전체 데이터는 스키마 확정 시 로드)")
+        self._populate_columns(preview.columns)
+        self.preview_model.update(preview)
+        self.status_strip.update(len(preview), self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
+
+    def reset_key_index(self) -> None:
+        if self._key_index_path is None:
+            QMessageBox.information(self, "키 인덱스 초기화", "먼저 파일을 불러오세요. 키 기록은 불러온 폴더(프로젝트)별로 관리됩니다.")
+            return
+        if self.worker_runner.is_running():
+            QMessageBox.information(self, "키 인덱스 초기화", "전처리가 끝난 뒤 다시 시도하세요.")
+            return
+        answer = QMessageBox.question(self, "키 인덱스 초기화", "이 프로젝트에서 지금까지 적재한 문서 키 기록을 모두 지웁니다. 계속할까요?")
+        if answer == QMessageBox.StandardButton.Yes:
+            ingest.reset_key_index(self._key_index_path)
+            self.app_state.update_log("preprocess", "key index cleared", {"index": self._key_index_path.name})
 
     def _populate_columns(self, columns: List[str]) -> None:
         self.column_date.clear()
@@ -150,57 +210,104 @@ class PreprocessPage(QWidget):
         self.page_type_list.clear()
 
     def apply_preprocess(self) -> None:
-        if self.app_state.raw_df is None:
+        if self.worker_runner.is_running():
+            return
+        df = self.app_state.frame("raw_df")
+        if df is None and self._pending_paths:
+            self.apply_btn.setEnabled(False)
+            self.file_info.setText(f"{self.path_edit.text()}  ·  전체 데이터 로드 중...")
+            self.worker_runner.start(io.load_tables, self._on_full_load, self._on_load_failed, self._pending_paths)
+            return
+        if df is None:
             return
+        self._run_preprocess(df)
+
+    def _on_full_load(self, df: pd.DataFrame) -> None:
+        self.apply_btn.setEnabled(True)
+        self._pending_paths = []
+        self.app_state.raw_df = df
+        self.app_state.update_log("preprocess", "file loaded", {"path": self.path_edit.text(), "files": self._file_count, "rows": len(df)})
+        self._run_preprocess(df)
+
+    def _on_load_failed(self, exc: Exception) -> None:
+        self.apply_btn.setEnabled(True)
+        self.file_info.setText(self.path_edit.text())
+        QMessageBox.critical(self, "파일 로드 실패", f"전체 데이터를 불러오지 못했습니다:\n{exc}")
+
+    def _run_preprocess(self, df: pd.DataFrame) -> None:
         text_cols = [self.column_text.item(i).text() for i in range(self.column_text.count()) if self.column_text.item(i).isSelected()]
         if not text_cols:
             text_cols = [self.column_text.item(0).text()] if self.column_text.count() else []
-        df = self.app_state.raw_df
-        # schema mapping and canonical conversion
-        canonical_df, mapping_df = preprocess.build_canonical(
-            df,
-            dt_col=self.column_date.currentText(),
-            text_cols=text_cols,
-            title_col=self.column_title.currentText(),
-            source_type_col=self.column_page_type.currentText(),
-            extra_dims=[self.dimensions_list.item(i).text() for i in range(self.dimensions_list.count()) if self.dimensions_list.item(i).isSelected()],
-        )
-        self.app_state.canonical_df = canonical_df
-        self.app_state.canonical_export_df = canonical_df
-        self.app_state.schema_mapping_df = mapping_df
-        mapping = {
-            "Date": self.column_date.currentText(),
-            "Title": self.column_title.currentText(),
-            "Full Text": text_cols[0] if text_cols else self.column_title.currentText(),
-            "Page Type": self.column_page_type.currentText(),
-        }
-        df = preprocess.map_columns(df, mapping)
-        self.app_state.date_col = self.column_date.currentText()
-        if "Page Type" in df.columns:
-            self.page_type_list.clear()
-            for val in sorted(df["Page Type"].dropna().unique()):
-                item = QListWidgetItem(str(val))
-                item.setCheckState(Qt.CheckState.Unchecked)
-                self.page_type_list.addItem(item)
-        selected_types = [
+        extra_dims = [self.dimensions_list.item(i).text() for i in range(self.dimensions_list.count()) if self.dimensions_list.item(i).isSelected()]
+        dt_col = self.column_date.currentText()
+        checked_types = [
             self.page_type_list.item(i).text()
             for i in range(self.page_type_list.count())
             if self.page_type_list.item(i).checkState() == Qt.CheckState.Checked
         ]
-        filtered = preprocess.filter_page_types(df, selected_types, self.exclude_news_chk.isChecked())
-        with_keys = preprocess.generate_keys(filtered)
-        deduped, removed = preprocess.remove_exact_duplicates(with_keys)
-        if self.similar_chk.isChecked():
-            deduped, similar_removed = preprocess.remove_similar(deduped, threshold=self.similar_slider.value())
-            removed = pd.concat([removed, similar_removed])
-        # sync canonical with dedup info
-        if self.app_state.canonical_df is not None:
-            self.app_state.canonical_df = self.app_state.canonical_df[self.app_state.canonical_df["doc_id"].isin(deduped["key"])]
-        self.app_state.filtered_df = filtered
-        self.app_state.dedup_df = deduped
-        self.app_state.runtime_options["page_type_filter"] = selected_types
+        params = {
+            "load": self._load_id or self.path_edit.text(),
+            "rows": len(df),
+            "dt_col": dt_col,
+            "text_cols": text_cols,
+            "title_col": self.column_title.currentText(),
+            "page_type_col": self.column_page_type.currentText(),
+            "dims": extra_dims,
+            "page_types": sorted(checked_types),
+            "exclude_news": self.exclude_news_chk.isChecked(),
+            "similar": self.similar_slider.value() if self.similar_chk.isChecked() else None,
+            "incremental": self.incremental_chk.isChecked(),
+        }
+        # 증분 적재는 키 인덱스를 갱신하는 부수효과가 있어 캐시를 쓰지 않는다
+        cached = None if params["incremental"] else self.app_state.pipeline.lookup(self.app_state, "preprocess", params)
+        if cached is not None:
+            self.app_state.update_log("preprocess", "reused", {"rows": len(cached["dedup_df"])})
+            self._show_preprocess(cached)
+            return
+        self.apply_btn.setEnabled(False)
+        self.file_info.setText(f"{self.path_edit.text()}  ·  전처리 중...")
+        self.worker_runner.start(
+            preprocess.compute_preprocess,
+            lambda result: self._on_preprocess(params, result),
+            self._on_preprocess_failed,
+            df,
+            params,
+            checked_types,
+            key_index=self._key_index_path,
+            load_id=self._load_id,
+            source=self.path_edit.text(),
+            files=self._file_count,
+        )
+
+    def _on_preprocess(self, params: Dict[str, object], result: tuple[Dict[str, object], list]) -> None:
+        outputs, logs = result
+        for message, payload in logs:
+            self.app_state.update_log("preprocess", message, payload)
+        if outputs["page_type_values"] is not None:
+            # 목록을 새로 채워도 사용자가 체크해 둔 Page Type은 유지한다
+            self.page_type_list.clear()
+            for val in outputs["page_type_values"]:
+                item = QListWidgetItem(val)
+                item.setCheckState(Qt.CheckState.Checked if val in outputs["page_types"] else Qt.CheckState.Unchecked)
+                self.page_type_list.addItem(item)
+        self.app_state.pipeline.commit(self.app_state, "preprocess", params, outputs)
+        self._show_preprocess(outputs)
+
+    def _on_preprocess_failed(self, exc: Exception) -> None:
+        self.apply_btn.setEnabled(True)
+        self.file_info.setText(self.path_edit.text())
+        QMessageBox.critical(self, "전처리 실패", f"전처리 중 오류가 발생했습니다:\n{exc}")
+
+    def _show_preprocess(self, outputs: Dict[str, object]) -> None:
+        deduped, removed, date_report = outputs["dedup_df"], outputs["removed"], outputs["date_report"]
+        self.apply_btn.setEnabled(True)
+        self.app_state.runtime_options["page_type_filter"] = outputs["page_types"]
         self.app_state.runtime_options["news_excluded"] = self.exclude_news_chk.isChecked()
         self.preview_model.update(deduped.head(100))
         self.duplicate_model.update(removed.head(200))
         self.status_strip.update(len(deduped), self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
         self.app_state.update_log("preprocess", "completed", {"rows": len(deduped)})
+        self.app_state.enforce_memory_budget()
+        date_note = f"  ·  날짜 해석 실패 {date_report['unparseable']:,}행" if date_report.get("unparseable") else ""
+        self.file_info.setText(f"{self.path_edit.text()}{date_note}")
+
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import threading
+import time
 import traceback
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
@@ -23,24 +24,51 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from ...core import gemini_client, rules_engine, toxicity
+from ...core import gemini_client, memory, rules_engine, sentence_dedup, sentiment_job, toxicity, triage
 from ...core.state import AppState
+from ...core.workers import WorkerRunner
 from ..widgets import PandasModel, StatusStrip
-try:
-    from kss import split_sentences
-except Exception:  # noqa: BLE001
-    def split_sentences(text: str) -> list[str]:
-        import re
-        return [s.strip() for s in re.split(r"[\\.\\?!\\n]", text) if s.strip()]
+
+
+_sentence_splitter = None
+
+
+def _fallback_split_sentences(text: str) -> list[str]:
+    import re
+    return [s.strip() for s in re.split(r"[\\.\\?!\\n]", text) if s.strip()]
+
+
+def split_sentences(text: str) -> list[str]:
+    # kss 임포트는 수 초가 걸리므로 첫 감성 실행 시점까지 미룬다
+    global _sentence_splitter
+    if _sentence_splitter is None:
+        try:
+            from kss import split_sentences as kss_split_sentences
+
+            _sentence_splitter = kss_split_sentences
+        except Exception:  # noqa: BLE001
+            _sentence_splitter = _fallback_split_sentences
+    return _sentence_splitter(text)
 
 
 class SentimentPage(QWidget):
     def __init__(self, app_state: AppState, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.app_state = app_state
+        self.worker_runner = WorkerRunner()
+        self._cancel_event: threading.Event | None = None
+        self._partial_results: list[dict] = []
+        self._partial_refreshed_at = 0.0
+        self._pending_sentence_df: pd.DataFrame | None = None
+        self._sentence_groups: sentence_dedup.SentenceGroups | None = None
+        self._local_results: list[dict] = []
+        self._llm_total = 0
+        self._telemetry: gemini_client.GeminiTelemetry | None = None
         self.api_key_edit = QLineEdit()
         self.api_key_edit.setEchoMode(QLineEdit.EchoMode.Password)
         self.api_key_edit.setMinimumWidth(420)
+        self._api_key = ""
+        self.api_key_edit.editingFinished.connect(self._on_api_key_changed)
         self.profanity_mode = QComboBox()
         self.profanity_mode.addItems(["ONCE_FIXED", "COUNT_ACCUM", "COUNT_CAP_TO_2"])
         self.profanity_mode.setMinimumWidth(220)
@@ -58,6 +86,12 @@ class SentimentPage(QWidget):
         self.min_sentence_len = QComboBox()
         self.min_sentence_len.addItems(["3", "5", "8"])
         self.min_sentence_len.setMinimumWidth(120)
+        self.dedup_threshold = QComboBox()
+        self.dedup_threshold.addItems(["100", "97", "95", "90"])
+        self.dedup_threshold.setMinimumWidth(120)
+        self.triage_threshold = QComboBox()
+        self.triage_threshold.addItems(["끄기", "0.7", "0.5", "0.9"])
+        self.triage_threshold.setMinimumWidth(120)
 
         self.sentiment_model = PandasModel(pd.DataFrame())
         self.sentiment_table = QTableView()
@@ -84,17 +118,25 @@ class SentimentPage(QWidget):
         form.addRow("욕설 패널티", self.profanity_delta)
         form.addRow("Context 모드", self.context_mode)
         form.addRow("최소 문장 길이", self.min_sentence_len)
+        form.addRow("중복 문장 병합 유사도(100=완전일치만)", self.dedup_threshold)
+        form.addRow("로컬 사전 선별 신뢰도(이상이면 Gemini 생략)", self.triage_threshold)
         form.addRow("욕설 리스트", self.profanity_list)
         cfg_box = QGroupBox("감성 설정")
         cfg_box.setLayout(form)
         cfg_box.setMinimumWidth(900)
         cfg_box.setSizePolicy(cfg_box.sizePolicy().horizontalPolicy(), cfg_box.sizePolicy().verticalPolicy())
 
-        btn = QPushButton("실행")
-        btn.clicked.connect(self.run_sentiment)
+        self.run_btn = QPushButton("실행")
+        self.run_btn.clicked.connect(self.run_sentiment)
+        self.stop_btn = QPushButton("중지")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_sentiment)
+        self.progress_label = QLabel("")
         btn_row = QHBoxLayout()
+        btn_row.addWidget(self.progress_label)
         btn_row.addStretch()
-        btn_row.addWidget(btn)
+        btn_row.addWidget(self.stop_btn)
+        btn_row.addWidget(self.run_btn)
 
         top_grid = QGridLayout()
         top_grid.setHorizontalSpacing(12)
@@ -120,12 +162,24 @@ class SentimentPage(QWidget):
                 return row.get(col)
         return str(row.get("clean_text", "") or "")
 
+    def _on_api_key_changed(self) -> None:
+        api_key = self.api_key_edit.text().strip()
+        if api_key == self._api_key:
+            return
+        # 이전 키의 클라이언트/모델 탐색/실패 기록은 새 키에 쓰이지 않으므로 버린다
+        if self._api_key:
+            gemini_client.registry.invalidate(self._api_key)
+        self._api_key = api_key
+
     def run_sentiment(self) -> None:
+        if self._cancel_event is not None:
+            return
         if self.app_state.tokens_df is None or self.app_state.tokens_df.empty:
             QMessageBox.warning(self, "감성 분석", "텍스트마이닝 결과가 없습니다. 먼저 텍스트마이닝을 실행하세요.")
             return
         try:
-            api_key = self.api_key_edit.text().strip()
+            self._on_api_key_changed()
+            api_key = self._api_key
             sentence_rows = []
             min_len = int(self.min_sentence_len.currentText())
             for _, row in self.app_state.tokens_df.iterrows():
@@ -153,24 +207,162 @@ class SentimentPage(QWidget):
             if sentence_df.empty:
                 QMessageBox.warning(self, "감성 분석", "문장 단위 텍스트가 없습니다. 옵션을 완화하거나 데이터를 확인하세요.")
                 return
-            gemini_results = []
+        except Exception as exc:  # noqa: BLE001
+            detail = traceback.format_exc()
+            QMessageBox.critical(self, "감성 분석 오류", f"감성 분석 중 오류가 발생했습니다: {exc}\n\n{detail}")
+            return
+        texts = [(row["sent_id"], row.get("sentence_clean", "")) for _, row in sentence_df.iterrows()]
+        # 복붙/리트윗 등 중복 문장은 대표 문장 하나만 보내고 결과를 멤버 sent_id로 복제
+        groups = sentence_dedup.group_sentences(texts, near_threshold=int(self.dedup_threshold.currentText()))
+        self.app_state.update_log(
+            "sentiment",
+            "duplicate sentences collapsed",
+            {
+                "sentences": len(texts),
+                "representatives": len(groups.representatives),
+                "exact_duplicates": groups.exact_duplicates,
+                "near_duplicates": groups.near_duplicates,
+                "saved_calls": groups.saved,
+            },
+        )
+        llm_texts = groups.representatives
+        local_results: list[dict] = []
+        if self.triage_threshold.currentText() != "끄기":
+            # 사전 신호가 분명한 문장은 로컬에서 확정하고 애매/혼합 문장만 Gemini로 보낸다
+            triaged = triage.triage(llm_texts, threshold=float(self.triage_threshold.currentText()))
+            local_results = triaged.local_results
+            llm_texts = triaged.to_llm
+            self.app_state.update_log(
+                "sentiment",
+                "lexicon triage",
+                {
+                    "threshold": float(self.triage_threshold.currentText()),
+                    "local": len(local_results),
+                    "to_llm": len(llm_texts),
+                    "avoided_share": round(triaged.avoided_share, 4),
+                    "total_avoided_share": round(1 - len(llm_texts) / len(texts), 4) if texts else 0.0,
+                },
+            )
+        if not api_key or not llm_texts:
+            self._finish_sentiment(sentence_df, sentence_dedup.fan_out(local_results, groups))
+            return
+        # Gemini 호출은 백그라운드에서 저널 기반 작업으로 실행하고, 결과는 도착하는 대로 테이블에 반영
+        self._sentence_groups = groups
+        self._local_results = local_results
+        self._llm_total = len(llm_texts)
+        self._telemetry = gemini_client.GeminiTelemetry()
+        self._pending_sentence_df = sentence_df
+        self._partial_results = []
+        self._partial_refreshed_at = 0.0
+        self._cancel_event = threading.Event()
+        self.run_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.progress_label.setText(f"Gemini 0/{len(llm_texts)} (중복 {groups.saved}건, 로컬 {len(local_results)}건 생략)")
+        self.worker_runner.start(
+            sentiment_job.run_sentiment_job,
+            self._on_job_finished,
+            self._on_job_failed,
+            api_key,
+            llm_texts,
+            on_partial=self._on_partial_result,
+            should_stop=self._cancel_event.is_set,
+            telemetry=self._telemetry,
+        )
+
+    def stop_sentiment(self) -> None:
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.stop_btn.setEnabled(False)
+            self.progress_label.setText("중지 요청됨 - 현재 문장까지 저장 후 중단합니다.")
+
+    def _on_partial_result(self, result: dict) -> None:
+        self._partial_results.append(result)
+        live = self._telemetry.live() if self._telemetry is not None else {}
+        self.progress_label.setText(
+            f"Gemini {len(self._partial_results)}/{self._llm_total} · "
+            f"{live.get('req_per_min', 0):.0f} req/min · {live.get('tokens_per_min', 0):.0f} tok/min · "
+            f"실패 {live.get('failed', 0)}"
+        )
+        # 결과마다 모델을 다시 만들지 않도록 새로고침 간격을 둔다
+        now = time.monotonic()
+        if now - self._partial_refreshed_at < 0.5:
+            return
+        self._partial_refreshed_at = now
+        partial_df = pd.DataFrame(
+            [
+                {
+                    "sent_id": r.get("key"),
+                    "overall_polarity": r.get("overall_polarity"),
+                    "overall_intensity": r.get("overall_intensity"),
+                    "evidence_count": len(r.get("evidences", []) or []),
+                    "summary_ko": r.get("summary_ko", ""),
+                }
+                for r in self._partial_results
+            ]
+        )
+        self.sentiment_model.update(partial_df)
+
+    def _end_job(self) -> tuple[pd.DataFrame | None, sentence_dedup.SentenceGroups, list[dict]]:
+        sentence_df = self._pending_sentence_df
+        groups = self._sentence_groups or sentence_dedup.SentenceGroups()
+        local_results = self._local_results
+        if self._telemetry is not None:
+            self.app_state.update_log("gemini", "telemetry", self._telemetry.summary())
+            self._telemetry = None
+        self._pending_sentence_df = None
+        self._sentence_groups = None
+        self._local_results = []
+        self._cancel_event = None
+        self.run_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        return sentence_df, groups, local_results
+
+    def _on_job_finished(self, outcome: sentiment_job.JobOutcome) -> None:
+        sentence_df, groups, local_results = self._end_job()
+        if sentence_df is None:
+            return
+        state = "완료" if outcome.complete else "부분 완료(재실행 시 이어서 진행)"
+        self.progress_label.setText(
+            f"Gemini {len(outcome.results)}/{self._llm_total} {state} (중복 {groups.saved}건, 로컬 {len(local_results)}건 생략)"
+        )
+        self.app_state.update_log(
+            "sentiment",
+            "gemini job finished",
+            {
+                "resumed": outcome.resumed,
+                "fetched": outcome.fetched,
+                "complete": outcome.complete,
+                "journal": str(outcome.journal_path) if outcome.journal_path else None,
+            },
+        )
+        self._finish_sentiment(sentence_df, sentence_dedup.fan_out(local_results + outcome.results, groups))
+
+    def _on_job_failed(self, exc: Exception) -> None:
+        sentence_df, groups, local_results = self._end_job()
+        if sentence_df is None:
+            return
+        QMessageBox.warning(
+            self,
+            "Gemini 호출 실패",
+            f"Gemini 호출에 실패했습니다. 저장된 결과까지만 반영하고 룰 기반으로 진행합니다.\n{exc}",
+        )
+        self._finish_sentiment(sentence_df, sentence_dedup.fan_out(local_results + list(self._partial_results), groups))
+
+    def _finish_sentiment(self, sentence_df: pd.DataFrame, gemini_results: list[dict]) -> None:
+        try:
             evidence_df = pd.DataFrame(columns=["key", "phrase", "type", "strength", "aspect", "target"])
-            if api_key:
-                try:
-                    gemini_results = gemini_client.run_gemini(api_key, [(row["sent_id"], row.get("sentence_clean", "")) for _, row in sentence_df.iterrows()])
-                    evidence_df = pd.DataFrame(
-                        [
-                            {
-                                "key": g.get("sent_id"),
-                                **ev,
-                            }
-                            for g in gemini_results
-                            for ev in g.get("evidences", [])
-                        ]
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    detail = traceback.format_exc()
-                    QMessageBox.warning(self, "Gemini 호출 실패", f"Gemini 호출에 실패했습니다. 룰 기반으로만 진행합니다.\n{exc}\n\n{detail}")
+            if gemini_results:
+                evidence_df = pd.DataFrame(
+                    [
+                        {
+                            "key": g.get("key"),
+                            **ev,
+                        }
+                        for g in gemini_results
+                        for ev in g.get("evidences", [])
+                    ],
+                    columns=["key", "phrase", "type", "strength", "aspect", "target"],
+                )
             self.app_state.gemini_evidence_df = evidence_df
             sentiment_rules = {
                 "profanity_mode": self.profanity_mode.currentText(),
@@ -179,17 +371,28 @@ class SentimentPage(QWidget):
                 "profanity_fixed_list": [w.strip() for w in self.profanity_list.toPlainText().splitlines() if w.strip()],
                 "context_mode": self.context_mode.currentText(),
             }
+            # 토큰 단계가 바뀌면 파이프라인이 이전 유해성 결과를 비우므로 여기서는 현재 토큰 기준 결과만 남아 있다
             if self.app_state.toxicity_detail_df is None and self.app_state.tokens_df is not None:
+                tox_params = {
+                    "source": "tokens",
+                    "text_col": "clean_text",
+                    "dictionaries": toxicity.DEFAULT_DICTS,
+                    "whitelist": [],
+                    "context_mode": self.context_mode.currentText(),
+                    "role_to_delta": None,
+                }
                 try:
-                    tox_detail, tox_summary = toxicity.scan_dataframe(
-                        self.app_state.tokens_df,
-                        text_col="clean_text",
-                        dictionaries=toxicity.DEFAULT_DICTS,
-                        whitelist=[],
-                        context_mode=self.context_mode.currentText(),
-                    )
-                    self.app_state.toxicity_detail_df = tox_detail
-                    self.app_state.toxicity_summary_df = tox_summary
+                    if self.app_state.pipeline.lookup(self.app_state, "toxicity", tox_params) is None:
+                        tox_detail, tox_summary = toxicity.scan_dataframe(
+                            self.app_state.tokens_df,
+                            text_col="clean_text",
+                            dictionaries=toxicity.DEFAULT_DICTS,
+                            whitelist=[],
+                            context_mode=tox_params["context_mode"],
+                        )
+                        self.app_state.pipeline.commit(
+                            self.app_state, "toxicity", tox_params, {"toxicity_detail_df": tox_detail, "toxicity_summary_df": tox_summary}
+                        )
                 except Exception as exc:  # noqa: BLE001
                     QMessageBox.warning(self, "유해성 스캔 실패", f"유해성 스캔 중 오류가 발생했습니다. 감성만 계속합니다.\n{exc}")
                     self.app_state.toxicity_detail_df = None
@@ -200,15 +403,20 @@ class SentimentPage(QWidget):
             key_series = sentence_df["key"].fillna(sentence_df["sent_id"])
             clean_series = sentence_df["sentence_clean"]
             raw_series = clean_series
+            summary_by_sent = {g.get("key"): g.get("summary_ko", "") for g in gemini_results}
             base_df = pd.DataFrame(
                 {
                     "key": key_series,
+                    "sent_id": sentence_df["sent_id"],
                     "clean_text": clean_series,
                     "raw_text": raw_series,
-                    "summary_ko": [g.get("summary_ko", "") for g in gemini_results] if gemini_results else [""] * len(sentence_df),
+                    "summary_ko": [summary_by_sent.get(sid, "") for sid in sentence_df["sent_id"]],
                 }
             )
             sentiment_sentence_df = rules_engine.build_sentiment_df(base_df, evidence_df, sentiment_rules, toxicity_df=self.app_state.toxicity_detail_df)
+            sentiment_sentence_df.insert(1, "sent_id", sentence_df["sent_id"].tolist())
+            sentiment_sentence_df.insert(2, "sentence_clean", clean_series.tolist())
+            sentiment_sentence_df = memory.compact_frame(sentiment_sentence_df)
             self.app_state.sentiment_sentence_df = sentiment_sentence_df
             # 요약 테이블
             score_counts = sentiment_sentence_df["score_5"].value_counts().reindex([-2, -1, 0, 1, 2], fill_value=0)
@@ -220,6 +428,8 @@ class SentimentPage(QWidget):
             self.voc_model.update(voc_df)
             # 바차트 생성
             try:
+                import matplotlib.pyplot as plt
+
                 colors = {-2: "#b30000", -1: "#e55c5c", 0: "#888888", 1: "#4a90e2", 2: "#003f8c"}
                 fig, ax = plt.subplots(figsize=(6, 2.4))
                 bars = ax.bar([str(k) for k in score_counts.index], score_counts.values, color=[colors[k] for k in score_counts.index])
@@ -245,16 +455,34 @@ class SentimentPage(QWidget):
             )
             self.app_state.sentiment_doc_df = doc_df
             month_df = (
-                sentence_df.join(sentiment_sentence_df.set_index("key"), on="key", lsuffix="_base")
-                .groupby("month")
+                sentence_df.join(sentiment_sentence_df.set_index("sent_id")[["score_5", "toxicity_level"]], on="sent_id")
+                .groupby("month", observed=True)
                 .agg(mean_score=("score_5", "mean"), toxicity_high_rate=("toxicity_level", lambda x: (x == "HIGH").mean() if len(x) else 0))
                 .reset_index()
             )
             self.app_state.sentiment_month_df = month_df
             self.app_state.sentiment_df = sentiment_sentence_df
+            self.app_state.pipeline.commit(
+                self.app_state,
+                "sentiment",
+                {
+                    **sentiment_rules,
+                    "dedup_threshold": self.dedup_threshold.currentText(),
+                    "triage_threshold": self.triage_threshold.currentText(),
+                    "gemini": bool(gemini_results),
+                },
+                {
+                    "sentiment_df": sentiment_sentence_df,
+                    "sentiment_sentence_df": sentiment_sentence_df,
+                    "sentiment_doc_df": doc_df,
+                    "sentiment_month_df": month_df,
+                    "gemini_evidence_df": evidence_df,
+                },
+            )
             self.sentiment_model.update(sentiment_sentence_df)
             self.status_strip.update(len(sentiment_sentence_df), self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
             self.app_state.update_log("sentiment", "completed", {"rows": len(sentiment_sentence_df)})
+            self.app_state.enforce_memory_budget()
         except Exception as exc:  # noqa: BLE001
             detail = traceback.format_exc()
             QMessageBox.critical(self, "감성 분석 오류", f"감성 분석 중 오류가 발생했습니다: {exc}\n\n{detail}")
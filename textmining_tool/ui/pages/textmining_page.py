@@ -15,9 +15,11 @@ from PyQt6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QListWidget,
     QListWidgetItem,
     QPushButton,
+    QSpinBox,
     QTableView,
     QTabWidget,
     QTextEdit,
@@ -27,8 +29,9 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
 )
 
-from ...core import kiwi_tm, wc
+from ...core import aggregates, burst, kiwi_tm, pivot, search, wc
 from ...core.state import AppState
+from ...core.workers import WorkerRunner
 from ..widgets import PandasModel, StatusStrip
 
 
@@ -57,6 +60,7 @@ class TextMiningPage(QWidget):
         self.text_source.addItems(["both", "title", "full"])
         self.analyzer = QComboBox()
         self.analyzer.addItems(["Kiwi (정밀)", "간단 토큰(한글만)"])
+        self.cumulative_chk = QCheckBox("누적 통계에 합산(증분 적재용)")
         self.pos_mode = QComboBox()
         self.pos_mode.addItems(["noun", "noun+adj+verb"])
         self.stopwords_edit = QTextEdit()
@@ -84,11 +88,45 @@ class TextMiningPage(QWidget):
         self.monthly_table = QTableView()
         self.monthly_table.setModel(self.monthly_model)
 
+        self.kwic_query = QLineEdit()
+        self.kwic_query.setPlaceholderText("키워드(공백으로 여러 개)")
+        self.kwic_query.returnPressed.connect(self.run_kwic)
+        self.kwic_mode = QComboBox()
+        self.kwic_mode.addItems(["모두 포함(AND)", "하나라도 포함(OR)"])
+        self.kwic_within = QSpinBox()
+        self.kwic_within.setRange(0, 50)
+        self.kwic_within.setSpecialValueText("거리 제한 없음")
+        self.kwic_count = QLabel("")
+        self.kwic_model = PandasModel(pd.DataFrame())
+        self.kwic_table = QTableView()
+        self.kwic_table.setModel(self.kwic_model)
+
+        self.burst_unit = QComboBox()
+        self.burst_unit.addItems(list(pivot._PERIOD_FORMATS))
+        self.burst_unit.setCurrentText(app_state.period_unit)
+        self.burst_period = QComboBox()
+        self.burst_window = QSpinBox()
+        self.burst_window.setRange(1, 52)
+        self.burst_window.setValue(burst.BURST_WINDOW)
+        self.burst_method = QComboBox()
+        self.burst_method.addItems(list(burst.BURST_METHODS))
+        self.burst_min_count = QSpinBox()
+        self.burst_min_count.setRange(1, 1000)
+        self.burst_min_count.setValue(burst.BURST_MIN_COUNT)
+        self.burst_model = PandasModel(pd.DataFrame())
+        self.burst_table = QTableView()
+        self.burst_table.setModel(self.burst_model)
+        # (tokens 지문, 기간 단위) -> 단어x기간 시계열; 기간/창/방식만 바꾸면 다시 세지 않는다
+        self._burst_series: tuple[str | None, str, burst.TermSeries] | None = None
+
         self.status_strip = StatusStrip()
         self.empty_warning = QLabel("")
         self._is_running = False
         self.miner = kiwi_tm.KiwiTextMiner()
         self._last_wc_freqs: dict[str, int] = {}
+        self.wc_runner = WorkerRunner()
+        self.tokens_runner = WorkerRunner()
+        self._wc_pending = False
         self._build_ui()
 
     def _show_error(self, message: str) -> None:
@@ -101,6 +139,13 @@ class TextMiningPage(QWidget):
         form.addRow("품사", self.pos_mode)
         form.addRow("최소 빈도", self.min_freq)
         form.addRow("최소 글자수", self.token_min_len)
+        subtract_btn = QPushButton("현재 데이터를 누적 통계에서 빼기")
+        subtract_btn.clicked.connect(self.subtract_from_cumulative)
+        cumulative_row = QHBoxLayout()
+        cumulative_row.addWidget(self.cumulative_chk)
+        cumulative_row.addWidget(subtract_btn)
+        cumulative_row.addStretch()
+        form.addRow(cumulative_row)
 
         sw_box = QGroupBox("불용어 (줄바꿈)")
         sw_layout = QVBoxLayout()
@@ -186,10 +231,54 @@ class TextMiningPage(QWidget):
         right_col.addLayout(wc_box)
         results_row.addLayout(left_col, 1)
         results_row.addLayout(right_col, 1)
+        # 빈도표의 토큰을 더블클릭하면 해당 키워드의 원문 문맥을 보여 준다
+        self.top50_table.doubleClicked.connect(self._kwic_from_table)
+        self.freq_table.doubleClicked.connect(self._kwic_from_table)
+
+        kwic_box = QGroupBox("원문 검색(KWIC)")
+        kwic_controls = QHBoxLayout()
+        kwic_controls.addWidget(self.kwic_query, 2)
+        kwic_controls.addWidget(self.kwic_mode)
+        kwic_controls.addWidget(QLabel("토큰 거리"))
+        kwic_controls.addWidget(self.kwic_within)
+        kwic_btn = QPushButton("검색")
+        kwic_btn.clicked.connect(self.run_kwic)
+        kwic_controls.addWidget(kwic_btn)
+        kwic_controls.addWidget(self.kwic_count)
+        kwic_layout = QVBoxLayout()
+        kwic_layout.addLayout(kwic_controls)
+        kwic_layout.addWidget(self.kwic_table)
+        kwic_box.setLayout(kwic_layout)
+
+        burst_box = QGroupBox("급상승 키워드(직전 기간 대비)")
+        burst_controls = QHBoxLayout()
+        burst_controls.addWidget(QLabel("기간 단위"))
+        burst_controls.addWidget(self.burst_unit)
+        burst_controls.addWidget(QLabel("대상 기간"))
+        burst_controls.addWidget(self.burst_period)
+        burst_controls.addWidget(QLabel("기준 기간 수"))
+        burst_controls.addWidget(self.burst_window)
+        burst_controls.addWidget(QLabel("점수"))
+        burst_controls.addWidget(self.burst_method)
+        burst_controls.addWidget(QLabel("최소 문서 수"))
+        burst_controls.addWidget(self.burst_min_count)
+        burst_btn = QPushButton("탐지")
+        burst_btn.clicked.connect(self.run_burst)
+        burst_controls.addWidget(burst_btn)
+        burst_controls.addStretch()
+        burst_layout = QVBoxLayout()
+        burst_layout.addLayout(burst_controls)
+        burst_layout.addWidget(self.burst_table)
+        burst_box.setLayout(burst_layout)
+        # 단위를 바꾸면 대상 기간 목록을 비우고, 탐지 때 새 단위의 최신 기간부터 채운다
+        self.burst_unit.currentTextChanged.connect(lambda _: self.burst_period.clear())
+        self.burst_table.doubleClicked.connect(self._kwic_from_table)
 
         layout = QVBoxLayout()
         layout.addLayout(top_grid)
         layout.addLayout(results_row)
+        layout.addWidget(burst_box)
+        layout.addWidget(kwic_box)
         layout.addWidget(self.status_strip)
         layout.addStretch()
         self.setLayout(layout)
@@ -202,7 +291,30 @@ class TextMiningPage(QWidget):
             return
         self._is_running = True
         self.run_btn.setEnabled(False)
-        options = {
+        options = self._collect_options()
+        params = {**options, "text_source": self.text_source.currentText(), "cumulative": self.cumulative_chk.isChecked()}
+        # 누적 통계는 파일에 합산하는 부수효과가 있어 캐시를 쓰지 않는다
+        cached = None if params["cumulative"] else self.app_state.pipeline.lookup(self.app_state, "tokens", params)
+        if cached is not None:
+            self.app_state.update_log("textmining", "reused", {"tokens": len(cached["freq_df"])})
+            self._show_tokens(options, cached)
+            return
+        # 같은 토큰화 옵션으로 쌓아 둔 통계에 이번 문서만 더한다(이미 합산한 key는 건너뜀)
+        stats_path = self._stats_path(options) if params["cumulative"] else None
+        self.tokens_runner.start(
+            kiwi_tm.compute_tokens,
+            lambda outputs: self._on_tokens(options, params, stats_path, outputs),
+            self._on_tokens_failed,
+            self.miner,
+            self.app_state.dedup_df,
+            options,
+            text_source=self.text_source.currentText(),
+            stats_path=stats_path,
+            index_path=search.index_path(self.app_state.pipeline.fingerprint("tokens", params)),
+        )
+
+    def _collect_options(self) -> dict:
+        return {
             "korean_only": self.clean_opts["korean_only"].isChecked(),
             "remove_url": self.clean_opts["remove_url"].isChecked(),
             "remove_email": self.clean_opts["remove_email"].isChecked(),
@@ -220,32 +332,67 @@ class TextMiningPage(QWidget):
             "token_min_len": int(self.token_min_len.currentText()),
             "analyzer": "simple" if self.analyzer.currentIndex() == 1 else "kiwi",
         }
-        try:
-            tokens_df, freq_df, top50_df, monthly_df, audit_df, empty_df = self.miner.build_tokens(
-                self.app_state.dedup_df, options, text_source=self.text_source.currentText()
-            )
-        except Exception as exc:  # noqa: BLE001
-            detail = traceback.format_exc()
-            self._show_error(f"텍스트마이닝 중 오류가 발생했습니다:\n{exc}\n\n{detail}")
-            self.run_btn.setEnabled(True)
-            self._is_running = False
+
+    def _stats_path(self, options: dict) -> Path:
+        return aggregates.stats_path(aggregates.options_signature(options, self.text_source.currentText()))
+
+    def subtract_from_cumulative(self) -> None:
+        tokens_df = self.app_state.tokens_df
+        if tokens_df is None or tokens_df.empty:
+            self._show_error("텍스트마이닝 결과가 없습니다. 먼저 실행하세요.")
+            return
+        if self.tokens_runner.is_running():
+            return
+        stats_path = self._stats_path(self._collect_options())
+        if not stats_path.exists():
+            QMessageBox.information(self, "누적 통계", "현재 토큰화 옵션으로 쌓은 누적 통계가 없습니다.")
+            return
+        answer = QMessageBox.question(self, "누적 통계", f"현재 문서 {len(tokens_df):,}건을 누적 통계에서 뺍니다. 계속할까요?")
+        if answer != QMessageBox.StandardButton.Yes:
             return
-        if tokens_df.empty:
+        self.tokens_runner.start(
+            aggregates.subtract_documents,
+            lambda result: self._on_subtracted(stats_path, result),
+            self._on_tokens_failed,
+            stats_path,
+            list(zip(tokens_df["key"], tokens_df["month"], tokens_df["tokens"])),
+        )
+
+    def _on_subtracted(self, stats_path: Path, result: tuple) -> None:
+        removed, stats = result
+        self.app_state.update_log("textmining", "cumulative stats subtracted", {"removed_docs": removed, "total_docs": stats.docs, "path": str(stats_path)})
+        QMessageBox.information(self, "누적 통계", f"{removed:,}건을 뺐습니다(남은 문서 {stats.docs:,}건). 다음 누적 실행부터 반영됩니다.")
+
+    def _on_tokens_failed(self, exc: Exception) -> None:
+        detail = "".join(traceback.format_exception(exc))
+        self._show_error(f"텍스트마이닝 중 오류가 발생했습니다:\n{exc}\n\n{detail}")
+        self.run_btn.setEnabled(True)
+        self._is_running = False
+
+    def _on_tokens(self, options: dict, params: dict, stats_path: Path | None, outputs: dict) -> None:
+        if outputs["tokens_df"].empty:
             self._show_error("토큰이 생성되지 않았습니다. 옵션을 완화하거나 데이터 준비 단계를 확인하세요.")
             self.run_btn.setEnabled(True)
             self._is_running = False
             return
-        self.app_state.tokens_df = tokens_df
-        self.app_state.freq_df = freq_df
-        self.app_state.top50_df = top50_df
-        self.app_state.monthly_top_df = monthly_df
-        self.app_state.audit_report_df = audit_df
-        self.app_state.empty_doc_report_df = empty_df
+        added_docs = outputs.pop("added_docs")
+        self.app_state.pipeline.commit(self.app_state, "tokens", params, outputs)
+        stats = outputs["corpus_stats"]
+        if stats is not None:
+            self.app_state.update_log(
+                "textmining", "cumulative stats", {"added_docs": added_docs, "total_docs": stats.docs, "path": str(stats_path)}
+            )
+        self._show_tokens(options, outputs)
+
+    def _show_tokens(self, options: dict, outputs: dict) -> None:
+        tokens_df, freq_df, top50_df, monthly_df = outputs["tokens_df"], outputs["freq_df"], outputs["top50_df"], outputs["monthly_top_df"]
+        self.app_state.enforce_memory_budget()
         self.top50_model.update(top50_df)
         self.freq_model.update(freq_df)
         self.monthly_model.update(monthly_df)
+        self.kwic_model.update(self.app_state.verbatim_df if self.app_state.verbatim_df is not None else pd.DataFrame())
         self._populate_exclude_list(freq_df)
-        self._last_wc_freqs = {r["token"]: int(r["count"]) for _, r in freq_df.iterrows()}
+        self._last_wc_freqs = dict(zip(freq_df["token"], freq_df["count"].astype(int).tolist()))
         self._render_wordcloud_from_state()
         total_docs = len(self.app_state.dedup_df) if self.app_state.dedup_df is not None else 0
         if self.app_state.empty_doc_report_df is not None and not self.app_state.empty_doc_report_df.empty:
@@ -257,10 +404,75 @@ class TextMiningPage(QWidget):
         warn_text = f"빈 문서(클린): {empty_clean}/{total_docs}, 빈 문서(토큰): {empty_token}/{total_docs}"
         self.empty_warning.setText(warn_text)
         self.status_strip.update(len(tokens_df), self.app_state.period_unit, self.app_state.runtime_options.get("news_excluded", False))
-        self.app_state.update_log("textmining", "completed", {"tokens": len(freq_df)})
+        payload = {"tokens": len(freq_df)}
+        if options["analyzer"] == "kiwi":
+            payload.update(kiwi_tm.kiwi_service.stats())
+        self.app_state.update_log("textmining", "completed", payload)
         self.run_btn.setEnabled(True)
         self._is_running = False
 
+    def run_burst(self) -> None:
+        tokens_df = self.app_state.tokens_df
+        if tokens_df is None or tokens_df.empty:
+            self._show_error("텍스트마이닝 결과가 없습니다. 먼저 실행하세요.")
+            return
+        unit = self.burst_unit.currentText()
+        fingerprint = self.app_state.pipeline.current("tokens")
+        try:
+            if self._burst_series is None or self._burst_series[:2] != (fingerprint, unit):
+                self._burst_series = (fingerprint, unit, burst.TermSeries.build(tokens_df, unit))
+            series = self._burst_series[2]
+            periods = [str(p) for p in series.active_periods]
+            if [self.burst_period.itemText(i) for i in range(self.burst_period.count())] != periods:
+                self.burst_period.clear()
+                self.burst_period.addItems(periods)
+                self.burst_period.setCurrentIndex(len(periods) - 1)
+            params = {
+                "unit": unit,
+                "period": self.burst_period.currentText() or None,
+                "window": self.burst_window.value(),
+                "method": self.burst_method.currentText(),
+                "min_count": self.burst_min_count.value(),
+            }
+            if self.app_state.pipeline.lookup(self.app_state, "burst", params) is None:
+                emerging_df = burst.emerging_keywords(
+                    tokens_df,
+                    unit,
+                    period=params["period"],
+                    window=params["window"],
+                    method=params["method"],
+                    min_count=params["min_count"],
+                    series=series,
+                )
+                self.app_state.pipeline.commit(self.app_state, "burst", params, {"emerging_df": emerging_df})
+        except ValueError as exc:
+            self._show_error(f"급상승 키워드를 계산할 수 없습니다: {exc}")
+            return
+        self.burst_model.update(self.app_state.emerging_df)
+        self.app_state.update_log("textmining", "burst", {**params, "terms": len(self.app_state.emerging_df)})
+
+    def _kwic_from_table(self, index) -> None:  # noqa: ANN001
+        token = index.sibling(index.row(), 0).data()
+        if token:
+            self.kwic_query.setText(str(token))
+            self.run_kwic()
+
+    def run_kwic(self) -> None:
+        terms = search.parse_query(self.kwic_query.text())
+        if not terms:
+            return
+        if self.app_state.token_index is None:
+            self._show_error("검색할 색인이 없습니다. 먼저 텍스트마이닝을 실행하세요.")
+            return
+        mode = "any" if self.kwic_mode.currentIndex() == 1 else "all"
+        within = self.kwic_within.value() or None
+        doc_count = len(self.app_state.token_index.search(terms, mode=mode, within=within))
+        verbatim_df = self.app_state.token_index.kwic(terms, mode=mode, within=within)
+        self.app_state.verbatim_df = verbatim_df
+        self.kwic_model.update(verbatim_df)
+        self.kwic_count.setText(f"문서 {doc_count:,}건 (표시 {len(verbatim_df):,}행)")
+        self.app_state.update_log("textmining", "kwic", {"query": " ".join(terms), "mode": mode, "docs": doc_count})
+
     def _populate_exclude_list(self, freq_df: pd.DataFrame) -> None:
         self.token_exclude_list.clear()
         if freq_df is None or freq_df.empty:
@@ -289,31 +501,58 @@ class TextMiningPage(QWidget):
             for lbl in self.wordcloud_labels.values():
                 lbl.setText("모든 토큰이 제외되었습니다.")
             return
-        assets_dir = wc.resource_path("assets")
-        assets_dir.mkdir(parents=True, exist_ok=True)
-        font_path = wc.resource_path("assets", "fonts", "NanumGothic.ttf")
-        font_path.parent.mkdir(parents=True, exist_ok=True)
-        missing_font = not font_path.exists()
-        for top_n, lbl in self.wordcloud_labels.items():
-            freq_subset = dict(list(filtered.items())[:top_n])
-            output_path = assets_dir / f"wordcloud_top{top_n}.png"
-            try:
-                font_to_use = str(font_path) if font_path.exists() else None
-                wc.generate_wordcloud_from_freq(freq_subset, font_to_use, output_path)
-                pixmap = QPixmap(str(output_path))
-                lbl.setPixmap(pixmap)
-                lbl.setText("")
-                self._wc_pixmaps[top_n] = pixmap
-            except Exception as exc:  # noqa: BLE001
-                detail = traceback.format_exc()
-                lbl.setPixmap(QPixmap())
-                lbl.setText(f"워드클라우드 생성 실패: {exc}")
-                self._show_error(f"워드클라우드 생성 실패 (Top {top_n}): {exc}\n\n{detail}")
-        if missing_font:
+        top_ns = list(self.wordcloud_labels)
+        hits = wc.wordcloud_cache.cached(self._last_wc_freqs, top_ns, excluded) if self._wc_font_ok() else {}
+        if len(hits) == len(top_ns):
+            self._on_wordclouds(hits)
+            return
+        if self.wc_runner.is_running():
+            # 렌더링 중에 다시 요청되면 끝난 뒤 최신 상태로 한 번 더 그린다
+            self._wc_pending = True
+            return
+        for n, lbl in self.wordcloud_labels.items():
+            if n not in hits:
+                lbl.setText("워드클라우드 생성 중...")
+        self.btn_wc_refresh.setEnabled(False)
+        self.wc_runner.start(
+            wc.wordcloud_cache.render, self._on_wordclouds, self._on_wordcloud_failed, dict(self._last_wc_freqs), top_ns, excluded
+        )
+
+    def _wc_font_ok(self) -> bool:
+        try:
+            wc.resolve_font()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _on_wordclouds(self, images: dict) -> None:
+        for top_n, data in images.items():
+            pixmap = QPixmap()
+            pixmap.loadFromData(data, "PNG")
+            lbl = self.wordcloud_labels[top_n]
+            lbl.setPixmap(pixmap)
+            lbl.setText("")
+            self._wc_pixmaps[top_n] = pixmap
+        self._after_wordclouds()
+
+    def _on_wordcloud_failed(self, exc: Exception) -> None:
+        for lbl in self.wordcloud_labels.values():
+            lbl.setPixmap(QPixmap())
+            lbl.setText(f"워드클라우드 생성 실패: {exc}")
+        if isinstance(exc, FileNotFoundError):
             self._show_error(
-                "한글 폰트가 없어 글자가 깨질 수 있습니다. "
+                "한글 폰트가 없어 워드클라우드를 만들 수 없습니다. "
                 "assets/fonts/NanumGothic.ttf 위치를 확인하거나 PyInstaller 번들을 점검하세요."
             )
+        else:
+            self._show_error(f"워드클라우드 생성 실패: {exc}")
+        self._after_wordclouds()
+
+    def _after_wordclouds(self) -> None:
+        self.btn_wc_refresh.setEnabled(True)
+        if self._wc_pending:
+            self._wc_pending = False
+            self._render_wordcloud_from_state()
 
     def _open_wc_popup(self) -> None:
         current_idx = self.wordcloud_tabs.currentIndex()
@@ -149,16 +149,29 @@ class ToxicityPage(QWidget):
             }
             role_to_delta = {role: int(combo.currentText()) for role, combo in self.role_delta_inputs.items()}
             whitelist = [l.strip() for l in self.whitelist.toPlainText().splitlines() if l.strip()]
-            detail_df, summary_df = toxicity.scan_dataframe(
-                target_df,
-                text_col=text_col,
-                dictionaries=dictionaries,
-                whitelist=whitelist,
-                context_mode=self.context_mode.currentText(),
-                role_to_delta=role_to_delta,
-            )
-            self.app_state.toxicity_detail_df = detail_df
-            self.app_state.toxicity_summary_df = summary_df
+            params = {
+                "source": "tokens" if target_df is self.app_state.tokens_df else "dedup",
+                "text_col": text_col,
+                "dictionaries": dictionaries,
+                "whitelist": whitelist,
+                "context_mode": self.context_mode.currentText(),
+                "role_to_delta": role_to_delta,
+            }
+            cached = self.app_state.pipeline.lookup(self.app_state, "toxicity", params)
+            if cached is not None:
+                detail_df, summary_df = cached["toxicity_detail_df"], cached["toxicity_summary_df"]
+            else:
+                detail_df, summary_df = toxicity.scan_dataframe(
+                    target_df,
+                    text_col=text_col,
+                    dictionaries=dictionaries,
+                    whitelist=whitelist,
+                    context_mode=params["context_mode"],
+                    role_to_delta=role_to_delta,
+                )
+                self.app_state.pipeline.commit(
+                    self.app_state, "toxicity", params, {"toxicity_detail_df": detail_df, "toxicity_summary_df": summary_df}
+                )
             self.table_model.update(detail_df)
             self.summary_model.update(summary_df)
             rows = len(detail_df)